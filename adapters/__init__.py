@@ -1,2 +1,19 @@
-from .telnet_adapter import TelnetAdapter
-from .ssh_adapter import SSHAdapter
+"""Transport adapters.
+
+Adapters are resolved lazily on first attribute access so that importing
+``adapters`` does not pull in optional transports (e.g. paramiko for SSH).
+"""
+from core.lazy import lazy_exports
+
+_EXPORTS = {
+    "TelnetAdapter": (".telnet_adapter", "TelnetAdapter"),
+    "SSHAdapter": (".ssh_adapter", "SSHAdapter"),
+    "SimAdapter": (".psu.sim_adapter", "SimAdapter"),
+    "RecordingAdapter": (".recording_adapter", "RecordingAdapter"),
+    "ReplayAdapter": (".recording_adapter", "ReplayAdapter"),
+    "SharedBus": (".bus", "SharedBus"),
+    "BusPort": (".bus", "BusPort"),
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from core import deadline
+from core.exceptions import ConnectionError, DeviceTimeout
+from devices.base import AdapterProtocol
+
+
+class _Request:
+    __slots__ = ("port", "payload", "started", "done", "result", "error")
+
+    def __init__(self, port: "BusPort", payload: object) -> None:
+        self.port = port
+        self.payload = payload
+        self.started = False
+        self.done = False
+        self.result: object = None
+        self.error: Optional[BaseException] = None
+
+
+class SharedBus:
+    """Arbitrates one transport adapter between several devices.
+
+    - connect/disconnect are reference counted: the underlying adapter is
+      connected by the first port and disconnected by the last one.
+    - exchange() calls are serialized. Pending requests are served round-robin
+      across ports, so a chatty device cannot starve the others.
+    - If the adapter implements ``exchange_batch(payloads) -> list`` (one
+      transport write carrying several commands; items may be exceptions),
+      up to ``max_batch`` queued requests from *different* ports are sent
+      together.
+
+    Whichever caller finds the bus idle drives the queue (leader/follower),
+    so no background thread is needed. Waiting honours the caller's deadline;
+    a request that has not started yet is withdrawn on expiry.
+    """
+
+    def __init__(self, adapter: AdapterProtocol, max_batch: int = 16) -> None:
+        self.adapter = adapter
+        self.max_batch = max_batch if hasattr(adapter, "exchange_batch") else 1
+        self._cv = threading.Condition()
+        self._refs = 0
+        self._busy = False
+        self._queues: Dict["BusPort", Deque[_Request]] = {}
+        self._ready: Deque["BusPort"] = deque()
+        # Counters for tuning/tests
+        self.transport_writes = 0
+        self.requests = 0
+
+    def port(self, name: str = "") -> "BusPort":
+        """A per-device AdapterProtocol view of this bus."""
+        return BusPort(self, name)
+
+    @property
+    def refcount(self) -> int:
+        return self._refs
+
+    # ----- reference-counted lifecycle ----------------------------------------
+    def _acquire(self) -> None:
+        with self._cv:
+            if self._refs == 0:
+                self.adapter.connect()
+            self._refs += 1
+
+    def _release(self) -> None:
+        with self._cv:
+            if self._refs == 0:
+                return
+            self._refs -= 1
+            if self._refs == 0:
+                self.adapter.disconnect()
+
+    # ----- serialized exchanges -----------------------------------------------
+    def _take_batch(self) -> List[_Request]:
+        batch: List[_Request] = []
+        while self._ready and len(batch) < self.max_batch:
+            port = self._ready.popleft()
+            q = self._queues[port]
+            req = q.popleft()
+            req.started = True
+            batch.append(req)
+            if q:
+                self._ready.append(port)  # back of the line
+        return batch
+
+    def _run(self, batch: List[_Request]) -> None:
+        self.transport_writes += 1
+        try:
+            if len(batch) == 1 and self.max_batch == 1:
+                results: List[object] = [self.adapter.exchange(batch[0].payload)]
+            else:
+                results = list(self.adapter.exchange_batch([r.payload for r in batch]))
+        except BaseException as exc:
+            results = [exc] * len(batch)
+        for req, res in zip(batch, results):
+            if isinstance(res, BaseException):
+                req.error = res
+            else:
+                req.result = res
+            req.done = True
+
+    def _withdraw(self, req: _Request) -> None:
+        q = self._queues[req.port]
+        q.remove(req)
+        if not q and req.port in self._ready:
+            self._ready.remove(req.port)
+
+    def submit(self, port: "BusPort", payload: object) -> object:
+        req = _Request(port, payload)
+        with self._cv:
+            self.requests += 1
+            q = self._queues.setdefault(port, deque())
+            if not q:
+                self._ready.append(port)
+            q.append(req)
+            while self._busy and not req.done:
+                left = deadline.remaining()
+                if left is not None and left <= 0 and not req.started:
+                    self._withdraw(req)
+                    raise DeviceTimeout(f"{port.name or 'bus'}: deadline exceeded waiting for bus")
+                self._cv.wait(left if left is not None and not req.started else None)
+            leader = not req.done
+            if leader:
+                self._busy = True
+        if leader:
+            # Drain until our own request has been served, then hand over
+            try:
+                while not req.done:
+                    with self._cv:
+                        batch = self._take_batch()
+                    self._run(batch)
+                    with self._cv:
+                        self._cv.notify_all()
+            finally:
+                with self._cv:
+                    self._busy = False
+                    self._cv.notify_all()
+        if req.error is not None:
+            raise req.error
+        return req.result
+
+
+class BusPort(AdapterProtocol):
+    """One device's handle on a SharedBus (use it as that device's adapter)."""
+
+    def __init__(self, bus: SharedBus, name: str = "") -> None:
+        self.bus = bus
+        self.name = name
+        self._connected = False
+
+    def connect(self) -> None:
+        if self._connected:
+            return
+        self.bus._acquire()
+        self._connected = True
+
+    def disconnect(self) -> None:
+        if not self._connected:
+            return
+        self._connected = False
+        self.bus._release()
+
+    def is_connected(self) -> bool:
+        return self._connected and self.bus.adapter.is_connected()
+
+    def exchange(self, payload: object) -> object:
+        if not self._connected:
+            raise ConnectionError(f"{self.name or 'bus port'} is not connected")
+        return self.bus.submit(self, payload)
+
+    def __repr__(self) -> str:
+        return f"<BusPort {self.name!r} connected={self._connected}>"
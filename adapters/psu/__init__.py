@@ -1,4 +1,8 @@
-from adapters.psu import simAdapter
+from core.lazy import lazy_exports
 
+_EXPORTS = {
+    "SimAdapter": (".sim_adapter", "SimAdapter"),
+}
 
-__all__ = ["simAdapter"]
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
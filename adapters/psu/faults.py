@@ -0,0 +1,107 @@
+"""Latency distributions and scripted faults for SimAdapter.
+
+All randomness comes from the adapter's seeded ``random.Random`` so a run
+with the same seed and call sequence reproduces the same delays and faults.
+"""
+from __future__ import annotations
+
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, Mapping, Optional, Tuple
+
+# Fault kinds understood by SimAdapter
+NO_RESPONSE = "no_response"   # raise DeviceTimeout after the adapter timeout
+ERROR = "error"               # raise DeviceError immediately
+LINK_DOWN = "link_down"       # drop the link; raise ConnectionError
+
+FAULT_KINDS = (NO_RESPONSE, ERROR, LINK_DOWN)
+
+
+class Latency(ABC):
+    """Per-operation latency distribution (seconds)."""
+
+    @abstractmethod
+    def sample(self, rng: random.Random) -> float:
+        ...
+
+
+class Fixed(Latency):
+    def __init__(self, seconds: float) -> None:
+        self.seconds = float(seconds)
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+    def __repr__(self) -> str:
+        return f"Fixed({self.seconds})"
+
+
+class Normal(Latency):
+    """Gaussian latency, clamped at zero."""
+
+    def __init__(self, mean: float, stddev: float) -> None:
+        self.mean = float(mean)
+        self.stddev = float(stddev)
+
+    def sample(self, rng: random.Random) -> float:
+        return max(0.0, rng.gauss(self.mean, self.stddev))
+
+    def __repr__(self) -> str:
+        return f"Normal({self.mean}, {self.stddev})"
+
+
+class LongTail(Latency):
+    """Mostly ``base``; with probability ``tail_probability`` adds a Pareto-distributed stall.
+
+    ``tail_scale`` is the minimum stall and ``alpha`` the Pareto shape (lower
+    means heavier tail). Stalls are capped at ``cap`` seconds.
+    """
+
+    def __init__(self, base: float, tail_probability: float, tail_scale: float,
+                 alpha: float = 1.5, cap: float = math.inf) -> None:
+        self.base = float(base)
+        self.tail_probability = float(tail_probability)
+        self.tail_scale = float(tail_scale)
+        self.alpha = float(alpha)
+        self.cap = float(cap)
+
+    def sample(self, rng: random.Random) -> float:
+        if rng.random() >= self.tail_probability:
+            return self.base
+        return self.base + min(self.cap, self.tail_scale * rng.paretovariate(self.alpha))
+
+    def __repr__(self) -> str:
+        return f"LongTail({self.base}, {self.tail_probability}, {self.tail_scale}, alpha={self.alpha})"
+
+
+class FaultSchedule:
+    """Scripted faults: ``{op: {call_number: kind}}`` with 1-based call numbers.
+
+    The op ``"*"`` counts every operation. Example: ``{"read": {3: "no_response"}}``
+    makes the third ``read`` exchange time out.
+    """
+
+    def __init__(self, script: Optional[Mapping[str, Mapping[int, str]]] = None) -> None:
+        self._script: Dict[str, Dict[int, str]] = {}
+        for op, calls in (script or {}).items():
+            for n, kind in calls.items():
+                self.add(op, n, kind)
+        self._counts: Dict[str, int] = {}
+
+    def add(self, op: str, call_number: int, kind: str) -> None:
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"unknown fault kind {kind!r}; expected one of {FAULT_KINDS}")
+        self._script.setdefault(op, {})[int(call_number)] = kind
+
+    def next(self, op: str) -> Optional[str]:
+        """Advance counters for ``op`` and return the scheduled fault, if any."""
+        fault = None
+        for key in (op, "*"):
+            n = self._counts.get(key, 0) + 1
+            self._counts[key] = n
+            fault = fault or self._script.get(key, {}).get(n)
+        return fault
+
+    def reset(self) -> None:
+        self._counts.clear()
@@ -1,32 +1,162 @@
 from __future__ import annotations
-import time
+import random
+from typing import Callable, Dict, List, Mapping, Optional, Union
+from core import deadline
+from core.exceptions import ConnectionError, DeviceError, DeviceTimeout
+from core.stats import latency_stats
 from devices.base import AdapterProtocol
+from .faults import ERROR, LINK_DOWN, NO_RESPONSE, Fixed, FaultSchedule, Latency
 
 
 class SimAdapter(AdapterProtocol):
-    def __init__(self, connect_delay_s: float = 0.0, should_fail: bool = False) -> None:
+    """Simulated transport with optional latency and fault modeling.
+
+    Every operation (``connect``, ``disconnect`` and strategy-level ops routed
+    through exchange(), e.g. ``read``/``set_voltage``) costs a latency sampled
+    from ``latency`` (one distribution, or a mapping op -> distribution with an
+    optional ``"*"`` default) plus uniform ``±jitter_s``. With probability
+    ``drop_probability`` (or when ``no_response`` is set) the operation gets no
+    reply and raises DeviceTimeout after ``timeout_s``. ``faults`` scripts
+    deterministic failures (see adapters/psu/faults.py).
+
+    All randomness is drawn from ``random.Random(seed)``. Simulated waits use
+    core.deadline.sleep, so they honour the caller's deadline scope.
+    """
+
+    def __init__(
+        self,
+        connect_delay_s: float = 0.0,
+        should_fail: bool = False,
+        *,
+        latency: Union[Latency, Mapping[str, Latency], None] = None,
+        jitter_s: float = 0.0,
+        drop_probability: float = 0.0,
+        no_response: bool = False,
+        faults: Optional[FaultSchedule] = None,
+        timeout_s: float = 1.0,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = deadline.sleep,
+    ) -> None:
         self._connected = False
         self.connect_delay_s = connect_delay_s
         self.should_fail = should_fail
+        if isinstance(latency, Latency):
+            latency = {"*": latency}
+        self.latency: Dict[str, Latency] = dict(latency or {})
+        self.jitter_s = jitter_s
+        self.drop_probability = drop_probability
+        self.no_response = no_response
+        self.faults = faults
+        self.timeout_s = timeout_s
+        self._seed = seed
+        self._rng: Optional[random.Random] = None  # created on first random draw
+        self._sleep = sleep
+        # Observed per-operation latencies (successful exchanges only)
+        self.samples: Dict[str, List[float]] = {}
+
+    @property
+    def rng(self) -> random.Random:
+        if self._rng is None:
+            self._rng = random.Random(self._seed)
+        return self._rng
 
     @property
     def opened(self) -> bool:
         return self._connected
-    
+
+    def _sample_latency(self, op: str) -> float:
+        dist = self.latency.get(op) or self.latency.get("*")
+        delay = dist.sample(self.rng) if dist is not None else 0.0
+        if self.jitter_s:
+            delay += self.rng.uniform(-self.jitter_s, self.jitter_s)
+        return max(0.0, delay)
+
+    def exchange(self, op: str) -> float:
+        """Simulate one command/response round-trip for ``op``.
+
+        Returns the simulated latency, or raises DeviceTimeout / DeviceError /
+        ConnectionError according to the fault model.
+        """
+        deadline.check(op)
+        if op not in ("connect", "disconnect") and not self._connected:
+            raise ConnectionError("sim link is not connected")
+        fault = self.faults.next(op) if self.faults is not None else None
+        dropped = self.drop_probability and self.rng.random() < self.drop_probability
+        if fault == NO_RESPONSE or dropped or self.no_response:
+            self._sleep(self.timeout_s)
+            raise DeviceTimeout(f"{op}: no response within {self.timeout_s}s")
+        if fault == LINK_DOWN:
+            self._connected = False
+            raise ConnectionError(f"{op}: simulated link drop")
+        if fault == ERROR:
+            raise DeviceError(f"{op}: simulated device error")
+        delay = self._sample_latency(op)
+        if delay:
+            self._sleep(delay)
+        self.samples.setdefault(op, []).append(delay)
+        return delay
+
+    def exchange_batch(self, ops: List[str]) -> List[object]:
+        """Simulate several commands carried by one transport write.
+
+        Costs a single latency sample (op ``"batch"``, else the default).
+        The fault model applies per command as in exchange(): a scripted
+        fault or a dropped reply is returned in place of that command's
+        result, and a missing reply makes the batch wait ``timeout_s``.
+        With ``no_response`` set nothing answers and the batch raises
+        DeviceTimeout.
+        """
+        deadline.check("batch")
+        if not self._connected:
+            raise ConnectionError("sim link is not connected")
+        if self.no_response:
+            self._sleep(self.timeout_s)
+            raise DeviceTimeout(f"batch: no response within {self.timeout_s}s")
+        results: List[object] = []
+        timed_out = False
+        for op in ops:
+            fault = self.faults.next(op) if self.faults is not None else None
+            dropped = self.drop_probability and self.rng.random() < self.drop_probability
+            if fault == NO_RESPONSE or dropped:
+                timed_out = True
+                results.append(DeviceTimeout(f"{op}: no response within {self.timeout_s}s"))
+            elif fault == ERROR:
+                results.append(DeviceError(f"{op}: simulated device error"))
+            elif fault == LINK_DOWN:
+                self._connected = False
+                results.append(ConnectionError(f"{op}: simulated link drop"))
+            else:
+                results.append(None)
+        delay = self._sample_latency("batch")
+        if timed_out:
+            delay = max(delay, self.timeout_s)
+        if delay:
+            self._sleep(delay)
+        if not timed_out:
+            self.samples.setdefault("batch", []).append(delay)
+        return [delay if r is None else r for r in results]
+
+    def stats(self, op: Optional[str] = None) -> Dict[str, float]:
+        """count/mean/p50/p99/max of observed latencies (all ops if ``op`` is None)."""
+        if op is not None:
+            return latency_stats(self.samples.get(op, []))
+        return latency_stats(s for per_op in self.samples.values() for s in per_op)
+
     def connect(self) -> None:
         if self._connected:
             return
         if self.connect_delay_s:
-            time.sleep(self.connect_delay_s)
+            self._sleep(self.connect_delay_s)
         if self.should_fail:
             raise RuntimeError("simulated connect failure")
+        self.exchange("connect")
         self._connected = True
 
     def disconnect(self) -> None:
         if not self._connected:
             return
         self._connected = False
+        self.exchange("disconnect")
 
     def is_connected(self) -> bool:
         return self._connected
-    
\ No newline at end of file
@@ -0,0 +1,39 @@
+from __future__ import annotations
+from devices.base import AdapterProtocol
+from core.tracelog import OP_CONNECT, OP_DISCONNECT, Recorder, ReplaySession, TraceWriter
+
+
+class RecordingAdapter(AdapterProtocol):
+    """Pass-through adapter that logs connect/disconnect into a trace."""
+
+    def __init__(self, inner: AdapterProtocol, writer: TraceWriter) -> None:
+        self.inner = inner
+        self._rec = Recorder(writer)
+
+    def connect(self) -> None:
+        self._rec.call(OP_CONNECT, None, self.inner.connect)
+
+    def disconnect(self) -> None:
+        self._rec.call(OP_DISCONNECT, None, self.inner.disconnect)
+
+    def is_connected(self) -> bool:
+        return self.inner.is_connected()
+
+
+class ReplayAdapter(AdapterProtocol):
+    """Adapter that serves connect/disconnect from a recorded trace."""
+
+    def __init__(self, session: ReplaySession) -> None:
+        self.session = session
+        self._connected = False
+
+    def connect(self) -> None:
+        self.session.next(OP_CONNECT, None)
+        self._connected = True
+
+    def disconnect(self) -> None:
+        self.session.next(OP_DISCONNECT, None)
+        self._connected = False
+
+    def is_connected(self) -> bool:
+        return self._connected
@@ -1,11 +1,22 @@
 from __future__ import annotations
 from typing import Optional
+from core import deadline
 from devices.base import AdapterProtocol
 
-try:
-    import paramiko
-except Exception:  # pragma: no cover - optional dependency
-    paramiko = None  # type: ignore
+# paramiko (and cryptography/nacl behind it) is expensive to import; resolve it
+# on first connect instead of at module import.
+paramiko = None  # type: ignore
+
+
+def _load_paramiko():
+    global paramiko
+    if paramiko is None:
+        try:
+            import paramiko as _paramiko
+        except Exception:  # pragma: no cover - optional dependency
+            raise RuntimeError("paramiko is required for SSHAdapter") from None
+        paramiko = _paramiko
+    return paramiko
 
 
 class SSHAdapter(AdapterProtocol):
@@ -20,11 +31,11 @@ class SSHAdapter(AdapterProtocol):
     def connect(self) -> None:
         if self._client is not None:
             return
-        if paramiko is None:
-            raise RuntimeError("paramiko is required for SSHAdapter")
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        client.connect(self.host, port=self.port, username=self.username, password=self.password, timeout=self.timeout)
+        pm = _load_paramiko()
+        client = pm.SSHClient()
+        client.set_missing_host_key_policy(pm.AutoAddPolicy())
+        client.connect(self.host, port=self.port, username=self.username, password=self.password,
+                       timeout=deadline.io_timeout(self.timeout, "ssh connect"))
         self._client = client
 
     def disconnect(self) -> None:
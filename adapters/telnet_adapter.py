@@ -1,2 +1,83 @@
-# Deprecated shim: import from top-level adapters
-from adapters.telnet_adapter import *  # type: ignore[F401,F403]
\ No newline at end of file
+from __future__ import annotations
+import socket
+from typing import BinaryIO, Optional
+from core import deadline
+from core.exceptions import ConnectionError, DeviceTimeout
+from devices.base import AdapterProtocol
+
+MAX_LINE = 64 * 1024  # longest reply line accepted
+
+
+class TelnetAdapter(AdapterProtocol):
+    """Raw line-oriented TCP transport (telnet-style SCPI sockets).
+
+    Uses plain sockets: ``telnetlib`` is deprecated and removed in Python 3.13.
+    write() sends one newline-terminated command; query() sends one and
+    returns the reply line. A timed-out or broken exchange drops the link
+    (a late reply would leave the stream out of step); connect() again to
+    resume.
+    """
+
+    def __init__(self, host: str, port: int = 23, timeout: float = 5.0) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._rfile: Optional[BinaryIO] = None
+
+    def connect(self) -> None:
+        if self._sock is not None:
+            return
+        try:
+            self._sock = socket.create_connection(
+                (self.host, self.port), timeout=deadline.io_timeout(self.timeout, "telnet connect"))
+        except socket.timeout as exc:
+            raise DeviceTimeout(f"telnet connect to {self.host}:{self.port} timed out") from exc
+        self._rfile = self._sock.makefile("rb")
+
+    def disconnect(self) -> None:
+        if self._sock is None:
+            return
+        try:
+            self._rfile.close()
+            self._sock.close()
+        finally:
+            self._sock = self._rfile = None
+
+    def is_connected(self) -> bool:
+        return self._sock is not None
+
+    def write(self, command: str) -> None:
+        sock = self._require()
+        try:
+            sock.settimeout(deadline.io_timeout(self.timeout, "telnet write"))
+            sock.sendall(command.encode("ascii") + b"\n")
+        except socket.timeout as exc:
+            self.disconnect()
+            raise DeviceTimeout(f"{command!r}: send timed out") from exc
+        except OSError as exc:
+            self.disconnect()
+            raise ConnectionError(f"telnet link to {self.host}:{self.port} lost: {exc}") from exc
+
+    def query(self, command: str) -> str:
+        self.write(command)
+        try:
+            self._sock.settimeout(deadline.io_timeout(self.timeout, "telnet query"))
+            line = self._rfile.readline(MAX_LINE + 1)
+        except socket.timeout as exc:
+            self.disconnect()
+            raise DeviceTimeout(f"{command!r}: no reply within the timeout") from exc
+        except OSError as exc:
+            self.disconnect()
+            raise ConnectionError(f"telnet link to {self.host}:{self.port} lost: {exc}") from exc
+        if not line.endswith(b"\n"):
+            self.disconnect()
+            if not line:
+                raise ConnectionError(f"{self.host}:{self.port} closed the connection")
+            raise ConnectionError(f"{command!r}: reply longer than {MAX_LINE} bytes")
+        return line.decode("ascii", "replace").strip()
+
+    def _require(self) -> socket.socket:
+        if self._sock is None:
+            raise ConnectionError(f"telnet link to {self.host}:{self.port} is not connected")
+        return self._sock
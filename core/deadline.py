@@ -0,0 +1,120 @@
+"""Deadline and cancellation scopes for device I/O.
+
+A deadline is an absolute monotonic time held in a context variable, so it
+flows from ``BaseDevice`` calls down into strategies and adapters without
+being threaded through every signature. Nested scopes can only shorten the
+effective deadline.
+
+Blocking code cooperates by calling ``check()`` before I/O, ``sleep()`` instead
+of ``time.sleep()`` and ``io_timeout()`` to bound socket timeouts. All three
+raise ``DeviceTimeout`` once the deadline passes or the scope is cancelled.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Set
+
+from core.exceptions import DeviceTimeout
+
+
+class Deadline:
+    """One active deadline scope. ``cancel()`` may be called from any thread."""
+
+    def __init__(self, expires: Optional[float], parent: Optional["Deadline"] = None) -> None:
+        if parent is not None and parent.expires is not None:
+            expires = parent.expires if expires is None else min(expires, parent.expires)
+        self.expires = expires
+        self.parent = parent
+        self._cancelled = threading.Event()
+        self._children: Set["Deadline"] = set()
+        if parent is not None:
+            parent._children.add(self)
+            if parent.cancelled:
+                self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Abort every operation running under this scope (and nested scopes)."""
+        self._cancelled.set()
+        for child in list(self._children):
+            child.cancel()
+
+    def remaining(self) -> Optional[float]:
+        if self.expires is None:
+            return None
+        return self.expires - time.monotonic()
+
+    def check(self, what: str = "operation") -> None:
+        if self.cancelled:
+            raise DeviceTimeout(f"{what}: cancelled")
+        left = self.remaining()
+        if left is not None and left <= 0:
+            raise DeviceTimeout(f"{what}: deadline exceeded")
+
+    def _close(self) -> None:
+        if self.parent is not None:
+            self.parent._children.discard(self)
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("device_deadline", default=None)
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the active scope; None when unbounded."""
+    d = _current.get()
+    return None if d is None else d.remaining()
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Deadline]:
+    """Bound all device I/O in the block to ``seconds`` (None = no new bound)."""
+    parent = _current.get()
+    expires = None if seconds is None else time.monotonic() + float(seconds)
+    scope = Deadline(expires, parent)
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+        scope._close()
+
+
+def check(what: str = "operation") -> None:
+    d = _current.get()
+    if d is not None:
+        d.check(what)
+
+
+def sleep(seconds: float, what: str = "operation") -> None:
+    """Deadline-aware ``time.sleep``; wakes early and raises on expiry/cancel."""
+    d = _current.get()
+    if d is None:
+        if seconds > 0:
+            time.sleep(seconds)
+        return
+    d.check(what)
+    left = d.remaining()
+    if left is not None and left < seconds:
+        d._cancelled.wait(max(left, 0.0))
+        raise DeviceTimeout(f"{what}: cancelled" if d.cancelled else f"{what}: deadline exceeded")
+    if d._cancelled.wait(seconds):
+        raise DeviceTimeout(f"{what}: cancelled")
+
+
+def io_timeout(default: Optional[float], what: str = "operation") -> Optional[float]:
+    """Timeout for a blocking call: ``default`` capped by the active deadline."""
+    check(what)
+    left = remaining()
+    if left is None:
+        return default
+    return left if default is None else min(default, left)
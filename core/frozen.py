@@ -0,0 +1,65 @@
+"""Read-only, interned configuration mappings.
+
+Per-model configuration (capabilities, ranges) is identical for every device
+of a model, so loaders hand out one shared read-only object per distinct
+content instead of a fresh dict per device. The intern table holds them
+weakly, so content no device uses any more (an old hot-reloaded config) is
+freed.
+"""
+from __future__ import annotations
+
+import weakref
+from typing import Any, Dict, Mapping, NoReturn, Tuple
+
+
+class FrozenDict(dict):
+    """A dict that refuses mutation (still ``isinstance(x, dict)``)."""
+
+    __slots__ = ("_hash", "__weakref__")
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(self.items()))
+            return self._hash
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenDict":
+        return self
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+_INTERNED: "weakref.WeakValueDictionary[Tuple, FrozenDict]" = weakref.WeakValueDictionary()
+
+
+def _key(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _key(v)) for k, v in value.items()))
+    return (type(value), value)  # keep True and 1 apart
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert mappings to FrozenDict and intern them by content."""
+    if not isinstance(value, Mapping):
+        return value
+    key = _key(value)
+    hit = _INTERNED.get(key)
+    if hit is None:
+        hit = FrozenDict((k, freeze(v)) for k, v in value.items())
+        _INTERNED[key] = hit
+    return hit
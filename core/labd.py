@@ -0,0 +1,332 @@
+"""Resident lab daemon: connected devices behind a local Unix socket.
+
+Scripts pay Python startup, YAML parsing, adapter connect and strategy
+initialize on every run. The daemon does that once and keeps the devices
+connected; clients send read/set/batch requests as core.wire frames::
+
+    request  [seq, op, params]
+    reply    [seq, ok, result]     (result is [error type, message] if not ok)
+
+    ping                                   -> "pong"
+    devices                                -> {name: model}
+    read   [device, key(, timeout)]        -> value
+    set    [device, key, value(, timeout)] -> None
+    batch  [[op, device, key(, value)], ...] -> [[ok, result], ...]
+
+Every device has a daemon-side lock held for the whole request, so requests
+from different clients never interleave on one instrument. A batch takes the
+locks of all the devices it touches (in name order, so batches cannot
+deadlock) and runs as one unit; a failing op does not stop the rest.
+Connections are served by one thread each and may pipeline requests.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from core import deadline, exceptions, wire
+from core.exceptions import DeviceError, DeviceTimeout, ProtocolError
+
+Op = Sequence[Any]  # [op, device, key(, value)]
+
+log = logging.getLogger(__name__)
+
+
+def _error(exc: BaseException) -> List[str]:
+    message = exc.args[0] if len(exc.args) == 1 and isinstance(exc.args[0], str) else str(exc)
+    return [type(exc).__name__, message]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        labd: LabDaemon = self.server.labd  # type: ignore[attr-defined]
+        while True:
+            try:
+                msg = wire.read_frame(self.rfile)
+            except (ProtocolError, OSError):
+                return  # garbage or a dropped client: close the connection
+            if msg is None:
+                return
+            try:
+                self.wfile.write(wire.frame(labd.dispatch(msg)))
+            except OSError:
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    allow_reuse_address = False
+
+
+class LabDaemon:
+    """Own connected devices and serve them on a Unix domain socket."""
+
+    def __init__(self, devices: Mapping[str, Any], path: Union[str, Path]) -> None:
+        if not devices:
+            raise ValueError("at least one device is required")
+        self.devices: Dict[str, Any] = dict(devices)
+        self.path = Path(path)
+        self._locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in self.devices}
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- Lifecycle ----------------------------------------------------------
+    def _bind(self) -> _Server:
+        if self.path.exists():
+            if not stat.S_ISSOCK(self.path.stat().st_mode):
+                raise exceptions.ConnectionError(f"{self.path} exists and is not a socket")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.path))
+            except OSError:
+                self.path.unlink()  # stale socket from a daemon that died
+            else:
+                raise exceptions.ConnectionError(f"a daemon is already listening on {self.path}")
+            finally:
+                probe.close()
+        # Create the socket owner-only; a chmod after bind leaves a window in
+        # which other users can connect
+        umask = os.umask(0o077)
+        try:
+            server = _Server(str(self.path), _Handler)
+        finally:
+            os.umask(umask)
+        server.labd = self  # type: ignore[attr-defined]
+        return server
+
+    def _open(self) -> None:
+        server = self._bind()
+        connected: Dict[str, Any] = {}
+        try:
+            for name, device in self.devices.items():
+                device.connect()
+                connected[name] = device
+        except BaseException:
+            server.server_close()
+            self.path.unlink()
+            self._disconnect(connected)  # leave no instrument held for a retry
+            raise
+        self._server = server
+
+    def start(self) -> "LabDaemon":
+        """Connect the devices and serve in a background thread."""
+        if self._server is not None:
+            return self
+        self._open()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="labd", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Connect the devices and serve in the calling thread until stop()."""
+        self._open()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._close()
+
+    def stop(self) -> None:
+        """Stop serving, remove the socket and disconnect the devices."""
+        server = self._server
+        if server is None:
+            return
+        server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._close()
+
+    def _close(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.server_close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._disconnect(self.devices)
+
+    @staticmethod
+    def _disconnect(devices: Mapping[str, Any]) -> None:
+        """Disconnect each device; a failure is logged and does not skip the rest."""
+        for name, device in devices.items():
+            try:
+                device.disconnect()
+            except Exception:
+                log.exception("labd: disconnecting %s failed", name)
+
+    def __enter__(self) -> "LabDaemon":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    # ----- Requests -----------------------------------------------------------
+    def _device(self, name: Any) -> Any:
+        try:
+            return self.devices[name]
+        except (KeyError, TypeError):
+            raise KeyError(f"unknown device: {name!r}") from None
+
+    def _run(self, op: str, params: Sequence[Any]) -> Any:
+        if op == "read":
+            device, key, *rest = params
+            return self._device(device).read(key, *rest[:1])
+        if op == "set":
+            device, key, value, *rest = params
+            self._device(device).set(key, value, *rest[:1])
+            return None
+        raise ProtocolError(f"unknown op: {op!r}")
+
+    def _batch(self, ops: Iterable[Op]) -> List[List[Any]]:
+        ops = list(ops)
+        names = sorted({op[1] for op in ops
+                        if isinstance(op, list) and len(op) > 1 and isinstance(op[1], str)
+                        and op[1] in self._locks})
+        results: List[List[Any]] = []
+        with ExitStack() as stack:
+            for name in names:
+                stack.enter_context(self._locks[name])
+            for op in ops:
+                try:
+                    if not isinstance(op, list) or not op:
+                        raise ProtocolError("batch entries are [op, device, key(, value)]")
+                    results.append([True, self._run(op[0], op[1:])])
+                except Exception as exc:
+                    results.append([False, _error(exc)])
+        return results
+
+    def dispatch(self, msg: Any) -> List[Any]:
+        """Handle one decoded request; always returns a reply."""
+        if not isinstance(msg, list) or len(msg) != 3 or not isinstance(msg[2], list):
+            return [None, False, ["ProtocolError", "request must be [seq, op, params]"]]
+        seq, op, params = msg
+        try:
+            if op == "ping":
+                result: Any = "pong"
+            elif op == "devices":
+                result = {name: getattr(dev, "model", None) for name, dev in self.devices.items()}
+            elif op == "batch":
+                result = self._batch(params)
+            elif op in ("read", "set"):
+                name = params[0] if params else None
+                self._device(name)
+                with self._locks[name]:
+                    result = self._run(op, params)
+            else:
+                raise ProtocolError(f"unknown op: {op!r}")
+        except Exception as exc:
+            return [seq, False, _error(exc)]
+        return [seq, True, result]
+
+
+# Error types a reply may name; anything else surfaces as DeviceError.
+_ERRORS = {
+    name: obj for name, obj in vars(exceptions).items()
+    if isinstance(obj, type) and issubclass(obj, Exception)
+}
+for _exc in (KeyError, ValueError, TypeError, PermissionError, RuntimeError):
+    _ERRORS.setdefault(_exc.__name__, _exc)
+
+
+def _raise(error: Any) -> None:
+    name, message = error if isinstance(error, list) and len(error) == 2 else ("DeviceError", str(error))
+    raise _ERRORS.get(name, DeviceError)(message)
+
+
+class BatchError(DeviceError):
+    """Raised by LabClient.batch(check=True) when an op failed; see .results."""
+
+    def __init__(self, message: str, results: List[List[Any]]) -> None:
+        super().__init__(message)
+        self.results = results
+
+
+class LabClient:
+    """Client for LabDaemon. One socket, reused for every call; thread-safe."""
+
+    def __init__(self, path: Union[str, Path], timeout: Optional[float] = 10.0) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(deadline.io_timeout(timeout, "labd connect"))
+            self._sock.connect(str(self.path))
+        except socket.timeout as exc:
+            self._sock.close()
+            raise DeviceTimeout(f"connect to {self.path} timed out") from exc
+        except OSError as exc:
+            self._sock.close()
+            raise exceptions.ConnectionError(f"no lab daemon at {self.path}: {exc}") from exc
+        self._rfile = self._sock.makefile("rb")
+
+    def call(self, op: str, params: Optional[List[Any]] = None) -> Any:
+        with self._lock:
+            self._seq = seq = (self._seq + 1) & 0xFFFFFFFF
+            try:
+                self._sock.settimeout(deadline.io_timeout(self.timeout, f"labd {op}"))
+                self._sock.sendall(wire.frame([seq, op, params or []]))
+                reply = wire.read_frame(self._rfile)
+            except socket.timeout as exc:
+                self.close()  # reply may still arrive; the stream is out of step
+                raise DeviceTimeout(f"labd {op} timed out") from exc
+            except (OSError, ValueError) as exc:  # ValueError: used after close()
+                self.close()
+                raise exceptions.ConnectionError(f"lab daemon connection lost: {exc}") from exc
+        if reply is None:
+            raise exceptions.ConnectionError("lab daemon closed the connection")
+        if not isinstance(reply, list) or len(reply) != 3 or reply[0] != seq:
+            raise ProtocolError(f"unexpected reply: {reply!r}")
+        _, ok, result = reply
+        if not ok:
+            _raise(result)
+        return result
+
+    def ping(self) -> str:
+        return self.call("ping")
+
+    def devices(self) -> Dict[str, Any]:
+        return self.call("devices")
+
+    def read(self, device: str, key: str, timeout: Optional[float] = None) -> Any:
+        return self.call("read", [device, key] if timeout is None else [device, key, timeout])
+
+    def set(self, device: str, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        params = [device, key, value] if timeout is None else [device, key, value, timeout]
+        self.call("set", params)
+
+    def batch(self, ops: Iterable[Op], check: bool = True) -> List[Any]:
+        """Run ops atomically per device; returns each op's result in order.
+
+        With ``check=False`` returns the raw ``[ok, result]`` pairs instead of
+        raising BatchError on the first failure.
+        """
+        results = self.call("batch", [list(op) for op in ops])
+        if not check:
+            return results
+        for i, (ok, result) in enumerate(results):
+            if not ok:
+                raise BatchError(f"batch op {i} failed: {result[0]}: {result[1]}", results)
+        return [result for _, result in results]
+
+    def close(self) -> None:
+        try:
+            self._rfile.close()
+        finally:
+            self._sock.close()
+
+    def __enter__(self) -> "LabClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
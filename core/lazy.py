@@ -0,0 +1,39 @@
+"""Lazy attribute loading for package ``__init__`` modules (PEP 562).
+
+Packages declare their public exports as ``name -> (module, attribute)`` and
+let this helper build the module-level ``__getattr__``/``__dir__`` pair. The
+target module is imported on first access and the result is cached in the
+package globals, so later lookups cost a plain dict hit.
+"""
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+LazyExports = Mapping[str, Tuple[str, Optional[str]]]
+
+
+def lazy_exports(
+    package: str, namespace: Dict[str, Any], exports: LazyExports
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return ``(__getattr__, __dir__)`` for ``package``.
+
+    ``exports`` maps a public name to ``(module, attribute)``; ``module`` may be
+    relative to ``package`` and ``attribute`` may be ``None`` to export the
+    module itself.
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module_name, attr = exports[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        module = import_module(module_name, package)
+        value = module if attr is None else getattr(module, attr)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,280 @@
+"""Append-only columnar measurement log with a memory-mapped reader.
+
+Readings are buffered per series (device, key) and flushed as fixed-width
+column chunks, so a soak run costs one ``write()`` per ``chunk_rows`` samples
+instead of one per sample.
+
+File layout (little-endian, every record 8-byte aligned)::
+
+    b"MEASLOG1"
+    SERS  <4sII>  series id, payload length, then JSON {"device", "key"} (padded)
+    CHNK  <4sIIIdd> rows, series id, crc32, t_min, t_max
+          then rows x float64 timestamps, rows x float64 values
+    ...
+    footer JSON index, then <Q8s> footer offset + b"MEASIDX1"
+
+The footer is only an accelerator: every chunk it lists is checked against
+its record header and CRC, and if it is missing (crash) or does not match the
+records the reader scans them instead and stops at the first incomplete or corrupt chunk, so at most the
+unflushed tail is lost. Reopening a file for append drops the footer (or the
+torn tail) and continues where the valid data ends.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from core.exceptions import ProtocolError
+
+MAGIC = b"MEASLOG1"
+FOOTER_MAGIC = b"MEASIDX1"
+
+_SERS = struct.Struct("<4sII")
+_CHNK = struct.Struct("<4sIIIdd")
+_TRAILER = struct.Struct("<Q8s")
+_F8 = 8
+
+Series = Tuple[str, str]
+
+
+class ChunkInfo(NamedTuple):
+    offset: int      # offset of the timestamp column
+    rows: int
+    series_id: int
+    t_min: float
+    t_max: float
+
+
+def _pad8(n: int) -> int:
+    return (-n) % 8
+
+
+def _scan(buf) -> Tuple[Dict[int, Series], List[ChunkInfo], int]:
+    """Walk the records in ``buf``; return (series, chunks, end of valid data)."""
+    if bytes(buf[:len(MAGIC)]) != MAGIC:
+        raise ProtocolError("not a measurement log")
+    series: Dict[int, Series] = {}
+    chunks: List[ChunkInfo] = []
+    pos = len(MAGIC)
+    size = len(buf)
+    while pos + 4 <= size:
+        tag = bytes(buf[pos:pos + 4])
+        if tag == b"SERS":
+            if pos + _SERS.size > size:
+                break
+            _, sid, n = _SERS.unpack_from(buf, pos)
+            end = pos + _SERS.size + n
+            if end + _pad8(_SERS.size + n) > size:
+                break
+            try:
+                meta = json.loads(bytes(buf[pos + _SERS.size:end]).decode("utf-8"))
+            except ValueError:
+                break
+            series[sid] = (meta["device"], meta["key"])
+            pos = end + _pad8(_SERS.size + n)
+        elif tag == b"CHNK":
+            if pos + _CHNK.size > size:
+                break
+            _, rows, sid, crc, t_min, t_max = _CHNK.unpack_from(buf, pos)
+            data = pos + _CHNK.size
+            end = data + 2 * rows * _F8
+            if end > size or sid not in series or zlib.crc32(buf[data:end]) != crc:
+                break
+            chunks.append(ChunkInfo(data, rows, sid, t_min, t_max))
+            pos = end
+        else:
+            break  # footer or garbage: end of record stream
+    return series, chunks, pos
+
+
+def _read_footer(buf) -> Optional[Tuple[Dict[int, Series], List[ChunkInfo]]]:
+    if len(buf) < len(MAGIC) + _TRAILER.size:
+        return None
+    off, magic = _TRAILER.unpack_from(buf, len(buf) - _TRAILER.size)
+    if magic != FOOTER_MAGIC or off >= len(buf) - _TRAILER.size:
+        return None
+    try:
+        idx = json.loads(bytes(buf[off:len(buf) - _TRAILER.size]).decode("utf-8"))
+        series = {int(k): (v[0], v[1]) for k, v in idx["series"].items()}
+        chunks = [ChunkInfo(*c) for c in idx["chunks"]]
+    except (ValueError, KeyError, TypeError):
+        return None
+    for c in chunks:
+        if not _chunk_matches(buf, c, series, off):
+            return None
+    return series, chunks
+
+
+def _chunk_matches(buf, c: ChunkInfo, series: Dict[int, Series], limit: int) -> bool:
+    """True if the CHNK record before ``c.offset`` describes ``c`` and its CRC holds."""
+    if not (isinstance(c.offset, int) and isinstance(c.rows, int)) or c.series_id not in series:
+        return False
+    head = c.offset - _CHNK.size
+    end = c.offset + 2 * c.rows * _F8
+    if head < len(MAGIC) or c.rows < 0 or end > limit:
+        return False
+    tag, rows, sid, crc, t_min, t_max = _CHNK.unpack_from(buf, head)
+    return (tag == b"CHNK" and (rows, sid, t_min, t_max) == (c.rows, c.series_id, c.t_min, c.t_max)
+            and zlib.crc32(buf[c.offset:end]) == crc)
+
+
+class MeasurementLogWriter:
+    """Buffer readings per (device, key) and append them as column chunks."""
+
+    def __init__(self, path: Union[str, Path], chunk_rows: int = 4096) -> None:
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+        self._ids: Dict[Series, int] = {}
+        self._chunks: List[ChunkInfo] = []
+        self._buffers: Dict[int, Tuple[array, array]] = {}
+        self._f = self._open()
+
+    def _open(self):
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            f = self.path.open("wb")
+            f.write(MAGIC)
+            return f
+        f = self.path.open("r+b")
+        data = f.read()
+        series, chunks, end = _scan(data)
+        self._ids = {s: sid for sid, s in series.items()}
+        self._chunks = chunks
+        f.truncate(end)  # drop old footer / torn tail
+        f.seek(end)
+        return f
+
+    def _series_id(self, device: str, key: str) -> int:
+        s = (device, key)
+        sid = self._ids.get(s)
+        if sid is None:
+            sid = len(self._ids)
+            payload = json.dumps({"device": device, "key": key}).encode("utf-8")
+            rec = _SERS.pack(b"SERS", sid, len(payload)) + payload
+            self._f.write(rec + b"\0" * _pad8(len(rec)))
+            self._ids[s] = sid
+        return sid
+
+    def append(self, device: str, key: str, value: float, t: Optional[float] = None) -> None:
+        sid = self._series_id(device, key)
+        buf = self._buffers.get(sid)
+        if buf is None:
+            buf = self._buffers[sid] = (array("d"), array("d"))
+        buf[0].append(time.time() if t is None else t)
+        buf[1].append(float(value))
+        if len(buf[0]) >= self.chunk_rows:
+            self._flush_series(sid)
+
+    def _flush_series(self, sid: int) -> None:
+        ts, vals = self._buffers.pop(sid, (None, None))
+        if not ts:
+            return
+        cols = ts.tobytes() + vals.tobytes()
+        head = _CHNK.pack(b"CHNK", len(ts), sid, zlib.crc32(cols), min(ts), max(ts))
+        offset = self._f.tell() + _CHNK.size
+        self._f.write(head + cols)  # one write per chunk
+        self._chunks.append(ChunkInfo(offset, len(ts), sid, min(ts), max(ts)))
+
+    def flush(self) -> None:
+        for sid in list(self._buffers):
+            self._flush_series(sid)
+        self._f.flush()
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self.flush()
+        footer = json.dumps({
+            "series": {sid: list(s) for s, sid in self._ids.items()},
+            "chunks": [list(c) for c in self._chunks],
+        }).encode("utf-8")
+        off = self._f.tell()
+        self._f.write(footer + _TRAILER.pack(off, FOOTER_MAGIC))
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+
+    def __enter__(self) -> "MeasurementLogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class MeasurementLog:
+    """Memory-mapped reader; query() returns NumPy views into the file."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        index = _read_footer(self._mm)
+        self.recovered = index is None
+        if index is None:
+            series, chunks, _ = _scan(self._mm)
+        else:
+            series, chunks = index
+        self._series = series
+        self._by_series: Dict[int, List[ChunkInfo]] = {}
+        for c in chunks:
+            self._by_series.setdefault(c.series_id, []).append(c)
+        self._ids = {s: sid for sid, s in series.items()}
+
+    def series(self) -> List[Series]:
+        return sorted(self._ids)
+
+    def rows(self, device: str, key: str) -> int:
+        return sum(c.rows for c in self._by_series.get(self._ids.get((device, key)), []))
+
+    def _columns(self, c: ChunkInfo):
+        ts = np.frombuffer(self._mm, dtype="<f8", count=c.rows, offset=c.offset)
+        vals = np.frombuffer(self._mm, dtype="<f8", count=c.rows, offset=c.offset + c.rows * _F8)
+        return ts, vals
+
+    def query(self, device: str, key: str, t0: Optional[float] = None, t1: Optional[float] = None):
+        """Return ``(timestamps, values)`` for ``t0 <= t <= t1``.
+
+        Only chunks overlapping the range are touched. A range served by one
+        chunk returns read-only views into the mapping; otherwise the matching
+        slices are concatenated. Timestamps are assumed non-decreasing.
+        """
+        lo = -np.inf if t0 is None else t0
+        hi = np.inf if t1 is None else t1
+        parts = []
+        for c in self._by_series.get(self._ids.get((device, key)), []):
+            if c.t_max < lo or c.t_min > hi:
+                continue
+            ts, vals = self._columns(c)
+            i = np.searchsorted(ts, lo, side="left")
+            j = np.searchsorted(ts, hi, side="right")
+            if j > i:
+                parts.append((ts[i:j], vals[i:j]))
+        if not parts:
+            empty = np.empty(0, dtype="<f8")
+            return empty, empty
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # views still alive: the mapping is released with the last one
+        self._file.close()
+
+    def __enter__(self) -> "MeasurementLog":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
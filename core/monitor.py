@@ -0,0 +1,352 @@
+"""Threshold / alarm monitor evaluated over batches of readings.
+
+Rules are registered per (device, key) channel::
+
+    mon = Monitor()
+    mon.add(psu, "current", Threshold(hi=2.5, hysteresis=0.1), on_alarm=output_off(psu))
+    mon.add(psu, "voltage", RateOfChange(max_per_s=5.0))
+    mon.add(psu, "temp", WindowAverage(window=10, hi=60.0, hysteresis=2.0))
+
+The acquisition path hands over scans: ``feed(t, values)`` with one row per
+scan and one column per channel (``mon.channels`` order; NaN = not sampled).
+Rules are compiled once into per-kind NumPy arrays, so a batch is evaluated
+with a handful of array operations however many channels are watched.
+``poll()`` reads the registered devices once and feeds that row; ``run()``
+polls on a background thread, which bounds alarm latency to one interval plus
+the evaluation time (see ``stats``).
+
+Every rule has a set and a clear condition; between them (the hysteresis
+band) the alarm keeps its state. Callbacks fire on transitions only, in
+sample order: ``on_alarm`` when a rule trips, ``on_clear`` when it recovers.
+Rate and window rules look at consecutive scans; a NaN breaks the rate and
+leaves the window average undefined until it is full again.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+_INF = math.inf
+
+
+class Rule:
+    """Base class; a rule instance watches exactly one channel."""
+
+    __slots__ = ("hysteresis",)
+
+    def __init__(self, hysteresis: float = 0.0) -> None:
+        if hysteresis < 0:
+            raise ValueError("hysteresis must be >= 0")
+        self.hysteresis = float(hysteresis)
+
+
+class Threshold(Rule):
+    """Alarm while the value is above ``hi`` or below ``lo``."""
+
+    __slots__ = ("lo", "hi")
+
+    def __init__(self, lo: Optional[float] = None, hi: Optional[float] = None,
+                 hysteresis: float = 0.0) -> None:
+        super().__init__(hysteresis)
+        if lo is None and hi is None:
+            raise ValueError("threshold needs lo and/or hi")
+        self.lo = -_INF if lo is None else float(lo)
+        self.hi = _INF if hi is None else float(hi)
+        if self.lo + self.hysteresis > self.hi - self.hysteresis:
+            raise ValueError("hysteresis band leaves no clear region between lo and hi")
+
+    def __repr__(self) -> str:
+        return f"Threshold(lo={self.lo}, hi={self.hi}, hysteresis={self.hysteresis})"
+
+
+class RateOfChange(Rule):
+    """Alarm while |dvalue/dt| between consecutive scans exceeds ``max_per_s``."""
+
+    __slots__ = ("max_per_s",)
+
+    def __init__(self, max_per_s: float, hysteresis: float = 0.0) -> None:
+        super().__init__(hysteresis)
+        if max_per_s <= 0:
+            raise ValueError("max_per_s must be positive")
+        if self.hysteresis >= max_per_s:
+            raise ValueError("hysteresis must be smaller than max_per_s")
+        self.max_per_s = float(max_per_s)
+
+    def __repr__(self) -> str:
+        return f"RateOfChange(max_per_s={self.max_per_s}, hysteresis={self.hysteresis})"
+
+
+class WindowAverage(Threshold):
+    """Threshold on the mean of the last ``window`` scans."""
+
+    __slots__ = ("window",)
+
+    def __init__(self, window: int, lo: Optional[float] = None, hi: Optional[float] = None,
+                 hysteresis: float = 0.0) -> None:
+        super().__init__(lo, hi, hysteresis)
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = int(window)
+
+    def __repr__(self) -> str:
+        return (f"WindowAverage(window={self.window}, lo={self.lo}, hi={self.hi}, "
+                f"hysteresis={self.hysteresis})")
+
+
+class Alarm(NamedTuple):
+    """A rule transition. ``value`` is what the rule evaluated (value, rate or mean)."""
+    device: Any
+    key: str
+    rule: Rule
+    t: float
+    value: float
+    active: bool
+
+
+Callback = Callable[[Alarm], None]
+
+
+def output_off(psu: Any) -> Callback:
+    """Auto-action: switch the PSU output off when the rule trips."""
+    def action(alarm: Alarm) -> None:
+        psu.output = False
+    return action
+
+
+class _Entry(NamedTuple):
+    rule: Rule
+    col: int
+    on_alarm: Optional[Callback]
+    on_clear: Optional[Callback]
+
+
+class _Compiled(NamedTuple):
+    thresholds: Tuple[Any, ...]          # (ids, cols, lo, hi, h)
+    rates: Tuple[Any, ...]               # (ids, cols, max, h)
+    windows: Dict[int, Tuple[Any, ...]]  # window -> (ids, cols, lo, hi, h)
+    history: int                         # scans of history the windows need
+
+
+def _band(v, lo, hi, h):
+    tripped = (v > hi) | (v < lo)
+    clear = (v <= hi - h) & (v >= lo + h)
+    return np.where(tripped, 1, np.where(clear, 0, -1)).astype(np.int8)
+
+
+class Monitor:
+    """Compiled rule set over a fixed channel layout."""
+
+    def __init__(self) -> None:
+        self.channels: List[Tuple[Hashable, str]] = []
+        self._col: Dict[Tuple[Hashable, str], int] = {}
+        self._entries: List[_Entry] = []
+        self._rules: set = set()
+        self._compiled: Optional[_Compiled] = None
+        self._lock = threading.Lock()
+        self._active = np.zeros(0, dtype=bool)
+        self._last_t = math.nan
+        self._last_row = np.zeros(0)
+        self._history = np.zeros((0, 0))
+        self.errors: List[Tuple[Alarm, Exception]] = []
+        self.stats: Dict[str, float] = {"batches": 0, "scans": 0, "last_eval_s": 0.0, "max_eval_s": 0.0}
+
+    # ----- Registration -------------------------------------------------------
+    def channel(self, device: Hashable, key: str) -> int:
+        """Column of (device, key) in ``feed`` batches; adds it if new."""
+        with self._lock:
+            return self._channel(device, key)
+
+    def _channel(self, device: Hashable, key: str) -> int:
+        col = self._col.get((device, key))
+        if col is None:
+            col = self._col[(device, key)] = len(self.channels)
+            self.channels.append((device, key))
+            self._compiled = None
+        return col
+
+    def add(self, device: Hashable, key: str, rule: Rule,
+            on_alarm: Optional[Callback] = None, on_clear: Optional[Callback] = None) -> Rule:
+        """Watch (device, key) with ``rule``. Alarm state carries across additions."""
+        if not isinstance(rule, Rule):
+            raise TypeError("rule must be a Threshold, RateOfChange or WindowAverage")
+        with self._lock:
+            if id(rule) in self._rules:
+                raise ValueError("rule instance is already registered")
+            col = self._channel(device, key)
+            self._rules.add(id(rule))
+            self._entries.append(_Entry(rule, col, on_alarm, on_clear))
+            self._compiled = None
+        return rule
+
+    def _compile(self) -> _Compiled:
+        def arr(values, dtype=np.float64):
+            return np.array(values, dtype=dtype)
+
+        thr, rate, win = [], [], {}
+        for i, e in enumerate(self._entries):
+            if isinstance(e.rule, WindowAverage):
+                win.setdefault(e.rule.window, []).append((i, e))
+            elif isinstance(e.rule, Threshold):
+                thr.append((i, e))
+            else:
+                rate.append((i, e))
+
+        def band(group):
+            return (arr([i for i, _ in group], np.intp), arr([e.col for _, e in group], np.intp),
+                    arr([e.rule.lo for _, e in group]), arr([e.rule.hi for _, e in group]),
+                    arr([e.rule.hysteresis for _, e in group]))
+
+        windows = {n: band(group) for n, group in win.items()}
+        compiled = _Compiled(
+            thresholds=band(thr),
+            rates=(arr([i for i, _ in rate], np.intp), arr([e.col for _, e in rate], np.intp),
+                   arr([e.rule.max_per_s for _, e in rate]), arr([e.rule.hysteresis for _, e in rate])),
+            windows=windows,
+            history=max(windows, default=1) - 1,
+        )
+        # Grow per-rule / per-channel state for what was added since last time
+        n = len(self.channels)
+        self._active = np.concatenate([self._active, np.zeros(len(self._entries) - len(self._active), bool)])
+        self._last_row = np.concatenate([self._last_row, np.full(n - len(self._last_row), math.nan)])
+        history = np.full((max(compiled.history, len(self._history)), n), math.nan)
+        history[len(history) - len(self._history):, :self._history.shape[1]] = self._history
+        self._history = history
+        return compiled
+
+    # ----- Evaluation ---------------------------------------------------------
+    def feed(self, t: Sequence[float], values: Any) -> List[Alarm]:
+        """Evaluate a batch of scans; fires callbacks and returns the transitions.
+
+        ``t`` has one timestamp (seconds) per scan; ``values`` is
+        (scans, channels), or one scan as a 1-D row.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            events = self._evaluate(np.atleast_1d(np.asarray(t, dtype=np.float64)),
+                                    np.asarray(values, dtype=np.float64))
+        for alarm, callback in events:
+            if callback is None:
+                continue
+            try:
+                callback(alarm)
+            except Exception as exc:  # one failing action must not block the others
+                self.errors.append((alarm, exc))
+        elapsed = time.perf_counter() - started
+        self.stats["last_eval_s"] = elapsed
+        self.stats["max_eval_s"] = max(self.stats["max_eval_s"], elapsed)
+        return [alarm for alarm, _ in events]
+
+    def _evaluate(self, t, values) -> List[Tuple[Alarm, Optional[Callback]]]:
+        if values.ndim == 1:
+            values = values[None, :]
+        rows, n = values.shape
+        if n != len(self.channels) or len(t) != rows:
+            raise ValueError(f"expected {len(t)} x {len(self.channels)} values, got {rows} x {n}")
+        if self._compiled is None:
+            self._compiled = self._compile()
+        c = self._compiled
+        events = np.full((rows, len(self._entries)), -1, dtype=np.int8)
+        metric = np.full((rows, len(self._entries)), math.nan)
+
+        ids, cols, lo, hi, h = c.thresholds
+        if len(ids):
+            v = values[:, cols]
+            events[:, ids] = _band(v, lo, hi, h)
+            metric[:, ids] = v
+
+        ids, cols, limit, h = c.rates
+        if len(ids):
+            prev_v = np.vstack([self._last_row[None, cols], values[:-1, cols]])
+            prev_t = np.concatenate([[self._last_t], t[:-1]])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r = np.abs((values[:, cols] - prev_v) / (t - prev_t)[:, None])
+            events[:, ids] = np.where(r > limit, 1, np.where(r <= limit - h, 0, -1))
+            metric[:, ids] = r
+
+        for window, (ids, cols, lo, hi, h) in c.windows.items():
+            past = self._history[len(self._history) - (window - 1):, cols] if window > 1 else values[:0, cols]
+            v = np.vstack([past, values[:, cols]])
+            ok = np.isfinite(v)
+            sums = np.vstack([np.zeros((1, len(cols))), np.cumsum(np.where(ok, v, 0.0), axis=0)])
+            counts = np.vstack([np.zeros((1, len(cols))), np.cumsum(ok, axis=0)])
+            full = (counts[window:] - counts[:-window]) == window
+            mean = np.where(full, (sums[window:] - sums[:-window]) / window, math.nan)
+            events[:, ids] = _band(mean, lo, hi, h)
+            metric[:, ids] = mean
+
+        # Hysteresis: each rule keeps its last set/clear decision (forward fill)
+        states = np.vstack([self._active[None, :].astype(np.int8), events])
+        decided = np.where(states >= 0, np.arange(rows + 1)[:, None], 0)
+        np.maximum.accumulate(decided, axis=0, out=decided)
+        states = np.take_along_axis(states, decided, axis=0)
+        changed_rows, changed_ids = np.nonzero(states[1:] != states[:-1])
+        self._active = states[-1].astype(bool)
+
+        self._last_row = values[-1].copy()
+        self._last_t = float(t[-1])
+        if c.history:
+            self._history = np.vstack([self._history, values])[-c.history:]
+        self.stats["batches"] += 1
+        self.stats["scans"] += rows
+
+        out = []
+        for row, i in zip(changed_rows.tolist(), changed_ids.tolist()):
+            entry = self._entries[i]
+            device, key = self.channels[entry.col]
+            active = bool(states[row + 1, i])
+            alarm = Alarm(device, key, entry.rule, float(t[row]), float(metric[row, i]), active)
+            out.append((alarm, entry.on_alarm if active else entry.on_clear))
+        return out
+
+    def active(self) -> List[Tuple[Any, str, Rule]]:
+        """Rules currently in alarm."""
+        return [(*self.channels[e.col], e.rule) for e, on in zip(self._entries, self._active) if on]
+
+    # ----- Acquisition --------------------------------------------------------
+    def poll(self) -> List[Alarm]:
+        """Read every channel whose device has ``read()`` once and feed the scan."""
+        row = np.full(len(self.channels), math.nan)
+        for col, (device, key) in enumerate(self.channels):
+            read = getattr(device, "read", None)
+            if read is None:
+                continue
+            try:
+                value = read(key)
+            except Exception:
+                continue  # unreadable this scan: NaN
+            if value is not None:
+                row[col] = float(value)
+        return self.feed([time.time()], row)
+
+    def run(self, interval_s: float = 0.1) -> "MonitorThread":
+        """Start polling on a daemon thread."""
+        thread = MonitorThread(self, interval_s)
+        thread.start()
+        return thread
+
+
+class MonitorThread(threading.Thread):
+    """Calls Monitor.poll() every ``interval_s`` until stop()."""
+
+    def __init__(self, monitor: Monitor, interval_s: float = 0.1) -> None:
+        super().__init__(name="monitor", daemon=True)
+        self.monitor = monitor
+        self.interval_s = interval_s
+        self.last_error: Optional[Exception] = None
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_s):
+            try:
+                self.monitor.poll()
+            except Exception as exc:
+                self.last_error = exc
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
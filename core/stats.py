@@ -0,0 +1,28 @@
+"""Small summary statistics for latency and jitter samples."""
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable
+
+
+def percentile(samples: Iterable[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of ``samples``."""
+    data = sorted(samples)
+    if not data:
+        return 0.0
+    k = max(0, min(len(data) - 1, math.ceil(q / 100.0 * len(data)) - 1))
+    return data[k]
+
+
+def latency_stats(samples: Iterable[float]) -> Dict[str, float]:
+    """count/mean/p50/p99/max of ``samples`` (all zero when empty)."""
+    data = sorted(samples)
+    if not data:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(data),
+        "mean": sum(data) / len(data),
+        "p50": percentile(data, 50),
+        "p99": percentile(data, 99),
+        "max": data[-1],
+    }
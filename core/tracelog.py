@@ -0,0 +1,229 @@
+"""Compact append-only binary trace of device traffic, and its replay cursor.
+
+File layout::
+
+    MAGIC
+    record*   # <d d B B B> t, duration, op, arg tag, result tag
+              # followed by the encoded arg, then the encoded result
+
+``t`` is seconds of recording time. A writer reopening an existing trace
+continues from the end of its last record (and drops a partial tail left by
+a crash), so ``t`` never goes backwards across sessions. Values are tagged: none, float64,
+bool, utf-8 string, JSON (for dict results) or error message. Each record is
+written with a single ``write()`` so a crash can only truncate the final
+record, which the reader drops.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from core import deadline
+from core.exceptions import DeviceError, ProtocolError
+
+MAGIC = b"DEVTRC1\n"
+
+_HEAD = struct.Struct("<ddBBB")
+_F64 = struct.Struct("<d")
+_LEN = struct.Struct("<I")
+
+TAG_NONE, TAG_FLOAT, TAG_BOOL, TAG_STR, TAG_JSON, TAG_ERROR = range(6)
+
+# Operation codes (stable: they are persisted)
+OP_CONNECT = 1
+OP_DISCONNECT = 2
+OP_INITIALIZE = 10
+OP_READ = 11
+OP_SET_VOLTAGE = 12
+OP_SET_CURRENT_LIMIT = 13
+OP_TOGGLE_OUTPUT = 14
+OP_POWER_CYCLE = 15
+OP_READ_SETPOINTS = 16
+OP_IDENTIFY = 17
+
+
+class TraceError(Exception):
+    """Wraps an exception captured during recording so it can be replayed."""
+
+
+class TraceRecord(NamedTuple):
+    t: float
+    duration: float
+    op: int
+    arg: object
+    result: object
+
+
+def _encode(value: object) -> Tuple[int, bytes]:
+    if value is None:
+        return TAG_NONE, b""
+    if isinstance(value, TraceError):
+        raw = str(value).encode("utf-8")
+        return TAG_ERROR, _LEN.pack(len(raw)) + raw
+    if isinstance(value, bool):
+        return TAG_BOOL, b"\x01" if value else b"\x00"
+    if isinstance(value, (int, float)):
+        return TAG_FLOAT, _F64.pack(float(value))
+    if isinstance(value, str):
+        raw = value.encode("utf-8")
+        return TAG_STR, _LEN.pack(len(raw)) + raw
+    raw = json.dumps(value).encode("utf-8")
+    return TAG_JSON, _LEN.pack(len(raw)) + raw
+
+
+def _decode(tag: int, buf: memoryview, pos: int) -> Tuple[object, int]:
+    if tag == TAG_NONE:
+        return None, pos
+    if tag == TAG_BOOL:
+        return buf[pos] != 0, pos + 1
+    if tag == TAG_FLOAT:
+        return _F64.unpack_from(buf, pos)[0], pos + _F64.size
+    (n,) = _LEN.unpack_from(buf, pos)
+    pos += _LEN.size
+    if pos + n > len(buf):
+        raise struct.error("truncated payload")
+    text = bytes(buf[pos:pos + n]).decode("utf-8")
+    pos += n
+    if tag == TAG_STR:
+        return text, pos
+    if tag == TAG_JSON:
+        return json.loads(text), pos
+    if tag == TAG_ERROR:
+        return TraceError(text), pos
+    raise ProtocolError(f"unknown trace value tag {tag}")
+
+
+class TraceWriter:
+    """Append records to a trace file. Thread-safe; one writer per file."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        resume = 0.0
+        if self.path.exists() and self.path.stat().st_size:
+            records, end = _parse(memoryview(self.path.read_bytes()), self.path)
+            if records:
+                resume = records[-1].t + records[-1].duration
+            os.truncate(self.path, end)
+        self._f: BinaryIO = self.path.open("ab")
+        if self._f.tell() == 0:
+            self._f.write(MAGIC)
+        self._t0 = time.perf_counter() - resume
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def append(self, t: float, duration: float, op: int, arg: object, result: object) -> None:
+        arg_tag, arg_raw = _encode(arg)
+        res_tag, res_raw = _encode(result)
+        rec = _HEAD.pack(t, duration, op, arg_tag, res_tag) + arg_raw + res_raw
+        with self._lock:
+            self._f.write(rec)
+            self._f.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._f.closed:
+                self._f.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def read_trace(path: Union[str, Path]) -> List[TraceRecord]:
+    """Decode a trace file; a truncated trailing record is ignored."""
+    return _parse(memoryview(Path(path).read_bytes()), path)[0]
+
+
+def _parse(data: memoryview, path: Union[str, Path]) -> Tuple[List[TraceRecord], int]:
+    """Records in ``data`` and the offset just past the last complete one."""
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ProtocolError(f"{path}: not a device trace file")
+    out: List[TraceRecord] = []
+    pos = len(MAGIC)
+    while pos + _HEAD.size <= len(data):
+        t, dur, op, arg_tag, res_tag = _HEAD.unpack_from(data, pos)
+        try:
+            arg, p = _decode(arg_tag, data, pos + _HEAD.size)
+            result, p = _decode(res_tag, data, p)
+        except (struct.error, IndexError, UnicodeDecodeError, ValueError):
+            break  # partially written tail
+        out.append(TraceRecord(t, dur, op, arg, result))
+        pos = p
+    return out, pos
+
+
+class Recorder:
+    """Times a call into an inner object and appends it to a TraceWriter."""
+
+    def __init__(self, writer: TraceWriter) -> None:
+        self.writer = writer
+
+    def call(self, op: int, arg: object, fn, *args):
+        t = self.writer.now()
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception as exc:
+            self.writer.append(t, time.perf_counter() - start, op, arg,
+                               TraceError(f"{type(exc).__name__}: {exc}"))
+            raise
+        self.writer.append(t, time.perf_counter() - start, op, arg, result)
+        return result
+
+
+class ReplaySession:
+    """Sequential cursor over a recorded trace, shared by replay adapters/strategies.
+
+    pacing="original" reproduces the recorded call start times and durations
+    relative to the first replayed call; pacing="fast" returns immediately.
+    Any divergence from the recorded call sequence raises ProtocolError.
+    """
+
+    def __init__(self, records: List[TraceRecord], pacing: str = "fast") -> None:
+        if pacing not in ("fast", "original"):
+            raise ValueError("pacing must be 'fast' or 'original'")
+        self.records = records
+        self.pacing = pacing
+        self._pos = 0
+        self._t0: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], pacing: str = "fast") -> "ReplaySession":
+        return cls(read_trace(path), pacing=pacing)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.records) - self._pos
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        return iter(self.records[self._pos:])
+
+    def next(self, op: int, arg: object) -> object:
+        with self._lock:
+            if self._pos >= len(self.records):
+                raise ProtocolError(f"replay exhausted: unexpected op {op} ({arg!r})")
+            rec = self.records[self._pos]
+            if rec.op != op or rec.arg != arg:
+                raise ProtocolError(
+                    f"replay diverged at record {self._pos}: expected op {rec.op} ({rec.arg!r}), "
+                    f"got op {op} ({arg!r})")
+            self._pos += 1
+            if self.pacing == "original":
+                if self._t0 is None:
+                    self._t0 = time.perf_counter() - rec.t
+                delay = self._t0 + rec.t + rec.duration - time.perf_counter()
+                if delay > 0:
+                    deadline.sleep(delay, "replay")
+        if isinstance(rec.result, TraceError):
+            raise DeviceError(f"replayed failure: {rec.result}")
+        return rec.result
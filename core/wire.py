@@ -0,0 +1,245 @@
+"""Compact binary message framing (a msgpack subset).
+
+Messages are encoded with the msgpack type codes for nil, bool, int,
+float64, str, bin, array and map, so any msgpack library can talk to the
+daemon; only the standard library is needed here. Each message travels as
+one frame: a 4-byte big-endian length followed by the encoded body.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+from core.exceptions import ProtocolError
+
+MAX_FRAME = 16 * 1024 * 1024
+_LEN = struct.Struct(">I")
+
+_B = struct.Struct(">B")
+_H = struct.Struct(">H")
+_I = struct.Struct(">I")
+_Q = struct.Struct(">Q")
+_b = struct.Struct(">b")
+_h = struct.Struct(">h")
+_i = struct.Struct(">i")
+_q = struct.Struct(">q")
+_f = struct.Struct(">f")
+_d = struct.Struct(">d")
+
+
+def _pack_len(out: bytearray, n: int, fix: Optional[int], fix_max: int, c8: Optional[int],
+              c16: int, c32: int) -> None:
+    if fix is not None and n <= fix_max:
+        out.append(fix | n)
+    elif c8 is not None and n < 0x100:
+        out.append(c8)
+        out.append(n)
+    elif n < 0x10000:
+        out.append(c16)
+        out += _H.pack(n)
+    elif n < 0x100000000:
+        out.append(c32)
+        out += _I.pack(n)
+    else:
+        raise ProtocolError("object too large to encode")
+
+
+def _pack_int(out: bytearray, v: int) -> None:
+    if 0 <= v < 0x80:
+        out.append(v)
+    elif -32 <= v < 0:
+        out.append(v & 0xFF)
+    elif v >= 0:
+        if v < 0x100:
+            out.append(0xCC)
+            out.append(v)
+        elif v < 0x10000:
+            out.append(0xCD)
+            out += _H.pack(v)
+        elif v < 0x100000000:
+            out.append(0xCE)
+            out += _I.pack(v)
+        elif v < 0x10000000000000000:
+            out.append(0xCF)
+            out += _Q.pack(v)
+        else:
+            raise ProtocolError("integer too large to encode")
+    elif v >= -0x80:
+        out.append(0xD0)
+        out += _b.pack(v)
+    elif v >= -0x8000:
+        out.append(0xD1)
+        out += _h.pack(v)
+    elif v >= -0x80000000:
+        out.append(0xD2)
+        out += _i.pack(v)
+    elif v >= -0x8000000000000000:
+        out.append(0xD3)
+        out += _q.pack(v)
+    else:
+        raise ProtocolError("integer too large to encode")
+
+
+def _pack(out: bytearray, obj: Any) -> None:
+    if obj is None:
+        out.append(0xC0)
+    elif obj is True:
+        out.append(0xC3)
+    elif obj is False:
+        out.append(0xC2)
+    elif isinstance(obj, int):
+        _pack_int(out, obj)
+    elif isinstance(obj, float):
+        out.append(0xCB)
+        out += _d.pack(obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        _pack_len(out, len(data), 0xA0, 31, 0xD9, 0xDA, 0xDB)
+        out += data
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        _pack_len(out, len(data), None, 0, 0xC4, 0xC5, 0xC6)
+        out += data
+    elif isinstance(obj, (list, tuple)):
+        _pack_len(out, len(obj), 0x90, 15, None, 0xDC, 0xDD)
+        for item in obj:
+            _pack(out, item)
+    elif isinstance(obj, dict):
+        _pack_len(out, len(obj), 0x80, 15, None, 0xDE, 0xDF)
+        for key, value in obj.items():
+            _pack(out, key)
+            _pack(out, value)
+    else:
+        raise ProtocolError(f"cannot encode {type(obj).__name__}")
+
+
+def packb(obj: Any) -> bytes:
+    """Encode ``obj`` (None, bool, int, float, str, bytes, list/tuple, dict)."""
+    out = bytearray()
+    _pack(out, obj)
+    return bytes(out)
+
+
+class _Reader:
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf: bytes) -> None:
+        self.buf = buf
+        self.pos = 0
+
+    def take(self, n: int) -> bytes:
+        end = self.pos + n
+        if end > len(self.buf):
+            raise ProtocolError("truncated message")
+        chunk = self.buf[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def unpack(self, st: struct.Struct) -> Any:
+        end = self.pos + st.size
+        if end > len(self.buf):
+            raise ProtocolError("truncated message")
+        (value,) = st.unpack_from(self.buf, self.pos)
+        self.pos = end
+        return value
+
+
+def _str(r: _Reader, n: int) -> str:
+    try:
+        return r.take(n).decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise ProtocolError("invalid utf-8 in string") from exc
+
+
+def _array(r: _Reader, n: int) -> List[Any]:
+    return [_unpack(r) for _ in range(n)]
+
+
+def _map(r: _Reader, n: int) -> Dict[Any, Any]:
+    out = {}
+    for _ in range(n):
+        key = _unpack(r)
+        try:
+            out[key] = _unpack(r)
+        except TypeError as exc:  # unhashable key (e.g. an array)
+            raise ProtocolError("unsupported map key") from exc
+    return out
+
+
+# type code -> decoder for the fixed-width codes
+_DECODERS: Dict[int, Callable[[_Reader], Any]] = {
+    0xC0: lambda r: None,
+    0xC2: lambda r: False,
+    0xC3: lambda r: True,
+    0xC4: lambda r: r.take(r.unpack(_B)),
+    0xC5: lambda r: r.take(r.unpack(_H)),
+    0xC6: lambda r: r.take(r.unpack(_I)),
+    0xCA: lambda r: r.unpack(_f),
+    0xCB: lambda r: r.unpack(_d),
+    0xCC: lambda r: r.unpack(_B),
+    0xCD: lambda r: r.unpack(_H),
+    0xCE: lambda r: r.unpack(_I),
+    0xCF: lambda r: r.unpack(_Q),
+    0xD0: lambda r: r.unpack(_b),
+    0xD1: lambda r: r.unpack(_h),
+    0xD2: lambda r: r.unpack(_i),
+    0xD3: lambda r: r.unpack(_q),
+    0xD9: lambda r: _str(r, r.unpack(_B)),
+    0xDA: lambda r: _str(r, r.unpack(_H)),
+    0xDB: lambda r: _str(r, r.unpack(_I)),
+    0xDC: lambda r: _array(r, r.unpack(_H)),
+    0xDD: lambda r: _array(r, r.unpack(_I)),
+    0xDE: lambda r: _map(r, r.unpack(_H)),
+    0xDF: lambda r: _map(r, r.unpack(_I)),
+}
+
+
+def _unpack(r: _Reader) -> Any:
+    code = r.unpack(_B)
+    if code < 0x80:
+        return code
+    if code >= 0xE0:
+        return code - 0x100
+    if code < 0x90:
+        return _map(r, code & 0x0F)
+    if code < 0xA0:
+        return _array(r, code & 0x0F)
+    if code < 0xC0:
+        return _str(r, code & 0x1F)
+    decoder = _DECODERS.get(code)
+    if decoder is None:
+        raise ProtocolError(f"unsupported type code 0x{code:02x}")
+    return decoder(r)
+
+
+def unpackb(data: bytes) -> Any:
+    """Decode one object; trailing bytes are a protocol error."""
+    r = _Reader(bytes(data))
+    obj = _unpack(r)
+    if r.pos != len(r.buf):
+        raise ProtocolError("trailing bytes after message")
+    return obj
+
+
+def frame(obj: Any) -> bytes:
+    """Encode ``obj`` as one length-prefixed frame."""
+    body = packb(obj)
+    if len(body) > MAX_FRAME:
+        raise ProtocolError("frame too large")
+    return _LEN.pack(len(body)) + body
+
+
+def read_frame(stream: BinaryIO) -> Optional[Any]:
+    """Read and decode one frame; None on a clean EOF between frames."""
+    head = stream.read(_LEN.size)
+    if not head:
+        return None
+    if len(head) < _LEN.size:
+        raise ProtocolError("truncated frame header")
+    (n,) = _LEN.unpack(head)
+    if n > MAX_FRAME:
+        raise ProtocolError(f"frame too large ({n} bytes)")
+    body = stream.read(n)
+    if len(body) < n:
+        raise ProtocolError("truncated frame")
+    return unpackb(body)
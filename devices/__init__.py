@@ -1,15 +1,19 @@
 """Devices package.
 
-Exports common demo instruments for convenience.
+Exports common demo instruments for convenience. Exports are resolved lazily,
+so ``import devices.base`` does not load the PSU stack.
 
 Note: Prefer importing specific modules (devices.psu, ...).
 """
-from . import psu as psu  # make `devices.psu` available via package import
-from .psu import PSU, PsuStrategy, VirtualPsuStrategy  # noqa: F401
-
-# Try to expose RealPsuStrategy only if it exists
-try:
-    from .psu import RealPsuStrategy  # noqa: F401
-    __all__ = ["psu", "PSU", "PsuStrategy", "VirtualPsuStrategy", "RealPsuStrategy"]
-except Exception:
-    __all__ = ["psu", "PSU", "PsuStrategy", "VirtualPsuStrategy"]
+from core.lazy import lazy_exports
+
+_EXPORTS = {
+    "psu": (".psu", None),  # make `devices.psu` available via package import
+    "PSU": (".psu", "PSU"),
+    "PsuStrategy": (".psu", "PsuStrategy"),
+    "VirtualPsuStrategy": (".psu", "VirtualPsuStrategy"),
+    "RealPsuStrategy": (".psu", "RealPsuStrategy"),
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
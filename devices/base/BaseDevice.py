@@ -1,8 +1,11 @@
 from __future__ import annotations
+import threading
 from abc import ABC, abstractmethod
 from enum import Enum, auto
-from typing import Dict, Optional, Protocol
-from core.exceptions import ConnectionError
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional, Protocol
+from core import deadline as _deadline
+from core.exceptions import ConnectionError, DeviceTimeout
 
 
 class AdapterProtocol(Protocol):
@@ -24,6 +27,11 @@ class DeviceState(Enum):
     ERROR = auto()
 
 
+class DeviceSnapshot(NamedTuple):
+    """Immutable view of a device published after every committed change."""
+    state: DeviceState
+
+
 class BaseDevice(ABC):
     """Base class for devices providing connection lifecycle management.
 
@@ -31,55 +39,136 @@ class BaseDevice(ABC):
     - Subclasses must implement get_state, get_capabilities, read, set.
     - Do not override connect/disconnect unless you must extend behavior;
       if you do, call super().connect()/disconnect() to preserve state.
+
+    Deadlines: ``timeout`` bounds every operation that does not run inside an
+    explicit scope (``with device.deadline(2.0): ...`` or a per-call
+    ``timeout=``). Expiry raises core.exceptions.DeviceTimeout (during
+    connect() it is the ``__cause__`` of the ConnectionError); see
+    core/deadline.py for how strategies and adapters cooperate.
+
+    Thread-safety model:
+    - Reads of published state (``state``, ``is_connected``, ``snapshot`` and
+      subclass setpoint properties) are lock-free: they return fields of an
+      immutable snapshot that writers replace with a single attribute store.
+    - Mutations and I/O (connect/disconnect, read/set) hold a per-device
+      RLock, so commands to one device are serialized while different
+      devices proceed in parallel. Waiting for the lock honours deadlines.
+    - Transitional states (CONNECTING/DISCONNECTING) are internal to the
+      thread holding the lock; other threads only observe committed states.
+    Subclasses publish new values by calling _publish() with the lock held
+    and extend _make_snapshot() to include their own fields.
+
+    Devices are slotted (no per-instance __dict__) so large simulated fleets
+    stay small; subclasses declare their own __slots__.
     """
 
-    def __init__(self, model: str, adapter: AdapterProtocol, config_loader: ConfigLoaderProtocol) -> None:
+    __slots__ = ("model", "adapter", "config_loader", "timeout", "_state", "_lock", "_snap", "__weakref__")
+
+    def __init__(self, model: str, adapter: AdapterProtocol, config_loader: ConfigLoaderProtocol,
+                 timeout: Optional[float] = None) -> None:
         self.model = model
         self.adapter: AdapterProtocol = adapter
         self.config_loader: ConfigLoaderProtocol = config_loader
+        self.timeout: Optional[float] = timeout
         self._state: DeviceState = DeviceState.DISCONNECTED
+        self._lock = threading.RLock()
+        self._snap = DeviceSnapshot(self._state)
+
+    # ----- Published snapshot (lock-free reads) -------------------------------
+    def _make_snapshot(self) -> DeviceSnapshot:
+        return DeviceSnapshot(self._state)
+
+    def _publish(self) -> None:
+        self._snap = self._make_snapshot()
+
+    @property
+    def snapshot(self) -> DeviceSnapshot:
+        return self._snap
 
     @property
     def state(self) -> DeviceState:
-        return self._state
+        return self._snap.state
 
     @property
     def is_connected(self) -> bool:
-        return self._state is DeviceState.CONNECTED
+        return self._snap.state is DeviceState.CONNECTED
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the device lock, giving up with DeviceTimeout at the deadline."""
+        left = _deadline.remaining()
+        if left is None:
+            acquired = self._lock.acquire()
+        else:
+            acquired = left > 0 and self._lock.acquire(timeout=left)
+        if not acquired:
+            raise DeviceTimeout(f"{self.model}: deadline exceeded waiting for device lock")
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def deadline(self, seconds: Optional[float]):
+        """Scope bounding all I/O inside the block: ``with dev.deadline(2.0): ...``."""
+        return _deadline.deadline(seconds)
+
+    @contextmanager
+    def _call_deadline(self, timeout: Optional[float] = None) -> Iterator[None]:
+        # Per-call timeout wins; otherwise an enclosing scope wins over the
+        # device default, so nested calls never shorten an explicit bound.
+        if timeout is None and (self.timeout is None or _deadline.current() is not None):
+            yield
+            return
+        with _deadline.deadline(self.timeout if timeout is None else timeout):
+            yield
 
     def connect(self) -> None:
         if self.is_connected:
             return
-        self._state = DeviceState.CONNECTING
-        try:
-            self.adapter.connect()
-            # Post-connect hook for subclass
-            on_connect = getattr(self, "_on_connect", None)
-            if callable(on_connect):
-                on_connect()
-
-            self._state = DeviceState.CONNECTED
-        except Exception as exc:
-            self._state = DeviceState.ERROR
-
-        except Exception as exc:
-            self._state = DeviceState.ERROR
-            raise ConnectionError(f"Connect error: {exc}") from exc
+        with self._call_deadline(), self._locked():
+            if self._state is DeviceState.CONNECTED:
+                return  # another thread won the race
+            self._state = DeviceState.CONNECTING
+            try:
+                self.adapter.connect()
+                # Post-connect hook for subclass
+                on_connect = getattr(self, "_on_connect", None)
+                if callable(on_connect):
+                    on_connect()
+
+                self._state = DeviceState.CONNECTED
+            except DeviceTimeout as exc:
+                # Leave a clean slate so a plain connect() retry can succeed
+                self._state = DeviceState.ERROR
+                try:
+                    self.adapter.disconnect()
+                except Exception:
+                    pass
+                raise ConnectionError(f"Connect error: {exc}") from exc
+            except Exception as exc:
+                self._state = DeviceState.ERROR
+                raise ConnectionError(f"Connect error: {exc}") from exc
+            finally:
+                self._publish()
 
     def disconnect(self) -> None:
-        if self._state is DeviceState.DISCONNECTED:
+        if self.state is DeviceState.DISCONNECTED:
             return
-        self._state = DeviceState.DISCONNECTING
-             # Call any additional post-connect hooks
-        try:
-            self.adapter.disconnect()
-            on_disconnect = getattr(self, "_on_disconnect", None)
-            if callable(on_disconnect):
-                on_disconnect()
-            self._state = DeviceState.DISCONNECTED
-        except Exception as exc:
-            self._state = DeviceState.ERROR
-            raise ConnectionError(f"Disconnect error: {exc}") from exc
+        with self._call_deadline(), self._locked():
+            if self._state is DeviceState.DISCONNECTED:
+                return
+            self._state = DeviceState.DISCONNECTING
+            try:
+                self.adapter.disconnect()
+                on_disconnect = getattr(self, "_on_disconnect", None)
+                if callable(on_disconnect):
+                    on_disconnect()
+                self._state = DeviceState.DISCONNECTED
+            except Exception as exc:
+                self._state = DeviceState.ERROR
+                raise ConnectionError(f"Disconnect error: {exc}") from exc
+            finally:
+                self._publish()
 
     def require_connected(self) -> None:
         if not self.is_connected:
@@ -101,13 +190,13 @@ class BaseDevice(ABC):
         ...
 
     @abstractmethod
-    def read(self, key: str) -> object:
+    def read(self, key: str, timeout: Optional[float] = None) -> object:
         ...
 
     @abstractmethod
-    def set(self, key: str, value: object) -> None:
+    def set(self, key: str, value: object, timeout: Optional[float] = None) -> None:
         ...
 
 
     def __repr__(self) -> str:
-        return f"<{self.__class__.__name__} model={self.model!r} state={self._state.name}>"
+        return f"<{self.__class__.__name__} model={self.model!r} state={self.state.name}>"
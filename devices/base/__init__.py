@@ -1 +1 @@
-from .BaseDevice import BaseDevice, DeviceState, AdapterProtocol, ConfigLoaderProtocol
\ No newline at end of file
+from .BaseDevice import BaseDevice, DeviceSnapshot, DeviceState, AdapterProtocol, ConfigLoaderProtocol
\ No newline at end of file
@@ -1,7 +1,12 @@
 from __future__ import annotations
-from typing import Mapping, Optional, Union, Tuple
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Mapping, NamedTuple, Optional, Union, Tuple
 
-from ..base import BaseDevice, AdapterProtocol, ConfigLoaderProtocol
+from core.exceptions import DeviceTimeout
+from ..base import BaseDevice, AdapterProtocol, ConfigLoaderProtocol, DeviceState
+from .calibration import NO_CALIBRATION, Calibration
+from .session import SessionStore, setpoint_diff
+from .shadow import ShadowRegisters
 from .strategy import (
     PsuStrategy,
     PSUContext,
@@ -9,14 +14,61 @@ from .strategy import (
 )
 
 
+class PsuSnapshot(NamedTuple):
+    """Published PSU state; read lock-free via PSU.snapshot or the setpoint properties."""
+    state: DeviceState
+    voltage: float
+    current_limit: float
+    output: bool
+
+
+class PsuConfig(NamedTuple):
+    """Versioned model policy; swapped as a whole on hot reload."""
+    version: int
+    capabilities: Mapping[str, bool]
+    ranges: Mapping[str, Mapping[str, float]]
+    calibration: Calibration
+
+
+# Capability gating each writable setpoint
+_SETPOINT_CAPABILITY = {
+    "voltage": "set_voltage",
+    "current_limit": "set_current_limit",
+    "output": "toggle_output",
+}
+
+
 class PSU(BaseDevice):
     """
     PSU device with a property-based API (voltage/current_limit/output).
     Keeps a backwards-compatible .set(key, value) method that dispatches to
     the typed properties. All setters gate by capabilities and ranges and
     delegate to the selected strategy.
+
+    Pass ``shadow=ShadowRegisters()`` to skip writes that would not change
+    the instrument's setpoints (see devices/psu/shadow.py).
+
+    Pass ``session=MemorySessionStore()`` (or FileSessionStore) for warm
+    reconnects: setpoints are snapshotted as they are written, and a later
+    connect to the same instrument identity pushes only the settings that
+    differ instead of re-initializing the strategy.
+
+    Readings from read_voltage/read_current/read_temp are corrected with the
+    loader's calibration for this model (and ``serial``, if given); see
+    devices/psu/calibration.py.
+
+    Thread safety follows BaseDevice: setpoint properties read the published
+    PsuSnapshot without locking; setters and reads hold the device lock.
     """
 
+    __slots__ = (
+        "_config", "_attached", "_strategy", "_serial",
+        "_voltage_set", "_current_limit_set", "_output_set",
+        "_shadow", "_session", "_session_key", "_identity", "_wanted", "_last_restore",
+    )
+
+    device_type = "psu"
+
     # keys allowed for read()
     _ALLOWED_READS: Tuple[str, ...] = ("voltage", "current", "temp", "output")
 
@@ -26,6 +78,11 @@ class PSU(BaseDevice):
         adapter: AdapterProtocol,
         config_loader: ConfigLoaderProtocol,
         strategy: Optional[PsuStrategy] = None,
+        shadow: Optional[ShadowRegisters] = None,
+        session: Optional[SessionStore] = None,
+        session_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+        serial: Optional[str] = None,
     ) -> None:
         if adapter is None:
             raise ValueError("adapter is required")
@@ -34,29 +91,232 @@ class PSU(BaseDevice):
         if config_loader is None:
             raise ValueError("config loader is required")
 
-        super().__init__(model, adapter, config_loader)
-        self.device_type = "psu"
-
-        # Load policy from YAML
-        self._capabilities: Mapping[str, bool] = self.config_loader.load_capabilities(
-            self.model)
-        self._ranges: Mapping[str, Mapping[str, float]
-                              ] = self.config_loader.load_ranges(self.model)
+        super().__init__(model, adapter, config_loader, timeout=timeout)
 
         # Strategy selection: default to Virtual if not provided
         self._strategy: PsuStrategy = strategy or VirtualPsuStrategy()
-        self._strategy.attach(PSUContext(
-            capabilities=self._capabilities, ranges=self._ranges))
+
+        # Load policy (and calibration) from YAML
+        self._serial: Optional[str] = serial
+        self._config: PsuConfig = self._load_config()
+        self._attached: Optional[PsuConfig] = None  # config the strategy context reflects
+        self._attach_config(self._config)
 
         # Local setpoints (do NOT perform I/O on property get)
         self._voltage_set: float = 0.0
         self._current_limit_set: float = 0.0
         self._output_set: bool = False
 
+        # Optional write elision (None = every write goes to the strategy)
+        self._shadow: Optional[ShadowRegisters] = shadow
+
+        # Optional warm-reconnect snapshot (None = always cold initialize)
+        self._session: Optional[SessionStore] = session
+        self._session_key: str = session_key or model
+        self._identity: Optional[str] = None
+        self._wanted: Optional[Dict[str, Union[float, bool]]] = {} if session is not None else None
+        self._last_restore: Optional[Dict[str, Union[float, bool]]] = None
+
+        self._publish()
+
+    # ----- Model policy (hot-reloadable) --------------------------------------
+    def _load_config(self) -> PsuConfig:
+        loader = self.config_loader
+        load_policy = getattr(loader, "load_policy", None)
+        if load_policy is not None:
+            # One loader snapshot, so a concurrent reload cannot pair one
+            # version's number with another's data
+            return PsuConfig(*load_policy(self.model, self._serial))
+        # Version first: if a reload lands in between, the config looks stale
+        # and is re-read on next use instead of pinning old data to a new version
+        version = getattr(loader, "version", 0)
+        caps = loader.load_capabilities(self.model)
+        ranges = loader.load_ranges(self.model)
+        load_calibration = getattr(loader, "load_calibration", None)
+        cal = NO_CALIBRATION if load_calibration is None else load_calibration(self.model, self._serial)
+        return PsuConfig(version, caps, ranges, cal)
+
+    def apply_config(self) -> PsuConfig:
+        """Re-read capabilities/ranges from the loader and swap them in.
+
+        Works while connected and does no instrument I/O. Current setpoints
+        are left alone; new limits apply from the next write. The strategy's
+        context follows on its next locked operation, never mid-call.
+        """
+        config = self._config = self._load_config()
+        return config
+
+    def _attach_config(self, config: PsuConfig) -> None:
+        # Only under the device lock (or before the device is shared)
+        if self._attached is not config:
+            self._strategy.attach(PSUContext.shared(capabilities=config.capabilities, ranges=config.ranges))
+            self._attached = config
+
+    def _current_config(self) -> PsuConfig:
+        # Hot reload: a loader with a newer version (see YamlPSUConfigLoader)
+        # is picked up on use; one attribute compare when nothing changed.
+        # Callers take the returned snapshot once, so a concurrent swap
+        # never mixes two versions within one operation.
+        config = self._config
+        if config.version != getattr(self.config_loader, "version", 0):
+            config = self.apply_config()
+        return config
+
+    @property
+    def config_version(self) -> int:
+        return self._current_config().version
+
+    @property
+    def serial(self) -> Optional[str]:
+        return self._serial
+
+    @property
+    def calibration(self) -> Calibration:
+        """Corrections applied to readings; use .apply() for captured arrays."""
+        return self._current_config().calibration
+
+    @property
+    def _capabilities(self) -> Mapping[str, bool]:
+        return self._current_config().capabilities
+
+    @property
+    def _ranges(self) -> Mapping[str, Mapping[str, float]]:
+        return self._current_config().ranges
+
     # ----- BaseDevice hooks (Template Method) --------------------------------
     def _on_connect(self) -> None:
-        # Initialize underlying strategy after transport connect
-        self._strategy.initialize()
+        self._attach_config(self._current_config())
+        if self._session is None or not self._warm_restore():
+            # Initialize underlying strategy after transport connect
+            self._strategy.initialize()
+            if self._session is not None:
+                self._identity = self._strategy.identify()
+        if self._shadow is not None:
+            self._sync_shadow()
+
+    def _on_disconnect(self) -> None:
+        if self._shadow is not None:
+            self._shadow.mark_dirty()
+
+    # ----- Session snapshot (warm reconnect) ----------------------------------
+    @property
+    def last_restore(self) -> Optional[Dict[str, Union[float, bool]]]:
+        """Settings pushed by the last warm connect; None if it was cold."""
+        return self._last_restore
+
+    def _warm_restore(self) -> bool:
+        self._last_restore = None
+        snap = self._session.load(self._session_key)
+        if not snap:
+            return False
+        identity = self._strategy.identify()
+        if snap.get("model") != self.model or snap.get("identity") != identity:
+            # Different instrument behind the transport: snapshot is stale
+            self._session.discard(self._session_key)
+            self._wanted = {}
+            return False
+        self._identity = identity
+        # The config may have changed since the snapshot was taken: only
+        # restore settings the current capabilities and ranges still allow
+        cfg = self._current_config()
+        self._wanted = {}
+        for key, value in (snap.get("setpoints") or {}).items():
+            try:
+                self._wanted[key] = self._validate(cfg, key, value)
+            except (KeyError, PermissionError, ValueError, TypeError):
+                continue
+        readback = self._strategy.read_setpoints()
+        diff = setpoint_diff(self._wanted, readback)
+        for key, value in diff.items():
+            if key == "voltage":
+                self._strategy.set_voltage(float(value))
+            elif key == "current_limit":
+                self._strategy.set_current_limit(float(value))
+            elif key == "output":
+                self._strategy.toggle_output(bool(value))
+        held = {**readback, **self._wanted}
+        self._voltage_set = float(held.get("voltage", self._voltage_set))
+        self._current_limit_set = float(held.get("current_limit", self._current_limit_set))
+        self._output_set = bool(held.get("output", self._output_set))
+        self._last_restore = diff
+        return True
+
+    @staticmethod
+    def _validate(cfg: PsuConfig, key: str, value: object) -> Union[float, bool]:
+        """Capability and range checks for a setpoint; returns the coerced value."""
+        capability = _SETPOINT_CAPABILITY[key]
+        if not cfg.capabilities.get(capability, False):
+            raise PermissionError(f"{capability} not supported by this model")
+        if key == "output":
+            return bool(value)
+        value = float(value)
+        if key == "voltage":
+            lo, hi = cfg.ranges["voltage"]["min"], cfg.ranges["voltage"]["max"]
+            if not (lo <= value <= hi):
+                raise ValueError(f"voltage out of range {lo}..{hi}")
+        # אם תרצה הגבלת טווחים לזרם, הוסף self._ranges["current_limit"] בדיוק כמו voltage
+        return value
+
+    def _remember(self, key: str, value: Union[float, bool]) -> None:
+        if self._session is None:
+            return
+        self._wanted[key] = value
+        self._session.save(self._session_key, {
+            "model": self.model,
+            "identity": self._identity,
+            "setpoints": dict(self._wanted),
+        })
+
+    # ----- Shadow registers ---------------------------------------------------
+    @property
+    def shadow(self) -> Optional[ShadowRegisters]:
+        return self._shadow
+
+    def _sync_shadow(self) -> None:
+        readback = self._strategy.read_setpoints()
+        self._shadow.sync(readback)
+        if "voltage" in readback:
+            self._voltage_set = float(readback["voltage"])
+        if "current_limit" in readback:
+            self._current_limit_set = float(readback["current_limit"])
+        if "output" in readback:
+            self._output_set = bool(readback["output"])
+
+    def _write(self, key: str, value: Union[float, bool],
+               send: Callable[[Union[float, bool]], None]) -> Union[float, bool]:
+        """Send ``value`` unless the shadow says the instrument already holds it.
+
+        Returns the value the instrument holds afterwards: ``value`` when it
+        was sent, the shadowed value (within tolerance) when it was elided.
+        """
+        shadow = self._shadow
+        if shadow is None:
+            send(value)
+            return value
+        if shadow.dirty:
+            self._sync_shadow()
+        if not shadow.should_write(key, value):
+            return shadow.get(key)
+        send(value)
+        shadow.update(key, value)
+        return value
+
+    def _make_snapshot(self) -> PsuSnapshot:
+        return PsuSnapshot(self._state, self._voltage_set, self._current_limit_set, self._output_set)
+
+    @contextmanager
+    def _io(self, timeout: Optional[float] = None) -> Iterator[None]:
+        try:
+            with self._call_deadline(timeout), self._locked():
+                self.require_connected()  # may have been disconnected while waiting
+                self._attach_config(self._current_config())
+                yield
+        except DeviceTimeout:
+            # The instrument may or may not have applied the command; the
+            # device stays CONNECTED and the shadow is re-read on next write.
+            if self._shadow is not None:
+                self._shadow.mark_dirty()
+            raise
 
     # ----- Introspection ------------------------------------------------------
     def get_state(self) -> str:
@@ -66,105 +326,139 @@ class PSU(BaseDevice):
     def get_capabilities(self) -> Mapping[str, bool]:
         return self._capabilities
 
+    def get_ranges(self) -> Mapping[str, Mapping[str, float]]:
+        return self._ranges
+
     # ----- Typed properties (preferred API) -----------------------------------
     @property
     def voltage(self) -> float:
-        """Voltage setpoint (no I/O)."""
-        return self._voltage_set
+        """Voltage setpoint (no I/O, lock-free)."""
+        return self._snap.voltage
 
     @voltage.setter
     def voltage(self, v: float) -> None:
         self.require_connected()
-        if not self._capabilities.get("set_voltage", False):
-            raise PermissionError("set_voltage not supported by this model")
-        v = float(v)
-        lo, hi = self._ranges["voltage"]["min"], self._ranges["voltage"]["max"]
-        if not (lo <= v <= hi):
-            raise ValueError(f"voltage out of range {lo}..{hi}")
-        self._strategy.set_voltage(v)
-        self._voltage_set = v
+        v = self._validate(self._current_config(), "voltage", v)
+        with self._io():
+            v = self._voltage_set = float(self._write("voltage", v, self._strategy.set_voltage))
+            self._remember("voltage", v)
+            self._publish()
 
     @property
     def current_limit(self) -> float:
-        """Current limit setpoint (no I/O)."""
-        return self._current_limit_set
+        """Current limit setpoint (no I/O, lock-free)."""
+        return self._snap.current_limit
 
     @current_limit.setter
     def current_limit(self, a: float) -> None:
         self.require_connected()
-        if not self._capabilities.get("set_current_limit", False):
-            raise PermissionError(
-                "set_current_limit not supported by this model")
-        a = float(a)
-        # אם תרצה הגבלת טווחים לזרם, הוסף self._ranges["current_limit"] בדיוק כמו voltage
-        self._strategy.set_current_limit(a)
-        self._current_limit_set = a
+        a = self._validate(self._current_config(), "current_limit", a)
+        with self._io():
+            a = self._current_limit_set = float(
+                self._write("current_limit", a, self._strategy.set_current_limit))
+            self._remember("current_limit", a)
+            self._publish()
 
     @property
     def output(self) -> bool:
-        """Output enable setpoint (no I/O)."""
-        return self._output_set
+        """Output enable setpoint (no I/O, lock-free)."""
+        return self._snap.output
 
     @output.setter
     def output(self, on: bool) -> None:
         self.require_connected()
-        if not self._capabilities.get("toggle_output", False):
-            raise PermissionError("toggle_output not supported by this model")
-        on = bool(on)
-        self._strategy.toggle_output(on)
-        self._output_set = on
+        on = self._validate(self._current_config(), "output", on)
+        with self._io():
+            on = self._output_set = bool(self._write("output", on, self._strategy.toggle_output))
+            self._remember("output", on)
+            self._publish()
+
+    # ----- Regulation fast path (see regulation.py) ---------------------------
+    def regulation_limits(self) -> Tuple[float, float, Optional[float]]:
+        """(min, max, max slew V/s or None) for streamed voltage updates.
+
+        Checks the set_voltage capability once, so a loop that clamps its
+        output to these bounds can skip per-update validation. Re-read when
+        config_version changes.
+        """
+        cfg = self._current_config()
+        if not cfg.capabilities.get("set_voltage", False):
+            raise PermissionError("set_voltage not supported by this model")
+        rng = cfg.ranges["voltage"]
+        slew = rng.get("slew_per_s")
+        return float(rng["min"]), float(rng["max"]), None if slew is None else float(slew)
+
+    def _stream_voltage(self, v: float, remember: bool = False) -> None:
+        # Caller clamps v to regulation_limits(); the session is only
+        # written when the loop ends (remember=True), not at the loop rate.
+        with self._io():
+            v = self._voltage_set = float(self._write("voltage", v, self._strategy.stream_voltage))
+            if remember:
+                self._remember("voltage", v)
+            self._publish()
 
     # ----- Typed reads (explicit I/O; do not hide I/O in properties) ----------
-    def read_voltage(self) -> float:
+    def read_voltage(self, timeout: Optional[float] = None) -> float:
         self.require_connected()
-        return float(self._strategy.read("voltage"))
+        with self._io(timeout):
+            raw = float(self._strategy.read("voltage"))
+        return self._current_config().calibration.correct("voltage", raw)
 
-    def read_current(self) -> float:
+    def read_current(self, timeout: Optional[float] = None) -> float:
         self.require_connected()
-        return float(self._strategy.read("current"))
+        with self._io(timeout):
+            raw = float(self._strategy.read("current"))
+        return self._current_config().calibration.correct("current", raw)
 
-    def read_temp(self) -> float | None:
+    def read_temp(self, timeout: Optional[float] = None) -> float | None:
         self.require_connected()
-        val = self._strategy.read("temp")
-        return None if val is None else float(val)
+        with self._io(timeout):
+            val = self._strategy.read("temp")
+        if val is None:
+            return None
+        return self._current_config().calibration.correct("temp", float(val))
 
     # ----- Generic read/set (backwards compatibility) -------------------------
-    def read(self, key: str) -> Union[float, bool, None]:
+    def read(self, key: str, timeout: Optional[float] = None) -> Union[float, bool, None]:
         self.require_connected()
         if key not in self._ALLOWED_READS:
             raise KeyError(
                 f"unable to read {key}; allowed: {self._ALLOWED_READS}")
         if key == "voltage":
-            return self.read_voltage()
+            return self.read_voltage(timeout)
         if key == "current":
-            return self.read_current()
+            return self.read_current(timeout)
         if key == "temp":
-            return self.read_temp()
+            return self.read_temp(timeout)
         if key == "output":
-            return bool(self._strategy.read("output"))
+            with self._io(timeout):
+                return bool(self._strategy.read("output"))
         # not reachable due to guard above
         raise KeyError(f"unknown read key: {key}")
 
-    def set(self, key: str, value: object) -> None:
+    def set(self, key: str, value: object, timeout: Optional[float] = None) -> None:
         """
         Backwards-compatible generic setter. Prefer typed properties:
         psu.voltage = 5.0; psu.current_limit = 0.2; psu.output = True
         """
         self.require_connected()
-        if key == "voltage":
-            self.voltage = float(value)          # delegate to property
-            return
-        if key == "current_limit":
-            self.current_limit = float(value)    # delegate to property
-            return
-        if key == "output":
-            self.output = bool(value)            # delegate to property
-            return
-        if key == "power_cycle":
-            if not self._capabilities.get("power_cycle", False):
-                raise PermissionError(
-                    "power_cycle not supported by this model")
-            # typed op on the strategy
-            self._strategy.power_cycle()
-            return
+        with self._io(timeout):
+            if key == "voltage":
+                self.voltage = float(value)          # delegate to property
+                return
+            if key == "current_limit":
+                self.current_limit = float(value)    # delegate to property
+                return
+            if key == "output":
+                self.output = bool(value)            # delegate to property
+                return
+            if key == "power_cycle":
+                if not self._capabilities.get("power_cycle", False):
+                    raise PermissionError(
+                        "power_cycle not supported by this model")
+                # typed op on the strategy
+                self._strategy.power_cycle()
+                if self._shadow is not None:
+                    self._shadow.mark_dirty()
+                return
         raise KeyError(f"unknown set key: {key}")
@@ -1,9 +1,32 @@
-from .PsuDevice import PSU
-from .strategy import PsuStrategy, VirtualPsuStrategy, RealPsuStrategy
+from core.lazy import lazy_exports
+
+_EXPORTS = {
+	"PSU": (".PsuDevice", "PSU"),
+	"PsuStrategy": (".strategy", "PsuStrategy"),
+	"VirtualPsuStrategy": (".strategy", "VirtualPsuStrategy"),
+	"RealPsuStrategy": (".strategy", "RealPsuStrategy"),
+	"LinkedPsuStrategy": (".strategy", "LinkedPsuStrategy"),
+	"ShadowRegisters": (".shadow", "ShadowRegisters"),
+	"MemorySessionStore": (".session", "MemorySessionStore"),
+	"FileSessionStore": (".session", "FileSessionStore"),
+	"RecordingPsuStrategy": (".recording", "RecordingPsuStrategy"),
+	"ReplayPsuStrategy": (".recording", "ReplayPsuStrategy"),
+	"Calibration": (".calibration", "Calibration"),
+	"Regulator": (".regulation", "Regulator"),
+}
 
 __all__ = [
 	"PSU",
 	"PsuStrategy",
 	"VirtualPsuStrategy",
 	"RealPsuStrategy",
+	"LinkedPsuStrategy",
+	"ShadowRegisters",
+	"MemorySessionStore",
+	"FileSessionStore",
+	"RecordingPsuStrategy",
+	"ReplayPsuStrategy",
+	"Calibration",
+	"Regulator",
 ]
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
@@ -0,0 +1,219 @@
+"""Calibration and unit conversion for PSU readings.
+
+Tables live next to the model config in ``calibration.yml``::
+
+    RIGOL-DP832:
+      voltage: {poly: [0.002, 0.9991]}           # c0 + c1*x + c2*x**2 ...
+      current: {unit: mA, table: [[0, 0], [1000, 1003]]}
+      serials:
+        DP8C1234:
+          voltage: {table: [[0, 0.0], [10, 10.01], [30, 30.04]]}
+
+``poly`` coefficients are in ascending order. ``table`` is piecewise-linear
+over (raw, true) points with strictly increasing raw values; readings outside
+the table follow the first/last segment. ``unit`` is the unit the instrument
+reports in (default: the unit in ranges.yml); the conversion to the ranges.yml
+unit is folded into the correction when it is built, so applying it stays a
+single polynomial or interpolation. Serial entries override the model entry
+key by key.
+
+Scalar corrections (the PSU read path) use plain Python. ``apply()`` corrects a
+whole array in one NumPy operation, e.g. values from MeasurementLog.query();
+``apply_stream()`` does the same chunk by chunk.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+_PREFIX = {"n": 1e-9, "u": 1e-6, "µ": 1e-6, "m": 1e-3, "k": 1e3}
+
+
+def _split_unit(unit: str) -> Tuple[float, str]:
+    if len(unit) > 1 and unit[0] in _PREFIX:
+        return _PREFIX[unit[0]], unit[1:]
+    return 1.0, unit
+
+
+def unit_factor(src: str, dst: str) -> float:
+    """Factor that converts a value in ``src`` units to ``dst`` (e.g. mV -> V)."""
+    if src == dst:
+        return 1.0
+    s_scale, s_base = _split_unit(src)
+    d_scale, d_base = _split_unit(dst)
+    if s_base != d_base:
+        raise ValueError(f"cannot convert {src} to {dst}")
+    return s_scale / d_scale
+
+
+class Correction(ABC):
+    """Maps a raw reading to a corrected one."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def __call__(self, x: float) -> float:
+        ...
+
+    @abstractmethod
+    def apply(self, values):
+        """Vectorized form: correct a whole array in one operation."""
+
+    @abstractmethod
+    def scaled(self, factor: float) -> "Correction":
+        """The same correction with its output multiplied by ``factor``."""
+
+
+class Polynomial(Correction):
+    """c0 + c1*x + c2*x**2 + ... (gain/offset is ``[offset, gain]``)."""
+
+    __slots__ = ("coeffs",)
+
+    def __init__(self, coeffs: Sequence[float]) -> None:
+        if not coeffs:
+            raise ValueError("polynomial needs at least one coefficient")
+        self.coeffs: Tuple[float, ...] = tuple(float(c) for c in coeffs)
+
+    def __call__(self, x: float) -> float:
+        acc = 0.0
+        for c in reversed(self.coeffs):
+            acc = acc * x + c
+        return acc
+
+    def apply(self, values):
+        x = np.asarray(values, dtype=np.float64)
+        out = np.full(x.shape, self.coeffs[-1])
+        for c in reversed(self.coeffs[:-1]):
+            out *= x
+            out += c
+        return out
+
+    def scaled(self, factor: float) -> "Polynomial":
+        return Polynomial([c * factor for c in self.coeffs])
+
+    def __repr__(self) -> str:
+        return f"Polynomial({list(self.coeffs)})"
+
+
+class PiecewiseLinear(Correction):
+    """Linear interpolation through (raw, true) points, extrapolated at the ends."""
+
+    __slots__ = ("xs", "ys")
+
+    def __init__(self, points: Iterable[Sequence[float]]) -> None:
+        pts = [(float(x), float(y)) for x, y in points]
+        if len(pts) < 2:
+            raise ValueError("calibration table needs at least two points")
+        xs = tuple(p[0] for p in pts)
+        if any(b <= a for a, b in zip(xs, xs[1:])):
+            raise ValueError("calibration table raw values must be strictly increasing")
+        self.xs: Tuple[float, ...] = xs
+        self.ys: Tuple[float, ...] = tuple(p[1] for p in pts)
+
+    def __call__(self, x: float) -> float:
+        xs, ys = self.xs, self.ys
+        i = min(max(bisect_right(xs, x), 1), len(xs) - 1)
+        x0, x1, y0 = xs[i - 1], xs[i], ys[i - 1]
+        return y0 + (x - x0) * (ys[i] - y0) / (x1 - x0)
+
+    def apply(self, values):
+        x = np.asarray(values, dtype=np.float64)
+        xs, ys = np.asarray(self.xs), np.asarray(self.ys)
+        # np.interp clamps outside the table; extend the end segments instead
+        i = np.clip(np.searchsorted(xs, x, side="right"), 1, len(xs) - 1)
+        x0, y0 = xs[i - 1], ys[i - 1]
+        return y0 + (x - x0) * ((ys[i] - y0) / (xs[i] - x0))
+
+    def scaled(self, factor: float) -> "PiecewiseLinear":
+        return PiecewiseLinear(zip(self.xs, (y * factor for y in self.ys)))
+
+    def __repr__(self) -> str:
+        return f"PiecewiseLinear({list(zip(self.xs, self.ys))})"
+
+
+def parse_correction(entry: Mapping[str, object], unit: Optional[str] = None) -> Correction:
+    """Build one correction from a calibration.yml entry.
+
+    ``unit`` is the unit the result should be in (from ranges.yml); the
+    entry's own ``unit`` says what the instrument reports.
+    """
+    if not isinstance(entry, Mapping):
+        raise TypeError("calibration entry must be a dict")
+    if ("poly" in entry) == ("table" in entry):
+        raise ValueError("calibration entry needs exactly one of 'poly' or 'table'")
+    corr: Correction = Polynomial(entry["poly"]) if "poly" in entry else PiecewiseLinear(entry["table"])
+    src = entry.get("unit")
+    if src is not None and unit is not None:
+        factor = unit_factor(str(src), unit)
+        if factor != 1.0:
+            corr = corr.scaled(factor)
+    return corr
+
+
+class Calibration:
+    """Per-device set of corrections, keyed by read key (voltage, current, temp).
+
+    Keys without an entry pass readings through unchanged. Instances are
+    immutable and shared by every device with the same model and serial.
+    """
+
+    __slots__ = ("_by_key",)
+
+    def __init__(self, corrections: Optional[Mapping[str, Correction]] = None) -> None:
+        self._by_key: Dict[str, Correction] = dict(corrections or {})
+
+    @classmethod
+    def from_config(cls, entry: Optional[Mapping[str, object]], serial: Optional[str] = None,
+                    ranges: Optional[Mapping[str, Mapping[str, object]]] = None) -> "Calibration":
+        """Build from a model's calibration.yml entry, applying serial overrides."""
+        if not entry:
+            return NO_CALIBRATION
+        if not isinstance(entry, Mapping):
+            raise TypeError("calibration for a model must be a dict")
+        keys = {k: v for k, v in entry.items() if k != "serials"}
+        serials = entry.get("serials") or {}
+        if not isinstance(serials, Mapping):
+            raise TypeError("calibration 'serials' must map serial -> entries")
+        if serial is not None and serial in serials:
+            keys.update(serials[serial] or {})
+        ranges = ranges or {}
+        corrections = {}
+        for key, spec in keys.items():
+            unit = (ranges.get(key) or {}).get("unit")
+            corrections[key] = parse_correction(spec, None if unit is None else str(unit))
+        return cls(corrections) if corrections else NO_CALIBRATION
+
+    def __bool__(self) -> bool:
+        return bool(self._by_key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_key
+
+    def get(self, key: str) -> Optional[Correction]:
+        return self._by_key.get(key)
+
+    def correct(self, key: str, value: float) -> float:
+        """Correct one reading (used by PSU.read_*)."""
+        corr = self._by_key.get(key)
+        return value if corr is None else corr(value)
+
+    def apply(self, key: str, values):
+        """Correct an array of raw readings; returns a new float64 array."""
+        corr = self._by_key.get(key)
+        if corr is None:
+            return np.array(values, dtype=np.float64)
+        return corr.apply(values)
+
+    def apply_stream(self, key: str, chunks: Iterable) -> Iterator:
+        """Correct a stream of arrays chunk by chunk."""
+        for chunk in chunks:
+            yield self.apply(key, chunk)
+
+    def __repr__(self) -> str:
+        return f"Calibration({self._by_key!r})"
+
+
+NO_CALIBRATION = Calibration()
@@ -0,0 +1,312 @@
+"""Concurrent instrument discovery: probe addresses, fingerprint *IDN?, match models.yml.
+
+    python -m devices.psu.discovery 192.168.1.0/24 --port 5025 --cache ~/.cache/psu-scan.json
+
+Probes run on one asyncio loop with bounded concurrency and a short deadline
+each (connect + ``*IDN?`` + reply), so a /24 on one port takes about
+``ceil(256 / concurrency) * timeout`` instead of minutes of blocking connects.
+Replies are matched to models.yml entries by vendor and model_id (or an
+optional ``idn_pattern`` regex on the entry) and turned into PSU
+construction specs.
+
+A DiscoveryCache remembers every probed address (found or not) with a
+timestamp; a re-scan reuses answers younger than ``max_age_s`` and misses
+younger than ``miss_max_age_s`` (much shorter, so an instrument switched on
+after a scan is found by the next one), and only probes the rest.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import yaml
+
+from adapters.telnet_adapter import TelnetAdapter
+from .PsuDevice import PSU
+from .strategy import RealPsuStrategy
+from .yaml_config_loader import YamlPSUConfigLoader
+
+Target = Tuple[str, int]
+
+DEFAULT_PORT = 5025       # raw SCPI socket
+DEFAULT_TIMEOUT_S = 0.5
+DEFAULT_CONCURRENCY = 256
+DEFAULT_MAX_AGE_S = 3600.0       # cached *IDN? answers
+DEFAULT_MISS_MAX_AGE_S = 60.0    # cached "nothing answered"
+
+
+class Discovered(NamedTuple):
+    host: str
+    port: int
+    idn: str
+    vendor: str
+    model: str
+    serial: Optional[str]
+    firmware: Optional[str]
+    model_id: Optional[str]  # models.yml match; None if unknown
+
+    def spec(self) -> Dict[str, object]:
+        """Keyword arguments for make_psu() / a config file entry."""
+        return {
+            "model": self.model_id,
+            "adapter": {"type": "telnet", "host": self.host, "port": self.port},
+            "serial": self.serial,
+        }
+
+
+def parse_idn(idn: str) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """Split an IEEE 488.2 ``*IDN?`` reply into vendor, model, serial, firmware."""
+    parts = [p.strip() for p in idn.strip().split(",")]
+    parts += [""] * (4 - len(parts))
+    vendor, model, serial, firmware = parts[:4]
+    return vendor, model, serial or None, firmware or None
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"[^A-Z0-9]", "", text.upper())
+
+
+def match_model(idn: str, models: Sequence[Mapping[str, object]]) -> Optional[str]:
+    """model_id of the first models.yml entry matching ``idn``, else None."""
+    vendor, model, _, _ = parse_idn(idn)
+    for entry in models:
+        model_id = str(entry.get("model_id", ""))
+        pattern = entry.get("idn_pattern")
+        if pattern:
+            if re.search(str(pattern), idn, re.IGNORECASE):
+                return model_id
+            continue
+        want_vendor = _norm(str(entry.get("vendor", "")))
+        if not want_vendor or not _norm(vendor).startswith(want_vendor):
+            continue
+        # model_id is VENDOR-MODEL; the IDN model field may add a prefix/suffix
+        # ("MODEL 2230G-30-1" for KEITHLEY-2230G)
+        stem = _norm(model_id)
+        if stem.startswith(want_vendor):
+            stem = stem[len(want_vendor):]
+        if stem and stem in _norm(model):
+            return model_id
+    return None
+
+
+def expand_targets(hosts: Iterable[str], ports: Iterable[int] = (DEFAULT_PORT,)) -> List[Target]:
+    """Targets from hosts x ports.
+
+    A host may be a name or address, a CIDR block (``10.0.0.0/28``), a last-
+    octet range (``192.168.1.10-20``), or ``host:port`` to pin the port.
+    """
+    ports = list(ports)
+    out: List[Target] = []
+    seen = set()
+
+    def add(host: str, port: int) -> None:
+        if (host, port) not in seen:
+            seen.add((host, port))
+            out.append((host, port))
+
+    for spec in hosts:
+        host, sep, pinned = spec.rpartition(":") if spec.count(":") == 1 else ("", "", "")
+        if sep:
+            add(host, int(pinned))
+            continue
+        if "/" in spec:
+            net = ipaddress.ip_network(spec, strict=False)
+            addrs = [str(a) for a in (net.hosts() if net.num_addresses > 2 else net)]
+        elif re.fullmatch(r"\d+\.\d+\.\d+\.\d+-\d+", spec):
+            base, last = spec.rsplit("-", 1)
+            prefix, first = base.rsplit(".", 1)
+            addrs = [f"{prefix}.{i}" for i in range(int(first), int(last) + 1)]
+        else:
+            addrs = [spec]
+        for addr in addrs:
+            for port in ports:
+                add(addr, port)
+    return out
+
+
+async def probe(host: str, port: int, timeout: float = DEFAULT_TIMEOUT_S) -> Optional[str]:
+    """``*IDN?`` reply from host:port, or None (refused, silent, timed out, garbage)."""
+    async def query() -> str:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(b"*IDN?\n")
+            await writer.drain()
+            return (await reader.readline()).decode("ascii", "replace").strip()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    try:
+        reply = await asyncio.wait_for(query(), timeout)
+    except (OSError, asyncio.TimeoutError, UnicodeError, ValueError,
+            asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+        # ValueError: reply line over the StreamReader limit (64 KiB)
+        return None
+    return reply or None
+
+
+class DiscoveryCache:
+    """Probe results by ``host:port`` in a JSON file (None = nothing answered).
+
+    Written atomically (temp file + rename), like FileSessionStore.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self._data: Dict[str, Dict[str, object]] = data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _key(host: str, port: int) -> str:
+        return f"{host}:{port}"
+
+    def get(self, host: str, port: int, max_age_s: float,
+            miss_max_age_s: Optional[float] = None) -> Tuple[bool, Optional[str]]:
+        """(hit, idn) for answers younger than ``max_age_s``.
+
+        Misses (idn None) expire after ``miss_max_age_s`` when given.
+        Malformed entries (hand-edited or from another tool) count as misses.
+        """
+        entry = self._data.get(self._key(host, port))
+        if not isinstance(entry, dict):
+            return False, None
+        idn = entry.get("idn")
+        if idn is not None and not isinstance(idn, str):
+            return False, None
+        if idn is None and miss_max_age_s is not None:
+            max_age_s = miss_max_age_s
+        try:
+            age = time.time() - float(entry.get("t", 0))
+        except (TypeError, ValueError):
+            return False, None
+        if age > max_age_s:
+            return False, None
+        return True, idn
+
+    def put(self, host: str, port: int, idn: Optional[str]) -> None:
+        self._data[self._key(host, port)] = {"idn": idn, "t": time.time()}
+
+    def flush(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class Scanner:
+    """Probe many targets concurrently and match replies against models.yml."""
+
+    def __init__(self, models: Optional[Sequence[Mapping[str, object]]] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT_S,
+                 cache: Optional[DiscoveryCache] = None, max_age_s: float = DEFAULT_MAX_AGE_S,
+                 miss_max_age_s: float = DEFAULT_MISS_MAX_AGE_S) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        if models is None:
+            models = YamlPSUConfigLoader().list_models()
+        self.models = list(models)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = cache
+        self.max_age_s = max_age_s
+        self.miss_max_age_s = miss_max_age_s
+        self.probed = 0  # probes actually sent by the last scan (cache misses)
+
+    async def scan_async(self, targets: Iterable[Target], refresh: bool = False) -> List[Discovered]:
+        sem = asyncio.Semaphore(self.concurrency)
+        replies: Dict[Target, Optional[str]] = {}
+        todo: List[Target] = []
+        for host, port in targets:
+            hit, idn = (False, None) if self.cache is None or refresh else \
+                self.cache.get(host, port, self.max_age_s, self.miss_max_age_s)
+            if hit:
+                replies[(host, port)] = idn
+            else:
+                todo.append((host, port))
+
+        async def one(target: Target) -> None:
+            async with sem:
+                replies[target] = await probe(*target, timeout=self.timeout)
+
+        self.probed = len(todo)
+        await asyncio.gather(*(one(t) for t in todo))
+        if self.cache is not None and todo:
+            for host, port in todo:
+                self.cache.put(host, port, replies[(host, port)])
+            self.cache.flush()
+
+        found = []
+        for (host, port), idn in replies.items():
+            if idn:
+                vendor, model, serial, firmware = parse_idn(idn)
+                found.append(Discovered(host, port, idn, vendor, model, serial, firmware,
+                                        match_model(idn, self.models)))
+        return sorted(found, key=lambda d: (_host_key(d.host), d.port))
+
+    def scan(self, targets: Iterable[Target], refresh: bool = False) -> List[Discovered]:
+        """Blocking wrapper around scan_async()."""
+        return asyncio.run(self.scan_async(targets, refresh))
+
+
+def _host_key(host: str):
+    try:
+        return (0, ipaddress.ip_address(host))
+    except ValueError:
+        return (1, host)
+
+
+def make_psu(spec: Mapping[str, object], config_loader=None) -> PSU:
+    """Build an (unconnected) PSU from a Discovered.spec() dict.
+
+    The strategy drives the instrument with SCPI over the spec's telnet link.
+    """
+    if not spec.get("model"):
+        raise ValueError("spec has no model_id; the instrument did not match models.yml")
+    adapter = dict(spec["adapter"])  # type: ignore[arg-type]
+    if adapter.pop("type", "telnet") != "telnet":
+        raise ValueError("only telnet (raw socket) adapters are supported in specs")
+    link = TelnetAdapter(**adapter)
+    return PSU(model=str(spec["model"]), adapter=link,
+               config_loader=config_loader or YamlPSUConfigLoader(),
+               strategy=RealPsuStrategy(write=link.write, read=link.query),
+               serial=spec.get("serial"))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Discover SCPI instruments and match models.yml")
+    parser.add_argument("hosts", nargs="+", help="host, a.b.c.d-e range, CIDR block or host:port")
+    parser.add_argument("--port", type=int, action="append", help=f"port to probe (default {DEFAULT_PORT})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--cache", help="JSON cache file for fast re-scans")
+    parser.add_argument("--refresh", action="store_true", help="ignore cached results")
+    args = parser.parse_args(argv)
+
+    scanner = Scanner(concurrency=args.concurrency, timeout=args.timeout,
+                      cache=DiscoveryCache(args.cache) if args.cache else None)
+    found = scanner.scan(expand_targets(args.hosts, args.port or [DEFAULT_PORT]), refresh=args.refresh)
+    print(yaml.safe_dump([{"idn": d.idn, **d.spec()} for d in found], sort_keys=False), end="")
+
+
+if __name__ == "__main__":
+    main()
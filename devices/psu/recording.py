@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Union
+
+from core.tracelog import (
+    OP_IDENTIFY,
+    OP_INITIALIZE,
+    OP_POWER_CYCLE,
+    OP_READ,
+    OP_READ_SETPOINTS,
+    OP_SET_CURRENT_LIMIT,
+    OP_SET_VOLTAGE,
+    OP_TOGGLE_OUTPUT,
+    Recorder,
+    ReplaySession,
+    TraceWriter,
+)
+from .strategy import PsuStrategy, PSUContext
+
+
+class RecordingPsuStrategy(PsuStrategy):
+    """Wraps another strategy and appends every call and its result to a trace.
+
+    Pair with adapters.recording_adapter.RecordingAdapter on the same writer
+    to capture a whole session; replay it with ReplayPsuStrategy.
+    """
+
+    __slots__ = ("inner", "_rec")
+
+    def __init__(self, inner: PsuStrategy, writer: TraceWriter) -> None:
+        super().__init__()
+        self.inner = inner
+        self._rec = Recorder(writer)
+
+    def attach(self, ctx: PSUContext) -> None:
+        super().attach(ctx)
+        self.inner.attach(ctx)
+
+    def initialize(self) -> None:
+        self._rec.call(OP_INITIALIZE, None, self.inner.initialize)
+
+    def read(self, key: str) -> Union[float, bool]:
+        return self._rec.call(OP_READ, key, self.inner.read, key)
+
+    def read_setpoints(self) -> Dict[str, Union[float, bool]]:
+        return self._rec.call(OP_READ_SETPOINTS, None, self.inner.read_setpoints)
+
+    def identify(self) -> Optional[str]:
+        return self._rec.call(OP_IDENTIFY, None, self.inner.identify)
+
+    def set_voltage(self, volts: float) -> None:
+        self._rec.call(OP_SET_VOLTAGE, float(volts), self.inner.set_voltage, volts)
+
+    def stream_voltage(self, volts: float) -> None:
+        self._rec.call(OP_SET_VOLTAGE, float(volts), self.inner.stream_voltage, volts)
+
+    def set_current_limit(self, amps: float) -> None:
+        self._rec.call(OP_SET_CURRENT_LIMIT, float(amps), self.inner.set_current_limit, amps)
+
+    def toggle_output(self, on: bool) -> None:
+        self._rec.call(OP_TOGGLE_OUTPUT, bool(on), self.inner.toggle_output, on)
+
+    def power_cycle(self) -> None:
+        self._rec.call(OP_POWER_CYCLE, None, self.inner.power_cycle)
+
+
+class ReplayPsuStrategy(PsuStrategy):
+    """Serves a recorded session deterministically (no noise, no hardware).
+
+    Calls must arrive in the recorded order with the recorded arguments;
+    otherwise core.exceptions.ProtocolError is raised.
+    """
+
+    __slots__ = ("session",)
+
+    def __init__(self, session: ReplaySession) -> None:
+        super().__init__()
+        self.session = session
+
+    def initialize(self) -> None:
+        self.session.next(OP_INITIALIZE, None)
+
+    def read(self, key: str) -> Union[float, bool]:
+        return self.session.next(OP_READ, key)
+
+    def read_setpoints(self) -> Dict[str, Union[float, bool]]:
+        return dict(self.session.next(OP_READ_SETPOINTS, None) or {})
+
+    def identify(self) -> Optional[str]:
+        return self.session.next(OP_IDENTIFY, None)
+
+    def set_voltage(self, volts: float) -> None:
+        self.session.next(OP_SET_VOLTAGE, float(volts))
+
+    def set_current_limit(self, amps: float) -> None:
+        self.session.next(OP_SET_CURRENT_LIMIT, float(amps))
+
+    def toggle_output(self, on: bool) -> None:
+        self.session.next(OP_TOGGLE_OUTPUT, bool(on))
+
+    def power_cycle(self) -> None:
+        self.session.next(OP_POWER_CYCLE, None)
@@ -0,0 +1,205 @@
+"""Software closed-loop regulation of a PSU's voltage setpoint.
+
+A Regulator runs a PI controller in a dedicated thread at a fixed rate:
+measure, compare with the setpoint, stream a new voltage. Typical uses::
+
+    reg = Regulator.constant_power(psu, watts=5.0)               # V * I
+    reg = Regulator.remote_sense(psu, volts=12.0, sense=dmm.read)  # load-side V
+    with reg:
+        ...
+    print(reg.stats())
+
+The capability/range checks of ``psu.voltage = ...`` are done once per start
+(PSU.regulation_limits) and the controller output is clamped to them, so each
+iteration is one measurement plus one PSU._stream_voltage call. Strategies
+implement stream_voltage() without settling waits; with the default
+set_voltage() fallback the loop still works, just at the strategy's pace
+(see ``stats()``). A ranges.yml ``slew_per_s`` entry under voltage caps the
+slew rate; a hot-reloaded config is picked up on the next iteration.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from core.stats import latency_stats
+from .PsuDevice import PSU
+
+JITTER_SAMPLES = 4096  # scheduling lateness samples kept for stats()
+
+
+class PIController:
+    """PI controller with output clamping, slew limiting and anti-windup.
+
+    Anti-windup is conditional integration: while the output is pinned at a
+    limit (range or slew), error that would push it further is not
+    integrated, so the loop recovers as soon as the setpoint is reachable.
+    """
+
+    __slots__ = ("kp", "ki", "lo", "hi", "slew_per_s", "_integral", "_out")
+
+    def __init__(self, kp: float, ki: float, lo: float, hi: float,
+                 slew_per_s: Optional[float] = None) -> None:
+        if lo > hi:
+            raise ValueError("lo must not exceed hi")
+        if slew_per_s is not None and slew_per_s <= 0:
+            raise ValueError("slew_per_s must be positive")
+        self.kp = float(kp)
+        self.ki = float(ki)
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.slew_per_s = slew_per_s
+        self._integral = self._out = min(max(0.0, self.lo), self.hi)
+
+    @property
+    def output(self) -> float:
+        return self._out
+
+    def reset(self, output: float) -> None:
+        """Bumpless start from the current output."""
+        self._integral = self._out = min(max(float(output), self.lo), self.hi)
+
+    def update(self, error: float, dt: float) -> float:
+        integral = self._integral + self.ki * error * dt
+        out = self.kp * error + integral
+        lo, hi = self.lo, self.hi
+        if self.slew_per_s is not None:
+            step = self.slew_per_s * dt
+            lo, hi = max(lo, self._out - step), min(hi, self._out + step)
+        if out > hi:
+            out = hi
+            if error < 0:
+                self._integral = integral
+        elif out < lo:
+            out = lo
+            if error > 0:
+                self._integral = integral
+        else:
+            self._integral = integral
+        self._out = out
+        return out
+
+
+class Regulator:
+    """Runs a PIController against ``measure()`` in a worker thread."""
+
+    def __init__(self, psu: PSU, measure: Callable[[], float], setpoint: float,
+                 kp: float, ki: float, rate_hz: float = 200.0,
+                 slew_per_s: Optional[float] = None) -> None:
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self.psu = psu
+        self.measure = measure
+        self.setpoint = float(setpoint)
+        self.kp = kp
+        self.ki = ki
+        self.rate_hz = float(rate_hz)
+        self.slew_per_s = slew_per_s
+        self.last_error: Optional[Exception] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lateness: deque = deque(maxlen=JITTER_SAMPLES)
+        self._iterations = 0
+        self._overruns = 0
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    @classmethod
+    def constant_power(cls, psu: PSU, watts: float, kp: float = 0.2, ki: float = 20.0,
+                       **kwargs) -> "Regulator":
+        """Hold V * I at ``watts`` (measured through the PSU's own reads)."""
+        return cls(psu, lambda: psu.read_voltage() * psu.read_current(), watts, kp, ki, **kwargs)
+
+    @classmethod
+    def remote_sense(cls, psu: PSU, volts: float, sense: Callable[[], float],
+                     kp: float = 0.2, ki: float = 40.0, **kwargs) -> "Regulator":
+        """Hold the load-side voltage reported by ``sense()`` at ``volts``."""
+        return cls(psu, sense, volts, kp, ki, **kwargs)
+
+    # ----- Lifecycle ----------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "Regulator":
+        if self.running:
+            return self
+        self.psu.require_connected()
+        self.psu.regulation_limits()  # fail fast in the caller's thread
+        self.last_error = None
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"regulator-{self.psu.model}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None and threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "Regulator":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    # ----- Loop ---------------------------------------------------------------
+    def _controller(self) -> PIController:
+        lo, hi, model_slew = self.psu.regulation_limits()
+        slew = self.slew_per_s
+        if model_slew is not None:
+            slew = model_slew if slew is None else min(slew, model_slew)
+        return PIController(self.kp, self.ki, lo, hi, slew)
+
+    def _run(self) -> None:
+        psu = self.psu
+        period = 1.0 / self.rate_hz
+        ctrl = self._controller()
+        ctrl.reset(psu.voltage)
+        version = psu.config_version
+        now = self._started = time.perf_counter()
+        last = now - period
+        next_t = now
+        try:
+            while not self._stop_event.is_set():
+                now = time.perf_counter()
+                self._lateness.append(now - next_t)
+                if psu.config_version != version:
+                    out = ctrl.output
+                    ctrl = self._controller()
+                    ctrl.reset(out)
+                    version = psu.config_version
+                error = self.setpoint - self.measure()
+                psu._stream_voltage(ctrl.update(error, now - last))
+                last = now
+                self._iterations += 1
+                next_t += period
+                delay = next_t - time.perf_counter()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                else:
+                    self._overruns += 1
+                    if delay < -period:
+                        next_t = time.perf_counter()  # drop missed ticks instead of bursting
+        except Exception as exc:
+            # Leave the last streamed setpoint in place; the caller decides what is safe
+            self.last_error = exc
+        finally:
+            self._elapsed = time.perf_counter() - self._started
+            if psu.is_connected:
+                try:
+                    psu._stream_voltage(psu.voltage, remember=True)
+                except Exception:
+                    pass
+
+    def stats(self) -> Dict[str, object]:
+        """Loop rate and scheduling jitter (lateness vs. the ideal tick, seconds)."""
+        elapsed = (time.perf_counter() - self._started) if self.running else self._elapsed
+        return {
+            "iterations": self._iterations,
+            "rate_hz": self._iterations / elapsed if elapsed > 0 else 0.0,
+            "overruns": self._overruns,
+            "jitter": latency_stats(list(self._lateness)),
+        }
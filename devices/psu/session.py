@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Protocol, Union
+
+Setpoint = Union[float, bool]
+
+# Order in which setpoints are re-applied: levels before enabling the output
+RESTORE_ORDER = ("voltage", "current_limit", "output")
+
+
+class SessionStore(Protocol):
+    """Persistence for PSU session snapshots, keyed by session key."""
+
+    def load(self, key: str) -> Optional[Dict[str, object]]: ...
+    def save(self, key: str, snapshot: Dict[str, object]) -> None: ...
+    def discard(self, key: str) -> None: ...
+
+
+class MemorySessionStore:
+    """Process-local snapshots (survive disconnect/connect, not restarts)."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Dict[str, object]] = {}
+
+    def load(self, key: str) -> Optional[Dict[str, object]]:
+        snap = self._data.get(key)
+        return None if snap is None else dict(snap)
+
+    def save(self, key: str, snapshot: Dict[str, object]) -> None:
+        self._data[key] = dict(snapshot)
+
+    def discard(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class FileSessionStore:
+    """Snapshots kept in a small JSON file (one object keyed by session key).
+
+    Writes go to a temp file that is renamed over the target, so a crash never
+    leaves a half-written file behind.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._data: Dict[str, Dict[str, object]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, object]]:
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            # Corrupt snapshot file: start cold rather than fail the connect
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _flush(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self, key: str) -> Optional[Dict[str, object]]:
+        snap = self._data.get(key)
+        return None if snap is None else dict(snap)
+
+    def save(self, key: str, snapshot: Dict[str, object]) -> None:
+        if self._data.get(key) == snapshot:
+            return
+        self._data[key] = dict(snapshot)
+        self._flush()
+
+    def discard(self, key: str) -> None:
+        if self._data.pop(key, None) is not None:
+            self._flush()
+
+
+def setpoint_diff(wanted: Dict[str, Setpoint], actual: Dict[str, Setpoint]) -> Dict[str, Setpoint]:
+    """Settings in ``wanted`` that the instrument does not currently hold, in restore order."""
+    diff: Dict[str, Setpoint] = {}
+    for key in RESTORE_ORDER:
+        if key not in wanted:
+            continue
+        value = wanted[key]
+        if key not in actual or actual[key] != value:
+            diff[key] = value
+    return diff
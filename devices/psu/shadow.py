@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional, Union
+
+Setpoint = Union[float, bool]
+
+# Default per-key equality tolerance for numeric setpoints
+DEFAULT_TOLERANCES: Dict[str, float] = {
+    "voltage": 1e-6,
+    "current_limit": 1e-6,
+}
+
+
+class ShadowRegisters:
+    """Host-side copy of the instrument's last known setpoints.
+
+    Used by PSU to elide writes that would not change instrument state.
+    A key with no known value is never considered equal, so the first write
+    after construction (or after invalidate()) always goes to the instrument.
+
+    The shadow is resynchronized from strategy readback on connect and on the
+    next write after mark_dirty() (e.g. after a power cycle).
+    """
+
+    def __init__(self, tolerances: Optional[Mapping[str, float]] = None) -> None:
+        self.tolerances: Dict[str, float] = dict(DEFAULT_TOLERANCES)
+        if tolerances:
+            self.tolerances.update(tolerances)
+        self._values: Dict[str, Setpoint] = {}
+        self.dirty: bool = True
+        self.elided: int = 0
+        self.written: int = 0
+
+    def get(self, key: str) -> Optional[Setpoint]:
+        return self._values.get(key)
+
+    def matches(self, key: str, value: Setpoint) -> bool:
+        """True if writing ``value`` to ``key`` would not change state."""
+        if key not in self._values:
+            return False
+        current = self._values[key]
+        if isinstance(value, bool) or isinstance(current, bool):
+            return bool(current) == bool(value)
+        return abs(float(current) - float(value)) <= self.tolerances.get(key, 0.0)
+
+    def should_write(self, key: str, value: Setpoint) -> bool:
+        """Count and report whether a write of ``value`` must be sent."""
+        if self.matches(key, value):
+            self.elided += 1
+            return False
+        return True
+
+    def update(self, key: str, value: Setpoint) -> None:
+        self._values[key] = value
+        self.written += 1
+
+    def sync(self, readback: Mapping[str, Setpoint]) -> None:
+        """Replace the shadow with instrument readback and clear the dirty flag."""
+        self._values = dict(readback)
+        self.dirty = False
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    def invalidate(self) -> None:
+        """Forget all known values; the next write of every key is sent."""
+        self._values.clear()
+        self.dirty = True
+
+    def snapshot(self) -> Dict[str, Setpoint]:
+        return dict(self._values)
+
+    def __repr__(self) -> str:
+        return f"<ShadowRegisters values={self._values!r} elided={self.elided} dirty={self.dirty}>"
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
 import random
-import time
+import weakref
 from abc import ABC, abstractmethod
 from typing import Dict, Optional, Callable, Union
 
+from core import deadline
+from core.frozen import FrozenDict
+
 # Operation delays (seconds)
 SET_VOLTAGE_DELAY_S = 0.1
 OUTPUT_ON_DELAY_S = 0.5
 POWER_CYCLE_DELAY_S = 5.0
 
+# Default noise source shared by all virtual PSUs (a Random is ~2.5 KB of
+# state). Seeded so simulated runs are reproducible; reseed with seed_noise(),
+# or give a device its own stream with VirtualPsuStrategy(seed=...).
+NOISE_SEED = 0
+_noise = random.Random(NOISE_SEED)
+
+
+def seed_noise(seed: Optional[int]) -> None:
+    """Reseed the shared simulation noise source."""
+    _noise.seed(seed)
+
 
 class PsuStrategy(ABC):
     """Strategy interface for PSU behaviors (real vs virtual).
@@ -17,8 +31,11 @@ class PsuStrategy(ABC):
     Override notes:
     - Implementations must enforce range/capability checks or expect caller to.
     - Keep methods fast; long operations should be documented.
+    - Strategies are slotted; subclasses may add __slots__ to stay compact.
     """
 
+    __slots__ = ("_ctx",)
+
     def __init__(self) -> None:
         self._ctx: Optional["PSUContext"] = None
 
@@ -50,25 +67,73 @@ class PsuStrategy(ABC):
     def power_cycle(self) -> None:
         ...
 
+    def stream_voltage(self, volts: float) -> None:
+        """Voltage update from a regulation loop (devices/psu/regulation.py).
+
+        Called at the loop rate with values already clamped to the model's
+        range, so implementations should skip settling waits and readbacks.
+        The default is a plain set_voltage(); strategies that can stream
+        setpoints override it.
+        """
+        self.set_voltage(volts)
+
+    def read_setpoints(self) -> Dict[str, Union[float, bool]]:
+        """Programmed setpoints as reported by the instrument (not measurements).
+
+        Keys: voltage, current_limit, output. Strategies that cannot query
+        setpoints return an empty dict (nothing known).
+        """
+        return {}
+
+    def identify(self) -> Optional[str]:
+        """Cheap instrument identity (e.g. the *IDN? reply); None if unknown."""
+        return None
+
 
 class PSUContext:
     """Context shared with strategies (no strong coupling to BaseDevice)."""
 
+    __slots__ = ("capabilities", "ranges", "__weakref__")
+
+    # (capabilities, ranges) -> context for interned read-only config; held
+    # weakly so a context goes away with the last strategy attached to it
+    _shared: "weakref.WeakValueDictionary[tuple, PSUContext]" = weakref.WeakValueDictionary()
+
     def __init__(self, *, capabilities: Dict[str, bool], ranges: Dict[str, Dict[str, Union[float, str]]]) -> None:
         self.capabilities = capabilities
         self.ranges = ranges
 
+    @classmethod
+    def shared(cls, *, capabilities: Dict[str, bool], ranges: Dict[str, Dict[str, Union[float, str]]]) -> "PSUContext":
+        """One context per distinct interned (FrozenDict) config pair; a fresh one otherwise."""
+        if not (isinstance(capabilities, FrozenDict) and isinstance(ranges, FrozenDict)):
+            return cls(capabilities=capabilities, ranges=ranges)
+        key = (capabilities, ranges)  # FrozenDicts hash and compare by content
+        ctx = cls._shared.get(key)
+        if ctx is None:
+            ctx = cls._shared[key] = cls(capabilities=capabilities, ranges=ranges)
+        return ctx
+
 
 class VirtualPsuStrategy(PsuStrategy):
-    """Purely simulated PSU behavior with simple physics and delays."""
+    """Purely simulated PSU behavior with simple physics and delays.
 
-    def __init__(self) -> None:
+    Noise comes from the module-level shared source unless ``rng`` or
+    ``seed`` is given; a seed gives the device its own reproducible stream
+    (at ~2.5 KB of extra state per device).
+    """
+
+    __slots__ = ("_voltage_sp", "_current_limit", "_output_on", "_temp_c", "_rng")
+
+    def __init__(self, rng: Optional[random.Random] = None, seed: Optional[int] = None) -> None:
         super().__init__()
         self._voltage_sp: float = 0.0
         self._current_limit: float = 0.0
         self._output_on: bool = False
         self._temp_c: float = 25.0
-        self._rng = random.Random()  # For noise simulation
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self._rng = rng or _noise  # For noise simulation
 
     def initialize(self) -> None:
         # Nothing special to do for a virtual PSU
@@ -117,11 +182,27 @@ class VirtualPsuStrategy(PsuStrategy):
         if key == "output":
             return self._output_on
 
+    def read_setpoints(self) -> Dict[str, Union[float, bool]]:
+        return {
+            "voltage": self._voltage_sp,
+            "current_limit": self._current_limit,
+            "output": self._output_on,
+        }
+
+    def identify(self) -> Optional[str]:
+        return "VIRTUAL,PSU"
+
     def set_voltage(self, volts: float) -> None:
         if not self._in_range("voltage", volts):
             raise ValueError(f"voltage out of range: {volts}")
         # Busy for ~100ms per spec
-        time.sleep(SET_VOLTAGE_DELAY_S)
+        deadline.sleep(SET_VOLTAGE_DELAY_S, "set_voltage")
+        self._voltage_sp = volts
+
+    def stream_voltage(self, volts: float) -> None:
+        # The loop models the dynamics; no per-update busy time
+        if not self._in_range("voltage", volts):
+            raise ValueError(f"voltage out of range: {volts}")
         self._voltage_sp = volts
 
     def set_current_limit(self, amps: float) -> None:
@@ -132,23 +213,27 @@ class VirtualPsuStrategy(PsuStrategy):
     def toggle_output(self, on: bool) -> None:
         # Delay 500ms when turning ON to simulate stabilization
         if on and not self._output_on:
-            time.sleep(OUTPUT_ON_DELAY_S)
+            deadline.sleep(OUTPUT_ON_DELAY_S, "toggle_output")
         self._output_on = on
 
     def power_cycle(self) -> None:
         # 5 seconds busy cycle
         if self._output_on:
             self._output_on = False
-        time.sleep(POWER_CYCLE_DELAY_S)
+        deadline.sleep(POWER_CYCLE_DELAY_S, "power_cycle")
         self._output_on = True
 
 
 class RealPsuStrategy(PsuStrategy):
-    """Represents a real PSU. If no transport IO is provided, falls back to simple stateful behavior.
+    """Represents a real PSU driven over SCPI through ``write``/``read`` callables.
 
-    This keeps the API stable while allowing real IO integration later.
+    ``write(cmd)`` sends one command and ``read(cmd)`` sends a query and
+    returns its reply (e.g. ``TelnetAdapter.write``/``TelnetAdapter.query``).
+    Without them every operation falls back to simple stateful behavior.
     """
 
+    __slots__ = ("_write", "_read", "_mirror")
+
     def __init__(self, *, write: Optional[Callable[[str], None]] = None, read: Optional[Callable[[str], str]] = None) -> None:
         super().__init__()
         self._write = write  # optional callables for instrument IO
@@ -160,26 +245,129 @@ class RealPsuStrategy(PsuStrategy):
         self._mirror.attach(ctx)
 
     def initialize(self) -> None:
-        # If we had IO, we could query IDN?, reset, etc.
+        if self._write is not None:
+            self._write("*CLS")
+            return
         self._mirror.initialize()
 
     def read(self, key: str) -> Union[float, bool]:
-        # If real IO available, map reads to SCPI (e.g., MEAS:VOLT?)
-        # For now, fallback to mirror
-        return self._mirror.read(key)
+        if self._read is None:
+            return self._mirror.read(key)
+        if key == "voltage":
+            return float(self._read("MEAS:VOLT?"))
+        if key == "current":
+            return float(self._read("MEAS:CURR?"))
+        if key == "output":
+            return _scpi_bool(self._read("OUTP?"))
+        if key == "temp":
+            return None  # no standard SCPI query; model-specific subclasses override
+        raise KeyError(key)
+
+    def read_setpoints(self) -> Dict[str, Union[float, bool]]:
+        if self._read is None:
+            return self._mirror.read_setpoints()
+        return {
+            "voltage": float(self._read("VOLT?")),
+            "current_limit": float(self._read("CURR?")),
+            "output": _scpi_bool(self._read("OUTP?")),
+        }
+
+    def identify(self) -> Optional[str]:
+        if self._read is not None:
+            return self._read("*IDN?").strip()
+        return self._mirror.identify()
+
+    def set_voltage(self, volts: float) -> None:
+        if self._write is None:
+            self._mirror.set_voltage(volts)
+            return
+        self._write(f"VOLT {volts}")
+        if self._read is not None:
+            self._read("*OPC?")  # wait for the instrument to settle
+
+    def stream_voltage(self, volts: float) -> None:
+        if self._write is None:
+            self._mirror.stream_voltage(volts)
+            return
+        self._write(f"VOLT {volts}")  # no *OPC? wait while streaming
+
+    def set_current_limit(self, amps: float) -> None:
+        if self._write is None:
+            self._mirror.set_current_limit(amps)
+            return
+        self._write(f"CURR {amps}")
+
+    def toggle_output(self, on: bool) -> None:
+        if self._write is None:
+            self._mirror.toggle_output(on)
+            return
+        self._write(f"OUTP {'ON' if on else 'OFF'}")
+
+    def power_cycle(self) -> None:
+        if self._write is None:
+            self._mirror.power_cycle()
+            return
+        self._write("OUTP OFF")
+        if self._read is not None:
+            self._read("*OPC?")
+        self._write("OUTP ON")
+
+
+def _scpi_bool(reply: str) -> bool:
+    return reply.strip().upper() in ("1", "ON")
+
+
+class LinkedPsuStrategy(PsuStrategy):
+    """Routes every operation through a link's ``exchange(op)`` before delegating.
+
+    Use with adapters.psu.sim_adapter.SimAdapter to put simulated transport
+    latency and faults in front of any strategy:
+    ``LinkedPsuStrategy(VirtualPsuStrategy(), link=sim_adapter)``.
+    """
+
+    __slots__ = ("inner", "link")
+
+    def __init__(self, inner: PsuStrategy, link) -> None:
+        super().__init__()
+        self.inner = inner
+        self.link = link
+
+    def attach(self, ctx: PSUContext) -> None:
+        super().attach(ctx)
+        self.inner.attach(ctx)
+
+    def initialize(self) -> None:
+        self.link.exchange("initialize")
+        self.inner.initialize()
+
+    def read(self, key: str) -> Union[float, bool]:
+        self.link.exchange("read")
+        return self.inner.read(key)
+
+    def read_setpoints(self) -> Dict[str, Union[float, bool]]:
+        self.link.exchange("read_setpoints")
+        return self.inner.read_setpoints()
+
+    def identify(self) -> Optional[str]:
+        self.link.exchange("identify")
+        return self.inner.identify()
 
     def set_voltage(self, volts: float) -> None:
-        # If real IO available: self._write(f"VOLT {volts}")
-        self._mirror.set_voltage(volts)
+        self.link.exchange("set_voltage")
+        self.inner.set_voltage(volts)
+
+    def stream_voltage(self, volts: float) -> None:
+        self.link.exchange("set_voltage")
+        self.inner.stream_voltage(volts)
 
     def set_current_limit(self, amps: float) -> None:
-        # If real IO available: self._write(f"CURR {amps}")
-        self._mirror.set_current_limit(amps)
+        self.link.exchange("set_current_limit")
+        self.inner.set_current_limit(amps)
 
     def toggle_output(self, on: bool) -> None:
-        # If real IO available: self._write(f"OUTP {'ON' if on else 'OFF'}")
-        self._mirror.toggle_output(on)
+        self.link.exchange("toggle_output")
+        self.inner.toggle_output(on)
 
     def power_cycle(self) -> None:
-        # If real IO available: sequence relays; here we simulate
-        self._mirror.power_cycle()
+        self.link.exchange("power_cycle")
+        self.inner.power_cycle()
@@ -1,11 +1,30 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 import yaml
 
+from core.frozen import freeze
+from .calibration import Calibration
 from .loader.config_loader import PSUConfigLoader
 
+CAPABILITIES_FILE = "capabilities.yml"
+RANGES_FILE = "ranges.yml"
+MODELS_FILE = "models.yml"
+CALIBRATION_FILE = "calibration.yml"  # optional
+_FILES = (CAPABILITIES_FILE, RANGES_FILE, MODELS_FILE, CALIBRATION_FILE)
+
+
+class ConfigSnapshot(NamedTuple):
+    """One consistent, versioned view of all the YAML files."""
+    version: int
+    capabilities: Dict[str, dict]
+    ranges: Dict[str, dict]
+    models: List[dict]
+    calibration: Dict[str, dict]
+    frozen: Dict[tuple, object]  # per-version cache of interned FrozenDicts
+
 
 class YamlPSUConfigLoader(PSUConfigLoader):
     """Load PSU configuration (capabilities, ranges, models) from YAML files.
@@ -14,6 +33,17 @@ class YamlPSUConfigLoader(PSUConfigLoader):
       - capabilities.yml
       - ranges.yml
       - models.yml
+      - calibration.yml (optional, see devices/psu/calibration.py)
+
+    Capabilities and ranges are returned as interned read-only FrozenDicts:
+    every device of a model shares the same objects.
+
+    Hot reload: reload_if_changed() (or a background watch()) re-parses only
+    the files whose mtime/size changed, validates the result and swaps in a new
+    ConfigSnapshot atomically, bumping ``version``. Devices compare that
+    version on use and re-read their policy with load_policy(), which takes
+    everything from one snapshot, so they pick up the change while staying
+    connected. An invalid edit raises and leaves the current config in place.
     """
 
     def __init__(self, base_dir: Optional[Union[str, Path]] = None) -> None:
@@ -21,10 +51,14 @@ class YamlPSUConfigLoader(PSUConfigLoader):
             # default to devices/psu/config directory
             base_dir = Path(__file__).resolve().parent / "config"
         self.base = Path(base_dir)
-        self._cap = {}
-        self._ranges = {}
-        self._models = []
-        self._load_all()
+        self._stats: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._in_use: Set[str] = set()  # models handed out so far
+        self._reload_lock = threading.Lock()
+        self._snapshot = self._load_all()
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
 
     def _load_yaml(self, name: str) -> object:
         p = self.base / name
@@ -32,42 +66,190 @@ class YamlPSUConfigLoader(PSUConfigLoader):
             data = yaml.safe_load(f)
         return data
 
-    def _load_all(self) -> None:
-        raw_cap = self._load_yaml("capabilities.yml") or {}
-        raw_ranges = self._load_yaml("ranges.yml") or {}
-        raw_models = self._load_yaml("models.yml") or []
-        if not isinstance(raw_cap, dict):
-            raise TypeError("capabilities.yml must map model -> capabilities")
-        if not isinstance(raw_ranges, dict):
-            raise TypeError("ranges.yml must map model -> ranges")
-        if not isinstance(raw_models, list):
-            raise TypeError("models.yml must be a list of model entries")
-        self._cap = raw_cap
-        self._ranges = raw_ranges
-        self._models = raw_models
+    def _stat(self, name: str) -> Tuple[int, int]:
+        st = (self.base / name).stat()
+        return st.st_mtime_ns, st.st_size
+
+    def _parse(self, name: str) -> object:
+        if name == CALIBRATION_FILE and not (self.base / name).exists():
+            self._stats[name] = None
+            return {}
+        self._stats[name] = self._stat(name)
+        raw = self._load_yaml(name)
+        if name == MODELS_FILE:
+            raw = raw or []
+            if not isinstance(raw, list):
+                raise TypeError("models.yml must be a list of model entries")
+            return raw
+        raw = raw or {}
+        if not isinstance(raw, dict):
+            what = {CAPABILITIES_FILE: "capabilities", RANGES_FILE: "ranges"}.get(name, "calibration")
+            raise TypeError(f"{name} must map model -> {what}")
+        return raw
+
+    def _load_all(self) -> ConfigSnapshot:
+        return ConfigSnapshot(
+            version=1,
+            capabilities=self._parse(CAPABILITIES_FILE),
+            ranges=self._parse(RANGES_FILE),
+            models=self._parse(MODELS_FILE),
+            calibration=self._parse(CALIBRATION_FILE),
+            frozen={},
+        )
+
+    # ----- Hot reload ---------------------------------------------------------
+    def _validate(self, snap: ConfigSnapshot) -> None:
+        for model, caps in snap.capabilities.items():
+            if not isinstance(caps, dict):
+                raise TypeError(f"capabilities for '{model}' must be a dict")
+        for model, rng in snap.ranges.items():
+            if not isinstance(rng, dict):
+                raise TypeError(f"ranges for '{model}' must be a dict")
+            for key, bounds in rng.items():
+                if not isinstance(bounds, dict):
+                    raise TypeError(f"ranges['{model}']['{key}'] must be a dict")
+                lo, hi = bounds.get("min"), bounds.get("max")
+                if lo is not None and hi is not None and float(lo) > float(hi):
+                    raise ValueError(f"ranges['{model}']['{key}']: min {lo} > max {hi}")
+        for model, entry in snap.calibration.items():
+            serials = entry.get("serials") if isinstance(entry, dict) else None
+            for serial in (None, *(serials or {})):
+                Calibration.from_config(entry, serial, snap.ranges.get(model))
+        for model in self._in_use:
+            if model not in snap.capabilities or model not in snap.ranges:
+                raise KeyError(f"reload would drop model '{model}' which is in use")
+
+    def changed_files(self) -> Set[str]:
+        changed = set()
+        for name in _FILES:
+            try:
+                if self._stat(name) != self._stats.get(name):
+                    changed.add(name)
+            except FileNotFoundError:
+                pass  # mid-replace by an editor; pick it up on the next poll
+        return changed
+
+    def reload_if_changed(self) -> Set[str]:
+        """Re-parse changed files and apply them; returns the changed file names."""
+        with self._reload_lock:
+            changed = self.changed_files()
+            if not changed:
+                return changed
+            old = self._snapshot
+            stats = dict(self._stats)
+            try:
+                snap = ConfigSnapshot(
+                    version=old.version + 1,
+                    capabilities=self._parse(CAPABILITIES_FILE) if CAPABILITIES_FILE in changed else old.capabilities,
+                    ranges=self._parse(RANGES_FILE) if RANGES_FILE in changed else old.ranges,
+                    models=self._parse(MODELS_FILE) if MODELS_FILE in changed else old.models,
+                    calibration=(self._parse(CALIBRATION_FILE) if CALIBRATION_FILE in changed
+                                 else old.calibration),
+                    frozen={},
+                )
+                self._validate(snap)
+            except Exception:
+                # Keep serving the old config and retry on the next poll
+                # (multi-file edits may be valid only once all files land)
+                self._stats = stats
+                raise
+            self._snapshot = snap
+            return changed
+
+    def watch(self, interval_s: float = 1.0,
+              on_error: Optional[Callable[[Exception], None]] = None) -> "ConfigWatcher":
+        """Start polling the YAML files for changes in a daemon thread."""
+        watcher = ConfigWatcher(self, interval_s, on_error)
+        watcher.start()
+        return watcher
 
     # PSUConfigLoader API
+    def load_policy(self, model: str, serial: Optional[str] = None
+                    ) -> Tuple[int, Dict[str, bool], Dict[str, Union[float, str]], Calibration]:
+        """(version, capabilities, ranges, calibration), all from one snapshot."""
+        snap = self._snapshot
+        return (snap.version, self._capabilities(snap, model), self._ranges(snap, model),
+                self._calibration(snap, model, serial))
+
     def load_capabilities(self, model: str) -> Dict[str, bool]:
+        return self._capabilities(self._snapshot, model)
+
+    def load_ranges(self, model: str) -> Dict[str, Union[float, str]]:
+        return self._ranges(self._snapshot, model)
+
+    def load_calibration(self, model: str, serial: Optional[str] = None) -> Calibration:
+        """Corrections for a model, with per-serial overrides; empty if none."""
+        return self._calibration(self._snapshot, model, serial)
+
+    def _capabilities(self, snap: ConfigSnapshot, model: str) -> Dict[str, bool]:
+        hit = snap.frozen.get(("cap", model))
+        if hit is not None:
+            return hit
         try:
-            caps = self._cap[model]
+            caps = snap.capabilities[model]
+            self._in_use.add(model)
         except KeyError as exc:
             raise KeyError(f"Capabilities for model '{model}' not found") from exc
         if not isinstance(caps, dict):
             raise TypeError("capabilities entry must be a dict")
         # Coerce values to bool
-        return {k: bool(v) for k, v in caps.items()}
+        frozen = snap.frozen[("cap", model)] = freeze({k: bool(v) for k, v in caps.items()})
+        return frozen
 
-    def load_ranges(self, model: str) -> Dict[str, Union[float, str]]:
+    def _ranges(self, snap: ConfigSnapshot, model: str) -> Dict[str, Union[float, str]]:
+        hit = snap.frozen.get(("ranges", model))
+        if hit is not None:
+            return hit
         try:
-            rng = self._ranges[model]
+            rng = snap.ranges[model]
         except KeyError as exc:
             raise KeyError(f"Ranges for model '{model}' not found") from exc
         if not isinstance(rng, dict):
             raise TypeError("ranges entry must be a dict")
-        return rng
+        frozen = snap.frozen[("ranges", model)] = freeze(rng)
+        return frozen
+
+    def _calibration(self, snap: ConfigSnapshot, model: str, serial: Optional[str]) -> Calibration:
+        hit = snap.frozen.get(("cal", model, serial))
+        if hit is not None:
+            return hit
+        cal = snap.frozen[("cal", model, serial)] = Calibration.from_config(
+            snap.calibration.get(model), serial, snap.ranges.get(model))
+        return cal
+
+    def list_models(self) -> List[Dict[str, object]]:
+        """All models.yml entries (copies)."""
+        return [dict(entry) for entry in self._snapshot.models]
 
     def load_model_info(self, model: str) -> Dict[str, object]:
-        for entry in self._models:
+        for entry in self._snapshot.models:
             if entry.get("model_id") == model:
                 return dict(entry)
         raise KeyError(f"Model info for '{model}' not found")
+
+
+class ConfigWatcher(threading.Thread):
+    """Polls a YamlPSUConfigLoader for file changes (mtime/size)."""
+
+    def __init__(self, loader: YamlPSUConfigLoader, interval_s: float = 1.0,
+                 on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        super().__init__(name="psu-config-watcher", daemon=True)
+        self.loader = loader
+        self.interval_s = interval_s
+        self.on_error = on_error
+        self.last_error: Optional[Exception] = None
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_s):
+            try:
+                self.loader.reload_if_changed()
+            except Exception as exc:
+                self.last_error = exc
+                if self.on_error is not None:
+                    self.on_error(exc)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
@@ -0,0 +1,54 @@
+"""Run a resident lab daemon with simulated PSUs.
+
+    python -m examples.lab_daemon --socket /tmp/labd.sock --psu bench=RIGOL-DP832
+
+Clients then talk to it without paying import/connect costs:
+
+    from core.labd import LabClient
+    with LabClient("/tmp/labd.sock") as lab:
+        lab.set("bench", "voltage", 5.0)
+        print(lab.batch([["set", "bench", "output", True], ["read", "bench", "voltage"]]))
+"""
+from __future__ import annotations
+
+import argparse
+import signal
+import threading
+from typing import Dict, List, Optional
+
+from adapters.psu.sim_adapter import SimAdapter
+from core.labd import LabDaemon
+from devices.psu import PSU, ShadowRegisters, VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+
+def build_devices(specs: List[str]) -> Dict[str, PSU]:
+    loader = YamlPSUConfigLoader()
+    devices: Dict[str, PSU] = {}
+    for spec in specs:
+        name, sep, model = spec.partition("=")
+        if not sep or not name or not model:
+            raise SystemExit(f"--psu expects NAME=MODEL, got {spec!r}")
+        devices[name] = PSU(model=model, adapter=SimAdapter(), config_loader=loader,
+                            strategy=VirtualPsuStrategy(), shadow=ShadowRegisters())
+    return devices
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default="/tmp/labd.sock", help="Unix socket path")
+    parser.add_argument("--psu", action="append", default=[], metavar="NAME=MODEL",
+                        help="simulated PSU to serve (repeatable)")
+    args = parser.parse_args(argv)
+
+    daemon = LabDaemon(build_devices(args.psu or ["psu=RIGOL-DP832"]), args.socket)
+    # serve_forever() blocks; SIGTERM/SIGINT stop it from a helper thread
+    stop = lambda *_: threading.Thread(target=daemon.stop).start()  # noqa: E731
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"labd: serving {', '.join(daemon.devices)} on {args.socket}")
+    daemon.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
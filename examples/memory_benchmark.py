@@ -0,0 +1,62 @@
+"""Report the memory cost of a simulated PSU fleet.
+
+    python -m examples.memory_benchmark --devices 50000 --top 5
+
+Builds ``--devices`` unconnected PSUs (PSU + VirtualPsuStrategy + SimAdapter,
+sharing one config loader) under tracemalloc and prints the bytes each device
+adds. test/test_memory.py runs the same measurement on a smaller fleet as a
+regression guard against a fixed budget.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from adapters.psu.sim_adapter import SimAdapter
+from devices.psu.PsuDevice import PSU
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+
+def _device(loader: YamlPSUConfigLoader, model: str) -> PSU:
+    return PSU(model=model, adapter=SimAdapter(), config_loader=loader, strategy=VirtualPsuStrategy())
+
+
+def measure(devices: int, model: str = "RIGOL-DP832",
+            top: int = 0) -> Tuple[float, List[tracemalloc.StatisticDiff]]:
+    """(bytes per device, largest ``top`` allocation sites) for a fleet of ``devices``."""
+    loader = YamlPSUConfigLoader()
+    _device(loader, model)  # warm interned config and caches
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot() if top else None
+        base, _ = tracemalloc.get_traced_memory()
+        fleet = [_device(loader, model) for _ in range(devices)]
+        gc.collect()
+        used, _ = tracemalloc.get_traced_memory()
+        sites = tracemalloc.take_snapshot().compare_to(before, "lineno")[:top] if top else []
+    finally:
+        tracemalloc.stop()
+    del fleet
+    return (used - base) / devices, sites
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50_000)
+    parser.add_argument("--model", default="RIGOL-DP832")
+    parser.add_argument("--top", type=int, default=0, help="also list the N largest allocation sites")
+    args = parser.parse_args(argv)
+
+    per_device, sites = measure(args.devices, args.model, args.top)
+    print(f"{args.devices} devices: {per_device:,.0f} bytes/device, "
+          f"{per_device * args.devices / 2**20:,.1f} MiB total")
+    for stat in sites:
+        print(f"  {stat.size_diff / args.devices:8,.0f} B/device  {stat.traceback}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,18 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import Any, Dict, Tuple, Protocol
+import os
+from typing import Any, Dict, Iterator, Tuple, Protocol
 
 import pytest
 
 from core.exceptions import ConnectionError
+from devices.psu import strategy as strategy_mod
 from devices.psu.PsuDevice import PSU
 from devices.psu.strategy import VirtualPsuStrategy, RealPsuStrategy
 from devices.psu.yaml_config_loader import YamlPSUConfigLoader
-from devices.psu.adapters import SimAdapter
+from adapters.psu.sim_adapter import SimAdapter
+from test.device_pool import DevicePool
 
 
 class DriverProtocol(Protocol):
@@ -83,6 +86,14 @@ class ScpiLikeAdapter:
         return float(resp.decode("ascii").strip()) if resp else 0.0
 
 
+@pytest.fixture
+def no_delays(monkeypatch):
+    """Zero the simulated settling waits; opt in with pytest.mark.usefixtures("no_delays")."""
+    monkeypatch.setattr(strategy_mod, "SET_VOLTAGE_DELAY_S", 0.0)
+    monkeypatch.setattr(strategy_mod, "OUTPUT_ON_DELAY_S", 0.0)
+    monkeypatch.setattr(strategy_mod, "POWER_CYCLE_DELAY_S", 0.0)
+
+
 @dataclasses.dataclass(frozen=True)
 class PsuVariant:
     name: str
@@ -98,13 +109,50 @@ def build_psu_from_variant(variant: PsuVariant) -> Tuple[PSU, Any]:
     return psu, adapter
 
 
-@pytest.fixture(scope="module")
-def PSU_VARIANTS() -> Tuple[PsuVariant, PsuVariant, PsuVariant]:
-    return (
+def psu_variants() -> Tuple[PsuVariant, ...]:
+    """Simulated variants, plus real instruments when PSU_TELNET_HOST / PSU_SSH_HOST are set."""
+    variants = [
         PsuVariant(name="sim+virtual", strategy=VirtualPsuStrategy(),
                    adapter_factory=lambda: SimAdapter()),
         PsuVariant(name="sim+real", strategy=RealPsuStrategy(),
                    adapter_factory=lambda: SimAdapter()),
         PsuVariant(name="sim+virtual-delayed", strategy=VirtualPsuStrategy(),
                    adapter_factory=lambda: SimAdapter(connect_delay_s=0.05)),
-    )
+    ]
+    if os.getenv("PSU_TELNET_HOST"):
+        from adapters.telnet_adapter import TelnetAdapter
+        variants.append(PsuVariant(
+            name="telnet+real", strategy=RealPsuStrategy(),
+            adapter_factory=lambda: TelnetAdapter(host=os.environ["PSU_TELNET_HOST"],
+                                                  port=int(os.getenv("PSU_TELNET_PORT", "23")))))
+    if os.getenv("PSU_SSH_HOST"):
+        from adapters.ssh_adapter import SSHAdapter
+        variants.append(PsuVariant(
+            name="ssh+real", strategy=RealPsuStrategy(),
+            adapter_factory=lambda: SSHAdapter(host=os.environ["PSU_SSH_HOST"],
+                                               username=os.getenv("PSU_SSH_USER", "user"),
+                                               password=os.getenv("PSU_SSH_PASS", "pass"),
+                                               port=int(os.getenv("PSU_SSH_PORT", "22")))))
+    return tuple(variants)
+
+
+@pytest.fixture(scope="module")
+def PSU_VARIANTS() -> Tuple[PsuVariant, ...]:
+    return psu_variants()
+
+
+@pytest.fixture(scope="session")
+def psu_pool(request) -> Iterator[DevicePool]:
+    """Connected PSUs shared by the whole session (one pool per xdist worker)."""
+    workerinput = getattr(request.config, "workerinput", None)
+    pool = DevicePool(psu_variants(), worker_id=workerinput["workerid"] if workerinput else "master")
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(params=[v.name for v in psu_variants()])
+def pooled_psu(request, psu_pool: DevicePool) -> Iterator[PSU]:
+    """A connected PSU per variant, reset to baseline after the test."""
+    psu = psu_pool.acquire(request.param)
+    yield psu
+    psu_pool.reset(psu)
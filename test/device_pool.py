@@ -0,0 +1,72 @@
+"""Session-wide pool of connected devices for the test suite.
+
+Connecting is the expensive part of a hardware-in-the-loop test (transport
+setup, connect delays, strategy initialize). The pool connects each
+(model, variant) once per pytest session and resets it to a known baseline
+between tests. Baseline writes go through shadow registers, so a test that
+left the setpoints untouched costs no I/O to reset.
+
+Under pytest-xdist every worker is its own process with its own session,
+hence its own pool: devices are never shared across processes. Route tests
+that need an exclusive physical instrument to one worker with
+``@pytest.mark.xdist_group`` and ``--dist loadgroup``.
+"""
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from devices.base import DeviceState
+from devices.psu.PsuDevice import PSU
+from devices.psu.shadow import ShadowRegisters
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+DEFAULT_MODEL = "RIGOL-DP832"
+
+
+class DevicePool:
+    def __init__(self, variants, worker_id: str = "master") -> None:
+        self.variants = {v.name: v for v in variants}
+        self.worker_id = worker_id
+        self._loader = YamlPSUConfigLoader()
+        self._devices: Dict[Tuple[str, str], PSU] = {}
+        self.connects = 0
+        self.resets = 0
+
+    def acquire(self, variant_name: str, model: str = DEFAULT_MODEL) -> PSU:
+        """Return the pooled, connected PSU for ``(model, variant_name)``."""
+        key = (model, variant_name)
+        psu = self._devices.get(key)
+        if psu is None:
+            variant = self.variants[variant_name]
+            psu = PSU(model=model, adapter=variant.adapter_factory(), config_loader=self._loader,
+                      strategy=variant.strategy, shadow=ShadowRegisters())
+            self._devices[key] = psu
+        if psu.state is not DeviceState.CONNECTED:
+            # First use, or a test disconnected/broke it
+            psu.connect()
+            self.connects += 1
+        return psu
+
+    def reset(self, psu: PSU) -> None:
+        """Bring ``psu`` back to baseline: output off, then minimum levels.
+
+        Settings the model cannot write are left alone.
+        """
+        if psu.state is not DeviceState.CONNECTED:
+            return  # acquire() reconnects on next use
+        caps = psu.get_capabilities()
+        if caps.get("toggle_output", False):
+            psu.output = False
+        if caps.get("set_voltage", False):
+            psu.voltage = float(psu.get_ranges()["voltage"]["min"])
+        if caps.get("set_current_limit", False):
+            psu.current_limit = 0.0
+        self.resets += 1
+
+    def close(self) -> None:
+        for psu in self._devices.values():
+            try:
+                psu.disconnect()
+            except Exception:
+                pass
+        self._devices.clear()
@@ -0,0 +1,84 @@
+"""Local fake SCPI instruments for discovery and telnet tests.
+
+Each FakeInstrument listens on 127.0.0.1 (ephemeral port) and answers
+``*IDN?`` with its identity string; ``silent=True`` accepts connections but
+never replies, like a non-SCPI service or a wedged instrument, and
+``oversized=True`` answers with one line longer than a probe will buffer.
+It also keeps a minimal PSU state for ``VOLT``/``CURR``/``OUTP`` (commands
+and queries) and ``MEAS:VOLT?``/``MEAS:CURR?``, and records every line it
+receives in ``commands``.
+"""
+from __future__ import annotations
+
+import socketserver
+import threading
+from typing import Dict, List, Optional, Union
+
+OVERSIZED_REPLY_BYTES = 256 * 1024
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        fake: FakeInstrument = self.server.fake  # type: ignore[attr-defined]
+        for line in self.rfile:
+            fake.queries += 1
+            if fake.silent:
+                fake.release.wait(5.0)
+                return
+            reply = fake.respond(line.decode("ascii", "replace").strip())
+            if reply is not None:
+                self.wfile.write(reply.encode("ascii") + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeInstrument:
+    def __init__(self, idn: str = "", silent: bool = False, oversized: bool = False) -> None:
+        self.idn = idn
+        self.silent = silent
+        self.oversized = oversized
+        self.queries = 0
+        self.commands: List[str] = []
+        self.state: Dict[str, Union[float, bool]] = {"VOLT": 0.0, "CURR": 0.0, "OUTP": False}
+        self.release = threading.Event()
+        self._server: Optional[_Server] = None
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    def respond(self, command: str) -> Optional[str]:
+        """Reply line for ``command`` (None for commands that do not answer)."""
+        self.commands.append(command)
+        head, _, arg = command.upper().partition(" ")
+        if head == "*IDN?":
+            return "X" * OVERSIZED_REPLY_BYTES if self.oversized else self.idn
+        if head == "*OPC?":
+            return "1"
+        if head in ("VOLT?", "CURR?"):
+            return str(self.state[head[:-1]])
+        if head == "OUTP?":
+            return "1" if self.state["OUTP"] else "0"
+        if head == "MEAS:VOLT?":
+            return str(self.state["VOLT"] if self.state["OUTP"] else 0.0)
+        if head == "MEAS:CURR?":
+            return "0.0"  # no load
+        if head in ("VOLT", "CURR"):
+            self.state[head] = float(arg)
+        elif head == "OUTP":
+            self.state["OUTP"] = arg in ("ON", "1")
+        return None
+
+    def __enter__(self) -> "FakeInstrument":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.fake = self  # type: ignore[attr-defined]
+        threading.Thread(target=self._server.serve_forever, args=(0.02,), daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release.set()
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from adapters.bus import SharedBus
+from adapters.psu.faults import Fixed
+from adapters.psu.sim_adapter import SimAdapter
+from devices.psu.PsuDevice import PSU
+from devices.psu.strategy import LinkedPsuStrategy, VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+
+class CountingSim(SimAdapter):
+    def __init__(self, **kw) -> None:
+        super().__init__(**kw)
+        self.connects = 0
+        self.disconnects = 0
+        self.active = 0
+        self.max_active = 0
+        self.order = []
+
+    def connect(self) -> None:
+        self.connects += 1
+        super().connect()
+
+    def disconnect(self) -> None:
+        self.disconnects += 1
+        super().disconnect()
+
+    def exchange(self, op):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            self.order.append(op)
+            return super().exchange(op)
+        finally:
+            self.active -= 1
+
+
+def _fleet(bus, n):
+    loader = YamlPSUConfigLoader()
+    out = []
+    for i in range(n):
+        port = bus.port(f"psu{i}")
+        out.append(PSU(model="RIGOL-DP832", adapter=port, config_loader=loader,
+                       strategy=LinkedPsuStrategy(VirtualPsuStrategy(), link=port)))
+    return out
+
+
+def test_refcounted_connect_and_serialized_io():
+    sim = CountingSim(latency=Fixed(0.001))
+    bus = SharedBus(sim, max_batch=1)  # one command per write
+    fleet = _fleet(bus, 16)
+    for psu in fleet:
+        psu.connect()
+    assert sim.connects == 1 and bus.refcount == 16
+
+    def work(psu):
+        for _ in range(10):
+            psu.read("voltage")
+
+    threads = [threading.Thread(target=work, args=(p,)) for p in fleet]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sim.max_active == 1
+
+    fleet[0].disconnect()
+    assert sim.is_connected() and fleet[1].read("voltage") == 0.0
+    for psu in fleet[1:]:
+        psu.disconnect()
+    assert sim.disconnects == 1 and not sim.is_connected()
+
+
+def test_round_robin_fairness():
+    sim = CountingSim()
+    bus = SharedBus(sim, max_batch=1)
+    a, b = bus.port("a"), bus.port("b")
+    a.connect(); b.connect()
+
+    gate = threading.Event()
+    real = sim.exchange
+    sim.exchange = lambda op: (gate.wait(), real(op))[1]  # type: ignore[assignment]
+    threads = [threading.Thread(target=a.exchange, args=("a0",))]
+    threads[0].start()
+    while not bus._busy:
+        time.sleep(0.001)
+    for i in range(1, 4):
+        threads.append(threading.Thread(target=a.exchange, args=(f"a{i}",)))
+        threads[-1].start()
+        while len(bus._queues[a]) < i:
+            time.sleep(0.001)
+    threads.append(threading.Thread(target=b.exchange, args=("b0",)))
+    threads[-1].start()
+    while len(bus._queues.get(b, ())) < 1:
+        time.sleep(0.001)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert sim.order[1:] == ["a0", "a1", "b0", "a2", "a3"]  # b0 is not starved by a*
+
+
+def test_batches_commands_from_different_devices():
+    sim = CountingSim(latency={"*": Fixed(0.0), "batch": Fixed(0.005)})
+    bus = SharedBus(sim, max_batch=16)
+    fleet = _fleet(bus, 16)
+    for psu in fleet:
+        psu.connect()
+    writes_before = bus.transport_writes
+    barrier = threading.Barrier(len(fleet))
+
+    def work(psu):
+        barrier.wait()
+        for _ in range(5):
+            psu.read("current")
+
+    threads = [threading.Thread(target=work, args=(p,)) for p in fleet]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert bus.transport_writes - writes_before < 16 * 5 / 2
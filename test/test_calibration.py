@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+
+from adapters.psu.sim_adapter import SimAdapter
+from devices.psu.PsuDevice import PSU
+from devices.psu.calibration import Calibration, PiecewiseLinear, Polynomial, unit_factor
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "devices" / "psu" / "config"
+
+CALIBRATION = {
+    "RIGOL-DP832": {
+        "voltage": {"poly": [0.5, 2.0]},
+        "current": {"unit": "mA", "table": [[0, 0], [1000, 1100]]},
+        "serials": {"DP8C1234": {"voltage": {"table": [[0, 0], [10, 11], [30, 30]]}}},
+    },
+}
+
+
+@pytest.fixture
+def loader(tmp_path):
+    for name in ("capabilities.yml", "ranges.yml", "models.yml"):
+        shutil.copy(CONFIG_DIR / name, tmp_path / name)
+    (tmp_path / "calibration.yml").write_text(yaml.safe_dump(CALIBRATION), encoding="utf-8")
+    return YamlPSUConfigLoader(tmp_path)
+
+
+def test_scalar_corrections():
+    assert Polynomial([0.5, 2.0, 1.0])(3.0) == 0.5 + 6.0 + 9.0
+    table = PiecewiseLinear([(0, 0), (10, 11), (30, 30)])
+    assert table(5.0) == 5.5
+    assert table(20.0) == pytest.approx(20.5)
+    assert table(40.0) == pytest.approx(39.5)  # last segment extrapolated
+    assert table(-10.0) == pytest.approx(-11.0)
+    assert unit_factor("mA", "A") == 1e-3
+    with pytest.raises(ValueError):
+        unit_factor("mV", "A")
+    with pytest.raises(ValueError):
+        PiecewiseLinear([(0, 0), (0, 1)])
+
+
+def test_vectorized_matches_scalar():
+    raw = np.linspace(-5.0, 45.0, 1001)
+    for corr in (Polynomial([0.1, 0.99, 1e-4]), PiecewiseLinear([(0, 0), (10, 11), (30, 30)])):
+        expected = np.array([corr(float(x)) for x in raw])
+        assert np.allclose(corr.apply(raw), expected)
+    cal = Calibration({"voltage": Polynomial([0.0, 2.0])})
+    chunks = list(cal.apply_stream("voltage", [raw[:10], raw[10:]]))
+    assert np.array_equal(np.concatenate(chunks), 2.0 * raw)
+    assert np.array_equal(cal.apply("current", raw), raw)  # no entry: passthrough
+
+
+def test_loader_merges_serial_overrides_and_units(loader):
+    model = loader.load_calibration("RIGOL-DP832")
+    assert model.correct("voltage", 1.0) == 2.5
+    assert model.correct("current", 500.0) == pytest.approx(0.55)  # mA table -> A
+    assert model.correct("temp", 25.0) == 25.0
+    unit = loader.load_calibration("RIGOL-DP832", "DP8C1234")
+    assert unit.correct("voltage", 5.0) == 5.5
+    assert unit.correct("current", 500.0) == pytest.approx(0.55)
+    assert loader.load_calibration("RIGOL-DP832") is model
+    assert not loader.load_calibration("KEITHLEY-2230G")
+
+
+def test_psu_read_path_applies_calibration(loader):
+    psu = PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=loader,
+              strategy=VirtualPsuStrategy(), serial="DP8C1234")
+    psu.connect()
+    psu.voltage = 10.0
+    psu.output = True
+    assert psu.read_voltage() == pytest.approx(11.0, abs=0.2)
+    assert psu.read("voltage") == pytest.approx(11.0, abs=0.2)
+    assert psu.calibration.correct("voltage", 10.0) == 11.0
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from adapters.psu.sim_adapter import SimAdapter
+from devices.psu.PsuDevice import PSU
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "devices" / "psu" / "config"
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    for name in ("capabilities.yml", "ranges.yml", "models.yml"):
+        shutil.copy(CONFIG_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+def _edit(path: Path, mutate) -> None:
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    mutate(data)
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))  # coarse-mtime filesystems
+
+
+def _psu(loader):
+    return PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=loader,
+               strategy=VirtualPsuStrategy())
+
+
+def test_reload_swaps_limits_into_connected_device(config_dir):
+    loader = YamlPSUConfigLoader(config_dir)
+    psu = _psu(loader)
+    psu.connect()
+    psu.voltage = 12.0
+    assert loader.reload_if_changed() == set()
+
+    _edit(config_dir / "ranges.yml", lambda d: d["RIGOL-DP832"]["voltage"].update(max=10))
+    assert loader.reload_if_changed() == {"ranges.yml"}
+    assert psu.is_connected and psu.config_version == 2
+    assert psu.voltage == 12.0  # setpoint untouched until next write
+    with pytest.raises(ValueError):
+        psu.voltage = 12.0
+    psu.voltage = 9.0
+    assert psu._strategy._ctx.ranges["voltage"]["max"] == 10
+
+
+def test_invalid_edit_keeps_current_config(config_dir):
+    loader = YamlPSUConfigLoader(config_dir)
+    psu = _psu(loader)
+    _edit(config_dir / "ranges.yml", lambda d: d["RIGOL-DP832"]["voltage"].update(min=50))
+    with pytest.raises(ValueError):
+        loader.reload_if_changed()
+    assert loader.version == 1 and psu.config_version == 1
+    _edit(config_dir / "ranges.yml", lambda d: d["RIGOL-DP832"]["voltage"].update(min=0))
+    _edit(config_dir / "capabilities.yml", lambda d: d.pop("RIGOL-DP832"))
+    with pytest.raises(KeyError):
+        loader.reload_if_changed()  # model is in use
+    assert psu.get_capabilities()["set_voltage"] is True
+
+
+def test_watcher_picks_up_changes(config_dir):
+    loader = YamlPSUConfigLoader(config_dir)
+    psu = _psu(loader)
+    watcher = loader.watch(interval_s=0.01)
+    try:
+        _edit(config_dir / "capabilities.yml", lambda d: d["RIGOL-DP832"].update(power_cycle=True))
+        deadline = time.monotonic() + 2.0
+        while psu.config_version == 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+    assert psu.get_capabilities()["power_cycle"] is True
+
+
+class ContextCheckingStrategy(VirtualPsuStrategy):
+    """Flags a strategy context swapped while one of its calls is running."""
+
+    __slots__ = ("swapped",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.swapped = 0
+
+    def read(self, key):
+        ctx = self._ctx
+        time.sleep(0.0005)
+        if self._ctx is not ctx:
+            self.swapped += 1
+        return super().read(key)
+
+
+def test_policy_comes_from_one_snapshot(config_dir):
+    loader = YamlPSUConfigLoader(config_dir)
+    _edit(config_dir / "ranges.yml", lambda d: d["RIGOL-DP832"]["voltage"].update(max=10))
+    loader.reload_if_changed()
+    version, caps, ranges, cal = loader.load_policy("RIGOL-DP832")
+    assert version == 2 and ranges["voltage"]["max"] == 10 and caps["set_voltage"] is True
+
+
+def test_reload_during_read_storm_never_swaps_context_mid_call(config_dir):
+    loader = YamlPSUConfigLoader(config_dir)
+    strat = ContextCheckingStrategy()
+    psu = PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=loader, strategy=strat)
+    psu.connect()
+    stop = threading.Event()
+    errors = []
+
+    def storm():
+        try:
+            while not stop.is_set():
+                psu.read("voltage")
+        except Exception as exc:
+            errors.append(exc)
+
+    def poll():
+        while not stop.is_set():
+            psu.config_version  # lock-free path that picks up reloads
+
+    threads = [threading.Thread(target=storm) for _ in range(4)] + [threading.Thread(target=poll)]
+    for t in threads:
+        t.start()
+    try:
+        for i in range(20):
+            _edit(config_dir / "ranges.yml", lambda d, m=20 + i % 2: d["RIGOL-DP832"]["voltage"].update(max=m))
+            loader.reload_if_changed()
+            time.sleep(0.005)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    assert errors == [] and strat.swapped == 0
+    assert psu.config_version == loader.version == 21
+    psu.read("voltage")
+    assert strat._ctx.ranges is psu.get_ranges()
+    psu.disconnect()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from adapters.psu.faults import FaultSchedule, Fixed
+from adapters.psu.sim_adapter import SimAdapter
+from core import deadline
+from core.exceptions import ConnectionError, DeviceTimeout
+from devices.base import DeviceState
+from devices.psu.PsuDevice import PSU
+from devices.psu.shadow import ShadowRegisters
+from devices.psu.strategy import LinkedPsuStrategy, VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+
+@pytest.fixture(scope="module")
+def loader():
+    return YamlPSUConfigLoader()
+
+
+def _psu(loader, adapter=None, **kw):
+    adapter = adapter or SimAdapter()
+    return PSU(model="RIGOL-DP832", adapter=adapter, config_loader=loader,
+               strategy=LinkedPsuStrategy(VirtualPsuStrategy(), link=adapter), **kw)
+
+
+def test_per_call_timeout_bounds_hung_read(loader):
+    adapter = SimAdapter(faults=FaultSchedule({"read": {1: "no_response"}}), timeout_s=10.0)
+    psu = _psu(loader, adapter)
+    psu.connect()
+    start = time.monotonic()
+    with pytest.raises(DeviceTimeout):
+        psu.read("voltage", timeout=0.05)
+    assert time.monotonic() - start < 1.0
+    assert psu.state is DeviceState.CONNECTED
+    assert psu.read("voltage") == 0.0  # recoverable
+
+
+def test_scope_bounds_set_and_leaves_setpoint_untouched(loader):
+    psu = _psu(loader, shadow=ShadowRegisters())
+    psu.connect()
+    with pytest.raises(DeviceTimeout):
+        with psu.deadline(0.02):
+            psu.voltage = 5.0  # busy for 100 ms
+    assert psu.voltage == 0.0
+    assert psu.shadow.dirty
+    psu.voltage = 5.0
+    assert psu.voltage == 5.0
+
+
+def test_device_default_timeout_and_explicit_override(loader):
+    adapter = SimAdapter(latency={"read": Fixed(0.05)})
+    psu = _psu(loader, adapter, timeout=0.01)
+    with psu.deadline(1.0):
+        psu.connect()
+    with pytest.raises(DeviceTimeout):
+        psu.read("current")
+    assert psu.read("current", timeout=1.0) == 0.0
+    with psu.deadline(1.0):
+        psu.read("current")
+
+
+def test_connect_timeout_leaves_device_retryable(loader):
+    adapter = SimAdapter(latency={"connect": Fixed(0.2)})
+    psu = _psu(loader, adapter, timeout=0.02)
+    with pytest.raises(ConnectionError) as info:
+        psu.connect()
+    assert isinstance(info.value.__cause__, DeviceTimeout)
+    assert psu.state is DeviceState.ERROR and not adapter.is_connected()
+    with psu.deadline(1.0):
+        psu.connect()
+    assert psu.is_connected
+
+
+def test_cancel_from_another_thread(loader):
+    psu = _psu(loader)
+    psu.connect()
+    with deadline.deadline(None) as scope:
+        threading.Timer(0.02, scope.cancel).start()
+        start = time.monotonic()
+        with pytest.raises(DeviceTimeout, match="cancelled"):
+            psu.output = True  # 500 ms stabilization delay
+    assert time.monotonic() - start < 0.4
+    assert psu.output is False
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import socket
+import time
+from contextlib import ExitStack
+
+import pytest
+
+from devices.psu.discovery import (
+    DiscoveryCache,
+    Scanner,
+    expand_targets,
+    make_psu,
+    match_model,
+    parse_idn,
+)
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+from test.fake_instruments import FakeInstrument
+
+RIGOL = "RIGOL TECHNOLOGIES,DP832,DP8C1234,00.01.14"
+KEITHLEY = "Keithley Instruments,MODEL 2230G-30-1,9104567,1.04"
+
+
+def _closed_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_idn_parsing_and_model_matching():
+    models = YamlPSUConfigLoader().list_models()
+    assert parse_idn(RIGOL) == ("RIGOL TECHNOLOGIES", "DP832", "DP8C1234", "00.01.14")
+    assert parse_idn("ACME")[2:] == (None, None)
+    assert match_model(RIGOL, models) == "RIGOL-DP832"
+    assert match_model(KEITHLEY, models) == "KEITHLEY-2230G"
+    assert match_model("RIGOL TECHNOLOGIES,DS1054Z,X,1", models) is None
+    assert match_model("Acme,PS-9,1,1", [{"model_id": "ACME-9", "idn_pattern": r"^acme,ps-9,"}]) == "ACME-9"
+
+
+def test_expand_targets():
+    assert expand_targets(["10.0.0.1-3"], [5025]) == [("10.0.0.1", 5025), ("10.0.0.2", 5025), ("10.0.0.3", 5025)]
+    assert len(expand_targets(["10.0.0.0/28"], [5025, 5555])) == 28
+    assert expand_targets(["bench:7000", "bench"], [5025]) == [("bench", 7000), ("bench", 5025)]
+
+
+def test_concurrent_scan_matches_specs_and_skips_silent_hosts():
+    with ExitStack() as stack:
+        rigol = stack.enter_context(FakeInstrument(RIGOL))
+        keithley = stack.enter_context(FakeInstrument(KEITHLEY))
+        unknown = stack.enter_context(FakeInstrument("ACME,XYZ,1,1"))
+        silent = [stack.enter_context(FakeInstrument(silent=True)) for _ in range(10)]
+        targets = [rigol.address, keithley.address, unknown.address, ("127.0.0.1", _closed_port())]
+        targets += [s.address for s in silent]
+
+        started = time.monotonic()
+        found = Scanner(concurrency=32, timeout=0.3).scan(targets)
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 1.5  # ten 0.3 s timeouts in parallel, not in series
+    by_id = {d.model_id: d for d in found}
+    assert set(by_id) == {"RIGOL-DP832", "KEITHLEY-2230G", None}
+    spec = by_id["RIGOL-DP832"].spec()
+    assert spec == {"model": "RIGOL-DP832",
+                    "adapter": {"type": "telnet", "host": "127.0.0.1", "port": rigol.address[1]},
+                    "serial": "DP8C1234"}
+    psu = make_psu(spec)
+    assert psu.model == "RIGOL-DP832" and psu.serial == "DP8C1234" and not psu.is_connected
+    with pytest.raises(ValueError):
+        make_psu(by_id[None].spec())
+
+
+def test_cache_makes_rescans_cheap(tmp_path):
+    path = tmp_path / "scan.json"
+    with FakeInstrument(RIGOL) as rigol:
+        targets = [rigol.address, ("127.0.0.1", _closed_port())]
+        first = Scanner(cache=DiscoveryCache(path), timeout=0.3)
+        assert [d.model_id for d in first.scan(targets)] == ["RIGOL-DP832"]
+        assert first.probed == 2 and rigol.queries == 1
+
+        again = Scanner(cache=DiscoveryCache(path), timeout=0.3)
+        assert [d.model_id for d in again.scan(targets)] == ["RIGOL-DP832"]
+        assert again.probed == 0 and rigol.queries == 1
+
+        again.scan(targets, refresh=True)
+        assert again.probed == 2 and rigol.queries == 2
+
+
+def test_cached_misses_expire_sooner_than_answers(tmp_path):
+    path = tmp_path / "scan.json"
+    with FakeInstrument(RIGOL) as rigol:
+        targets = [rigol.address, ("127.0.0.1", _closed_port())]
+        Scanner(cache=DiscoveryCache(path), timeout=0.3).scan(targets)
+
+        again = Scanner(cache=DiscoveryCache(path), timeout=0.3, miss_max_age_s=0.0)
+        assert [d.model_id for d in again.scan(targets)] == ["RIGOL-DP832"]
+        assert again.probed == 1 and rigol.queries == 1  # only the miss is re-probed
+
+
+def test_made_psu_drives_the_instrument_over_telnet():
+    with FakeInstrument(RIGOL) as rigol:
+        host, port = rigol.address
+        psu = make_psu({"model": "RIGOL-DP832", "adapter": {"type": "telnet", "host": host, "port": port},
+                        "serial": "DP8C1234"})
+        psu.connect()
+        try:
+            psu.voltage = 5.0
+            psu.current_limit = 0.5
+            psu.output = True
+            assert psu.read_voltage() == pytest.approx(5.0)
+            assert psu.read("output") is True
+        finally:
+            psu.disconnect()
+    assert rigol.state == {"VOLT": 5.0, "CURR": 0.5, "OUTP": True}
+    assert {"VOLT 5.0", "CURR 0.5", "OUTP ON", "MEAS:VOLT?"} <= set(rigol.commands)
+
+
+def test_oversized_reply_is_recorded_as_a_miss(tmp_path):
+    path = tmp_path / "scan.json"
+    with FakeInstrument(RIGOL) as rigol, FakeInstrument(oversized=True) as chatty:
+        found = Scanner(cache=DiscoveryCache(path), timeout=1.0).scan([rigol.address, chatty.address])
+    assert [d.model_id for d in found] == ["RIGOL-DP832"]
+    host, port = chatty.address
+    assert DiscoveryCache(path).get(host, port, max_age_s=60.0) == (True, None)
+
+
+def test_malformed_cache_entries_are_misses(tmp_path):
+    path = tmp_path / "scan.json"
+    path.write_text(json.dumps({"h:1": ["RIGOL"], "h:2": 7, "h:3": {"idn": 5, "t": time.time()},
+                                "h:4": {"idn": RIGOL, "t": "soon"}, "h:5": {"idn": RIGOL, "t": time.time()}}))
+    cache = DiscoveryCache(path)
+    assert [cache.get("h", port, max_age_s=60.0) for port in range(1, 6)] == \
+        [(False, None)] * 4 + [(True, RIGOL)]
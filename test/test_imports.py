@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Package-level imports must stay cheap: short-lived worker scripts pay this
+# on every run. Checked by what gets loaded rather than wall-clock time.
+HEAVY = ("yaml", "numpy", "paramiko", "devices.psu", "devices.psu.PsuDevice", "adapters.ssh_adapter")
+
+_PROBE = """
+import json, sys
+before = set(sys.modules)
+{stmt}
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def _loaded(stmt: str) -> set:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(stmt=stmt)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return set(json.loads(out.stdout))
+
+
+@pytest.mark.parametrize("stmt", [
+    "import devices, adapters",
+    "import devices.base",
+    "from adapters.psu import SimAdapter",
+])
+def test_package_import_is_lazy(stmt):
+    loaded = _loaded(stmt)
+    for heavy in HEAVY:
+        assert heavy not in loaded, f"{stmt!r} eagerly imported {heavy}"
+
+
+def test_lazy_attribute_resolves_on_first_use():
+    loaded = _loaded("import devices; devices.PSU")
+    assert "devices.psu.PsuDevice" in loaded
+    assert "yaml" not in loaded
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import io
+import os
+import stat
+import threading
+
+import pytest
+
+from adapters.psu.sim_adapter import SimAdapter
+from core import wire
+from core.exceptions import ConnectionError, ProtocolError
+from core.labd import BatchError, LabClient, LabDaemon
+from devices.psu.PsuDevice import PSU
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    loader = YamlPSUConfigLoader()
+    devices = {
+        name: PSU(model=model, adapter=SimAdapter(), config_loader=loader, strategy=VirtualPsuStrategy())
+        for name, model in (("bench", "RIGOL-DP832"), ("aux", "KEITHLEY-2230G"))
+    }
+    with LabDaemon(devices, tmp_path / "labd.sock") as d:
+        yield d
+    assert not (tmp_path / "labd.sock").exists()
+    assert not any(dev.is_connected for dev in devices.values())
+
+
+@pytest.mark.parametrize("obj", [
+    None, True, False, 0, 127, 128, -1, -32, -33, 255, 65536, -2**31, 2**63, -2**63,
+    1.5, "", "x" * 31, "y" * 300, b"\x00\xff", list(range(20)), {"a": [1, {"b": None}]},
+])
+def test_wire_roundtrip(obj):
+    assert wire.unpackb(wire.packb(obj)) == obj
+    assert wire.read_frame(io.BytesIO(wire.frame(obj))) == obj
+
+
+def test_wire_rejects_garbage():
+    with pytest.raises(ProtocolError):
+        wire.unpackb(b"\xc1")
+    with pytest.raises(ProtocolError):
+        wire.unpackb(wire.packb("abc")[:-1])
+    with pytest.raises(ProtocolError):
+        wire.read_frame(io.BytesIO(wire.frame([1, 2])[:-1]))
+    assert wire.read_frame(io.BytesIO(b"")) is None
+
+
+def test_read_set_batch(daemon):
+    with LabClient(daemon.path) as lab:
+        assert lab.ping() == "pong"
+        assert lab.devices() == {"bench": "RIGOL-DP832", "aux": "KEITHLEY-2230G"}
+        lab.set("bench", "voltage", 5.0)
+        lab.set("bench", "output", True)
+        assert lab.read("bench", "voltage") == pytest.approx(5.0, abs=0.2)
+        out = lab.batch([["set", "aux", "voltage", 3.0], ["set", "aux", "output", True],
+                         ["read", "aux", "voltage"], ["read", "bench", "output"]])
+        assert out[0] is None and out[2] == pytest.approx(3.0, abs=0.2) and out[3] is True
+        assert daemon.devices["aux"].voltage == 3.0
+
+
+def test_errors_are_typed_and_keep_the_connection(daemon):
+    with LabClient(daemon.path) as lab:
+        with pytest.raises(KeyError):
+            lab.read("nope", "voltage")
+        with pytest.raises(ValueError):
+            lab.set("bench", "voltage", 1000.0)
+        with pytest.raises(KeyError):
+            lab.read("bench", "frequency")
+        with pytest.raises(BatchError) as info:
+            lab.batch([["read", "bench", "output"], ["bogus", "bench", "x"]])
+        assert info.value.results[0] == [True, False]
+        assert info.value.results[1][1][0] == "ProtocolError"
+        assert lab.ping() == "pong"
+
+
+def test_concurrent_clients_are_serialized_per_device(daemon):
+    errors = []
+    daemon.devices["bench"].output = True
+
+    def worker(volts):
+        try:
+            with LabClient(daemon.path) as lab:
+                for _ in range(50):
+                    # set + readback as one batch: no other client can slip in between
+                    _, measured = lab.batch([["set", "bench", "voltage", volts],
+                                             ["read", "bench", "voltage"]])
+                    assert measured == pytest.approx(volts, abs=0.2)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(float(v),)) for v in (1, 2, 3, 4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_second_daemon_on_same_socket_is_refused(daemon):
+    with pytest.raises(ConnectionError):
+        LabDaemon({"x": daemon.devices["bench"]}, daemon.path).start()
+
+
+def test_client_without_daemon(tmp_path):
+    with pytest.raises(ConnectionError):
+        LabClient(tmp_path / "missing.sock")
+
+
+def test_socket_is_owner_only(daemon):
+    assert stat.S_IMODE(os.stat(daemon.path).st_mode) & 0o077 == 0
+
+
+def test_client_used_after_close_raises_connection_error(daemon):
+    lab = LabClient(daemon.path)
+    lab.close()
+    with pytest.raises(ConnectionError):
+        lab.ping()
+
+
+def test_failing_disconnect_does_not_skip_the_others(tmp_path, caplog):
+    class Broken:
+        model = "BROKEN"
+
+        def connect(self):
+            pass
+
+        def disconnect(self):
+            raise ConnectionError("wedged")
+
+    psu = PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=YamlPSUConfigLoader(),
+              strategy=VirtualPsuStrategy())
+    with LabDaemon({"a": Broken(), "b": psu}, tmp_path / "labd.sock"):
+        assert psu.is_connected
+    assert not psu.is_connected
+    assert "disconnecting a failed" in caplog.text
+
+
+def test_failed_connect_releases_devices_already_connected(tmp_path):
+    class Unreachable:
+        model = "UNREACHABLE"
+
+        def connect(self):
+            raise ConnectionError("no route")
+
+        def disconnect(self):
+            pass
+
+    psu = PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=YamlPSUConfigLoader(),
+              strategy=VirtualPsuStrategy())
+    daemon = LabDaemon({"a": psu, "b": Unreachable()}, tmp_path / "labd.sock")
+    with pytest.raises(ConnectionError):
+        daemon.start()
+    assert not psu.is_connected
+    assert not (tmp_path / "labd.sock").exists()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from core.measlog import MeasurementLog, MeasurementLogWriter
+
+
+def _fill(path, n=10_000, chunk_rows=1000):
+    with MeasurementLogWriter(path, chunk_rows=chunk_rows) as w:
+        for i in range(n):
+            w.append("psu1", "voltage", 5.0 + i * 1e-4, t=float(i))
+            if i % 2 == 0:
+                w.append("psu2", "current", i * 1e-3, t=float(i))
+
+
+def test_time_range_query_returns_views(tmp_path):
+    path = tmp_path / "soak.mlog"
+    _fill(path)
+    with MeasurementLog(path) as log:
+        assert not log.recovered
+        assert log.series() == [("psu1", "voltage"), ("psu2", "current")]
+        assert log.rows("psu1", "voltage") == 10_000
+        ts, vals = log.query("psu1", "voltage", 1200.0, 1299.0)
+        assert ts[0] == 1200.0 and ts[-1] == 1299.0 and len(ts) == 100
+        assert vals.base is not None and not vals.flags.writeable  # view into the mapping
+        np.testing.assert_allclose(vals, 5.0 + ts * 1e-4)
+        ts, _ = log.query("psu1", "voltage", 990.0, 1010.0)  # spans two chunks
+        assert ts.tolist() == [float(i) for i in range(990, 1011)]
+        ts, vals = log.query("psu2", "current")
+        assert len(ts) == 5000
+
+
+def test_crash_without_footer_and_torn_tail(tmp_path):
+    path = tmp_path / "soak.mlog"
+    w = MeasurementLogWriter(path, chunk_rows=100)
+    for i in range(1050):
+        w.append("psu1", "voltage", float(i), t=float(i))
+    w.flush()          # 10 full chunks + partial 50-row chunk on disk
+    w._f.close()       # simulate a crash: no footer
+    data = path.read_bytes()
+    path.write_bytes(data[:-123])  # tear the last chunk
+
+    with MeasurementLog(path) as log:
+        assert log.recovered
+        ts, _ = log.query("psu1", "voltage")
+        assert ts.tolist() == [float(i) for i in range(1000)]
+
+    # Reopening for append continues after the last valid chunk
+    with MeasurementLogWriter(path, chunk_rows=100) as w:
+        w.append("psu1", "voltage", 1.0, t=2000.0)
+    with MeasurementLog(path) as log:
+        assert not log.recovered
+        assert log.rows("psu1", "voltage") == 1001
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda c: [c[0] + 8] + c[1:],          # offset no longer at a chunk
+    lambda c: [c[0], c[1] * 100] + c[2:],  # rows past the end of the file
+])
+def test_footer_that_does_not_match_the_records_is_not_trusted(tmp_path, corrupt):
+    path = tmp_path / "soak.mlog"
+    _fill(path, n=3000)
+    data = path.read_bytes()
+    off = int.from_bytes(data[-16:-8], "little")
+    idx = json.loads(data[off:-16])
+    idx["chunks"][1] = corrupt(idx["chunks"][1])
+    footer = json.dumps(idx).encode("utf-8")
+    path.write_bytes(data[:off] + footer + off.to_bytes(8, "little") + data[-8:])
+    with MeasurementLog(path) as log:
+        assert log.recovered
+        assert log.rows("psu1", "voltage") == 3000
+        ts, _ = log.query("psu1", "voltage")
+        assert ts.tolist() == [float(i) for i in range(3000)]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import gc
+import weakref
+
+import pytest
+
+from adapters.psu.sim_adapter import SimAdapter
+from core.frozen import freeze
+from devices.psu.PsuDevice import PSU
+from devices.psu.strategy import PSUContext, VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+from examples.memory_benchmark import measure
+
+FLEET = 5_000
+# Budget per simulated device (PSU + strategy + SimAdapter + lock + snapshot)
+BYTES_PER_DEVICE_BUDGET = 1_500
+
+
+def _device(loader):
+    return PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=loader,
+               strategy=VirtualPsuStrategy())
+
+
+def test_bytes_per_simulated_device():
+    # Regression guard; python -m examples.memory_benchmark reports the 50k-device figure
+    per_device, _ = measure(FLEET)
+    assert per_device < BYTES_PER_DEVICE_BUDGET
+
+
+def test_model_config_is_interned_and_read_only():
+    a, b = _device(YamlPSUConfigLoader()), _device(YamlPSUConfigLoader())
+    assert a.get_capabilities() is b.get_capabilities()
+    assert a._ranges is b._ranges
+    assert a._strategy._ctx is b._strategy._ctx
+    with pytest.raises(TypeError):
+        a.get_capabilities()["set_voltage"] = False
+    assert not hasattr(a, "__dict__")
+
+
+def test_unused_interned_config_is_released():
+    a = freeze({"only_in_this_test": {"x": 1.0}})
+    assert freeze({"only_in_this_test": {"x": 1.0}}) is a
+    ref = weakref.ref(a)
+    del a
+    gc.collect()
+    assert ref() is None
+
+    ctx = PSUContext.shared(capabilities=freeze({"c": True}), ranges=freeze({"r": {"min": 0.0}}))
+    assert PSUContext.shared(capabilities=freeze({"c": True}), ranges=freeze({"r": {"min": 0.0}})) is ctx
+    ref = weakref.ref(ctx)
+    del ctx
+    gc.collect()
+    assert ref() is None
+
+
+def test_seeded_devices_get_independent_noise():
+    def readings(strategy):
+        strategy._voltage_sp, strategy._output_on = 5.0, True
+        return [strategy.read("voltage") for _ in range(5)]
+
+    assert readings(VirtualPsuStrategy(seed=1)) == readings(VirtualPsuStrategy(seed=1))
+    assert readings(VirtualPsuStrategy(seed=1)) != readings(VirtualPsuStrategy(seed=2))
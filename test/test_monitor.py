@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+from adapters.psu.sim_adapter import SimAdapter
+from core.monitor import Monitor, RateOfChange, Threshold, WindowAverage, output_off
+from devices.psu.PsuDevice import PSU
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+
+def test_threshold_with_hysteresis_fires_on_transitions_only():
+    mon = Monitor()
+    seen = []
+    mon.add("psu1", "current", Threshold(hi=2.0, hysteresis=0.5),
+            on_alarm=seen.append, on_clear=seen.append)
+    values = [1.0, 2.1, 2.5, 1.8, 1.6, 1.4, 2.2]
+    alarms = mon.feed(np.arange(len(values)), np.array(values)[:, None])
+    assert [(a.t, a.active) for a in alarms] == [(1.0, True), (5.0, False), (6.0, True)]
+    assert seen == alarms
+    assert mon.active()[0][:2] == ("psu1", "current")
+    # state carries into the next batch: still inside the band, no new event
+    assert mon.feed([7.0], [1.9]) == []
+
+
+def test_rate_and_window_rules_span_batches():
+    mon = Monitor()
+    mon.add("dev", "voltage", RateOfChange(max_per_s=1.0))
+    mon.add("dev", "temp", WindowAverage(window=3, hi=50.0))
+    first = mon.feed([0.0, 1.0], [[5.0, 49.0], [5.5, 52.0]])
+    assert first == []  # window not yet full; rate 0.5 V/s
+    second = mon.feed([2.0], [[8.0, 52.0]])  # 2.5 V/s; mean(49, 52, 52) > 50
+    assert {(a.key, round(a.value, 3)) for a in second} == {("voltage", 2.5), ("temp", 51.0)}
+
+
+def test_nan_means_not_sampled():
+    mon = Monitor()
+    mon.add("a", "x", Threshold(lo=0.0))
+    mon.add("b", "x", Threshold(hi=1.0))
+    alarms = mon.feed([0.0, 1.0], [[np.nan, 2.0], [-1.0, np.nan]])
+    assert [(a.device, a.t) for a in alarms] == [("b", 0.0), ("a", 1.0)]
+
+
+def test_thousands_of_channels_in_one_batch():
+    mon = Monitor()
+    n = 5000
+    for ch in range(n):
+        mon.add("rack", f"ch{ch}", Threshold(lo=-1.0, hi=1.0, hysteresis=0.1))
+    scans = np.zeros((100, n))
+    scans[50:, 123] = 5.0
+    alarms = mon.feed(np.arange(100.0), scans)
+    assert [(a.key, a.t) for a in alarms] == [("ch123", 50.0)]
+    assert mon.stats["scans"] == 100
+
+
+def test_auto_action_switches_psu_output_off():
+    loader = YamlPSUConfigLoader()
+    psu = PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=loader,
+              strategy=VirtualPsuStrategy())
+    psu.connect()
+    psu.voltage = 12.0
+    psu.output = True
+    mon = Monitor()
+    mon.add(psu, "voltage", Threshold(hi=10.0), on_alarm=output_off(psu))
+    mon.add(psu, "temp", Threshold(hi=1000.0))
+    thread = mon.run(interval_s=0.01)
+    try:
+        end = time.monotonic() + 2.0
+        while psu.output and time.monotonic() < end:
+            time.sleep(0.01)
+    finally:
+        thread.stop()
+    assert psu.output is False
+    assert thread.last_error is None and mon.errors == []
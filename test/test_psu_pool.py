@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import yaml
+
+from devices.base import DeviceState
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+from test.conftest import psu_variants
+from test.device_pool import DevicePool
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "devices" / "psu" / "config"
+
+
+def test_pooled_psu_is_connected_and_usable(pooled_psu):
+    assert pooled_psu.state is DeviceState.CONNECTED
+    pooled_psu.current_limit = 0.2
+    pooled_psu.voltage = 5.0
+    pooled_psu.output = True
+    assert pooled_psu.read("output") is True
+
+
+def test_pooled_psu_starts_from_baseline(pooled_psu):
+    assert pooled_psu.voltage == 0.0
+    assert pooled_psu.current_limit == 0.0
+    assert pooled_psu.output is False
+    assert pooled_psu.read("voltage") == 0.0
+
+
+def test_disconnected_device_is_reconnected(psu_pool):
+    psu = psu_pool.acquire("sim+virtual")
+    psu.disconnect()
+    before = psu_pool.connects
+    assert psu_pool.acquire("sim+virtual") is psu
+    assert psu.is_connected
+    assert psu_pool.connects == before + 1
+
+
+def test_pool_reuses_connected_devices(psu_pool):
+    for name in ("sim+virtual", "sim+virtual-delayed"):
+        psu_pool.acquire(name)
+    before = psu_pool.connects
+    for _ in range(3):
+        psu_pool.acquire("sim+virtual")
+        psu_pool.acquire("sim+virtual-delayed")
+    assert psu_pool.connects == before
+
+
+def test_reset_skips_writes_the_model_does_not_support(tmp_path):
+    for name in ("capabilities.yml", "ranges.yml", "models.yml"):
+        shutil.copy(CONFIG_DIR / name, tmp_path / name)
+    caps_file = tmp_path / "capabilities.yml"
+    caps = yaml.safe_load(caps_file.read_text(encoding="utf-8"))
+    caps["RIGOL-DP832"]["toggle_output"] = False
+    caps_file.write_text(yaml.safe_dump(caps), encoding="utf-8")
+
+    pool = DevicePool(psu_variants())
+    pool._loader = YamlPSUConfigLoader(tmp_path)
+    try:
+        psu = pool.acquire("sim+virtual")
+        assert psu.get_capabilities()["toggle_output"] is False
+        psu.voltage = 5.0
+        psu.current_limit = 0.2
+        pool.reset(psu)  # would raise PermissionError on the output write
+        assert psu.voltage == 0.0 and psu.current_limit == 0.0
+        assert pool.resets == 1
+    finally:
+        pool.close()
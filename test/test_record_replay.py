@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from adapters.psu.sim_adapter import SimAdapter
+from adapters.recording_adapter import RecordingAdapter, ReplayAdapter
+from core.exceptions import ProtocolError
+from core.tracelog import OP_READ, ReplaySession, TraceWriter, read_trace
+from devices.psu import strategy as strategy_mod
+from devices.psu.PsuDevice import PSU
+from devices.psu.recording import RecordingPsuStrategy, ReplayPsuStrategy
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+MODEL = "RIGOL-DP832"
+
+
+@pytest.fixture(autouse=True)
+def short_delays(monkeypatch):
+    monkeypatch.setattr(strategy_mod, "SET_VOLTAGE_DELAY_S", 0.05)
+    monkeypatch.setattr(strategy_mod, "OUTPUT_ON_DELAY_S", 0.05)
+
+
+def _ops(psu):
+    psu.voltage = 5.0
+    psu.current_limit = 0.2
+    psu.output = True
+    return [psu.read("voltage") for _ in range(5)] + [psu.read("current")]
+
+
+def _session(psu):
+    with psu:
+        return _ops(psu)
+
+
+def _record(path):
+    loader = YamlPSUConfigLoader()
+    with TraceWriter(path) as writer:
+        psu = PSU(model=MODEL, adapter=RecordingAdapter(SimAdapter(), writer), config_loader=loader,
+                  strategy=RecordingPsuStrategy(VirtualPsuStrategy(), writer))
+        return _session(psu)
+
+
+def _replay(path, pacing):
+    """Replay _session() and time only its operations (connect/config load excluded)."""
+    session = ReplaySession.from_file(path, pacing=pacing)
+    psu = PSU(model=MODEL, adapter=ReplayAdapter(session), config_loader=YamlPSUConfigLoader(),
+              strategy=ReplayPsuStrategy(session))
+    with psu:
+        start = time.perf_counter()
+        readings = _ops(psu)
+        elapsed = time.perf_counter() - start
+    return readings, session, elapsed
+
+
+def test_replay_reproduces_recorded_readings(tmp_path):
+    path = tmp_path / "run.trc"
+    recorded = _record(path)
+
+    replayed, session, elapsed = _replay(path, "fast")
+    assert replayed == recorded
+    assert session.remaining == 0
+    # Recorded set_voltage + output-on waits total 0.1 s; fast replay skips them
+    assert elapsed < 0.05
+
+    _, _, elapsed = _replay(path, "original")
+    assert elapsed >= 0.1
+
+
+def test_reopened_trace_continues_its_clock(tmp_path):
+    path = tmp_path / "run.trc"
+    _record(path)
+    first = len(read_trace(path))
+    with path.open("ab") as f:
+        f.write(b"\x00\x01")  # partial record from a crashed writer
+    _record(path)
+    records = read_trace(path)
+    assert len(records) == 2 * first
+    assert all(a.t <= b.t for a, b in zip(records, records[1:]))
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = tmp_path / "run.trc"
+    _record(path)
+    full = read_trace(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    assert read_trace(path) == full[:-1]
+    assert any(r.op == OP_READ and r.arg == "current" for r in full)
+
+
+def test_divergence_raises(tmp_path):
+    path = tmp_path / "run.trc"
+    _record(path)
+    session = ReplaySession.from_file(path)
+    psu = PSU(model=MODEL, adapter=ReplayAdapter(session), config_loader=YamlPSUConfigLoader(),
+              strategy=ReplayPsuStrategy(session))
+    psu.connect()
+    with pytest.raises(ProtocolError):
+        psu.voltage = 6.0
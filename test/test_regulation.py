@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from adapters.psu.sim_adapter import SimAdapter
+from devices.psu import strategy as strategy_mod
+from devices.psu.PsuDevice import PSU
+from devices.psu.regulation import PIController, Regulator
+from devices.psu.session import MemorySessionStore
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+
+@pytest.fixture
+def psu():
+    psu = PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=YamlPSUConfigLoader(),
+              strategy=VirtualPsuStrategy(), session=MemorySessionStore())
+    psu.connect()
+    psu.current_limit = 0.5
+    psu.output = True
+    yield psu
+    psu.disconnect()
+
+
+def _settle(reg, check, timeout=3.0):
+    end = time.monotonic() + timeout
+    while not check() and time.monotonic() < end:
+        time.sleep(0.01)
+
+
+def test_pi_clamps_slews_and_does_not_wind_up():
+    ctrl = PIController(kp=1.0, ki=10.0, lo=0.0, hi=10.0, slew_per_s=100.0)
+    ctrl.reset(5.0)
+    assert ctrl.update(1000.0, 0.01) == 6.0  # slew: 100 V/s * 10 ms
+    for _ in range(100):
+        ctrl.update(1000.0, 0.01)  # unreachable setpoint: pinned at max
+    assert ctrl.output == 10.0
+    # Integral froze while saturated, so a small negative error pulls it off the limit at once
+    assert ctrl.update(-1.0, 0.01) < 10.0
+
+
+def test_constant_power_converges_at_high_rate(psu, monkeypatch):
+    # The 100 ms set_voltage settling wait is back in place: the loop must not pay it
+    monkeypatch.setattr(strategy_mod, "SET_VOLTAGE_DELAY_S", 0.1)
+    psu.voltage = 1.0
+    reg = Regulator.constant_power(psu, watts=5.0, rate_hz=200.0)
+    with reg:
+        _settle(reg, lambda: abs(psu.voltage - 10.0) < 0.3 and reg.stats()["iterations"] > 100)
+        stats = reg.stats()
+    assert reg.last_error is None
+    assert psu.voltage == pytest.approx(10.0, abs=0.5)  # 5 W / 0.5 A (+- read noise)
+    assert stats["iterations"] > 100  # within the 3 s settle window, so not paying 100 ms each
+    assert stats["jitter"]["count"] == stats["iterations"]
+    assert psu._session.load("RIGOL-DP832")["setpoints"]["voltage"] == psu.voltage
+
+
+def test_remote_sense_respects_range_limits(psu):
+    psu.voltage = 5.0
+    # 10% lead drop; 29 V at the load would need 32.2 V > range max (30 V)
+    reg = Regulator.remote_sense(psu, volts=29.0, sense=lambda: 0.9 * psu.voltage,
+                                 rate_hz=200.0, slew_per_s=200.0)
+    with reg:
+        _settle(reg, lambda: psu.voltage >= 30.0)
+        assert psu.voltage == 30.0
+        reg.setpoint = 18.0
+        _settle(reg, lambda: abs(0.9 * psu.voltage - 18.0) < 0.01)
+    assert 0.9 * psu.voltage == pytest.approx(18.0, abs=0.05)
+
+
+def test_measurement_failure_stops_the_loop(psu):
+    def broken():
+        raise RuntimeError("sense lost")
+
+    reg = Regulator.remote_sense(psu, volts=5.0, sense=broken).start()
+    reg._thread.join(2.0)
+    assert not reg.running
+    assert isinstance(reg.last_error, RuntimeError)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pytest
+
+from adapters.psu.sim_adapter import SimAdapter
+from devices.psu.PsuDevice import PSU
+from devices.psu.session import FileSessionStore, MemorySessionStore
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+
+class TracingStrategy(VirtualPsuStrategy):
+    def __init__(self, idn: str = "VIRTUAL,PSU") -> None:
+        super().__init__()
+        self.idn = idn
+        self.calls = []
+
+    def initialize(self) -> None:
+        self.calls.append("initialize")
+
+    def identify(self):
+        return self.idn
+
+    def set_voltage(self, volts: float) -> None:
+        self.calls.append(("voltage", volts))
+        super().set_voltage(volts)
+
+    def set_current_limit(self, amps: float) -> None:
+        self.calls.append(("current_limit", amps))
+        super().set_current_limit(amps)
+
+    def toggle_output(self, on: bool) -> None:
+        self.calls.append(("output", on))
+        super().toggle_output(on)
+
+
+def _psu(strat, store):
+    return PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=YamlPSUConfigLoader(),
+               strategy=strat, session=store)
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp: MemorySessionStore(),
+    lambda tmp: FileSessionStore(tmp / "session.json"),
+])
+def test_warm_reconnect_pushes_only_diff(tmp_path, make_store):
+    strat = TracingStrategy()
+    psu = _psu(strat, make_store(tmp_path))
+    with psu:
+        psu.voltage = 5.0
+        psu.current_limit = 0.2
+        psu.output = True
+    assert psu.last_restore is None
+
+    strat.calls.clear()
+    strat._voltage_sp = 0.0  # instrument lost its voltage setpoint
+    psu.connect()
+    assert "initialize" not in strat.calls
+    assert psu.last_restore == {"voltage": 5.0}
+    assert strat.calls == [("voltage", 5.0)]
+    assert psu.voltage == 5.0 and psu.output is True
+    psu.disconnect()
+
+
+def test_snapshot_survives_new_process_via_file(tmp_path):
+    path = tmp_path / "session.json"
+    with _psu(TracingStrategy(), FileSessionStore(path)) as psu:
+        psu.voltage = 7.5
+
+    strat = TracingStrategy()
+    strat._voltage_sp = 7.5
+    psu = _psu(strat, FileSessionStore(path))
+    psu.connect()
+    assert psu.last_restore == {}
+    assert strat.calls == []
+    assert psu.voltage == 7.5
+
+
+def test_identity_change_forces_cold_connect():
+    store = MemorySessionStore()
+    with _psu(TracingStrategy("RIGOL,DP832,SN1"), store) as psu:
+        psu.voltage = 5.0
+
+    strat = TracingStrategy("RIGOL,DP832,SN2")
+    psu = _psu(strat, store)
+    psu.connect()
+    assert strat.calls == ["initialize"]
+    assert psu.last_restore is None
+    assert psu.voltage == 0.0
+
+
+def test_restore_skips_settings_the_current_config_rejects():
+    store = MemorySessionStore()
+    with _psu(TracingStrategy(), store) as psu:
+        psu.voltage = 5.0
+        psu.current_limit = 0.2
+    snap = store.load("RIGOL-DP832")
+    snap["setpoints"]["voltage"] = 99.0  # outside the 0..30 V range now configured
+    store.save("RIGOL-DP832", snap)
+
+    strat = TracingStrategy()
+    strat._voltage_sp = 1.0
+    psu = _psu(strat, store)
+    psu.connect()
+    assert ("voltage", 99.0) not in strat.calls
+    assert strat.calls == [("current_limit", 0.2)]
+    assert psu.voltage == 1.0  # what the instrument actually holds
+    assert psu.current_limit == 0.2
+    psu.disconnect()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+
+from adapters.psu.sim_adapter import SimAdapter
+from devices.psu.PsuDevice import PSU
+from devices.psu.shadow import ShadowRegisters
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+
+class CountingStrategy(VirtualPsuStrategy):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = []
+
+    def set_voltage(self, volts: float) -> None:
+        self.calls.append(("voltage", volts))
+        super().set_voltage(volts)
+
+    def toggle_output(self, on: bool) -> None:
+        self.calls.append(("output", on))
+        super().toggle_output(on)
+
+
+def _psu(shadow=None, model="RIGOL-DP832"):
+    strat = CountingStrategy()
+    psu = PSU(model=model, adapter=SimAdapter(), config_loader=YamlPSUConfigLoader(),
+              strategy=strat, shadow=shadow)
+    return psu, strat
+
+
+def test_redundant_writes_are_elided():
+    psu, strat = _psu(ShadowRegisters(tolerances={"voltage": 1e-3}))
+    with psu:
+        psu.voltage = 5.0
+        psu.voltage = 5.0
+        psu.voltage = 5.0005  # within tolerance
+        psu.output = False    # already off after connect readback
+        assert strat.calls == [("voltage", 5.0)]
+        assert psu.shadow.elided == 3
+        # elided write: the published setpoint stays what the instrument holds
+        assert psu.voltage == 5.0 == strat.read_setpoints()["voltage"]
+        psu.voltage = 6.0
+        assert strat.calls[-1] == ("voltage", 6.0)
+
+
+def test_without_shadow_every_write_is_sent():
+    psu, strat = _psu()
+    with psu:
+        psu.voltage = 5.0
+        psu.voltage = 5.0
+    assert len(strat.calls) == 2
+
+
+def test_power_cycle_marks_dirty_and_resyncs():
+    psu, strat = _psu(ShadowRegisters(), model="KEITHLEY-2230G")  # supports power_cycle
+    with psu:
+        psu.output = False
+        psu.set("power_cycle", None)  # strategy turns output back on
+        assert psu.shadow.dirty
+        psu.output = True             # readback says on -> elided
+        assert ("output", True) not in strat.calls
+        assert psu.output is True
+
+
+def test_readback_on_connect_updates_setpoints():
+    psu, strat = _psu(ShadowRegisters())
+    strat._voltage_sp = 12.0
+    with psu:
+        assert psu.voltage == 12.0
+        psu.voltage = 12.0
+    assert strat.calls == []
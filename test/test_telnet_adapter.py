@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import socket
+
+import pytest
+
+from adapters.telnet_adapter import TelnetAdapter
+from core import deadline
+from core.exceptions import ConnectionError, DeviceTimeout
+from test.fake_instruments import FakeInstrument
+
+
+def _closed_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_connect_and_disconnect():
+    with FakeInstrument("ACME,PS-1,1,1") as fake:
+        adapter = TelnetAdapter(*fake.address, timeout=1.0)
+        adapter.connect()
+        assert adapter.is_connected()
+        adapter.connect()  # idempotent
+        adapter.disconnect()
+        assert not adapter.is_connected()
+        adapter.disconnect()
+
+
+def test_refused_connect_raises_oserror():
+    adapter = TelnetAdapter("127.0.0.1", _closed_port(), timeout=1.0)
+    with pytest.raises(OSError):
+        adapter.connect()
+    assert not adapter.is_connected()
+
+
+def test_connect_honours_the_deadline(monkeypatch):
+    def slow(address, timeout=None):
+        assert timeout is not None and timeout <= 0.05
+        raise socket.timeout("timed out")
+
+    monkeypatch.setattr(socket, "create_connection", slow)
+    adapter = TelnetAdapter("192.0.2.1", 5025, timeout=5.0)
+    with deadline.deadline(0.05):
+        with pytest.raises(DeviceTimeout):
+            adapter.connect()
+    assert not adapter.is_connected()
+
+
+def test_write_and_query_exchange_lines():
+    with FakeInstrument("ACME,PS-1,1,1") as fake:
+        adapter = TelnetAdapter(*fake.address, timeout=1.0)
+        adapter.connect()
+        adapter.write("VOLT 3.3")
+        assert adapter.query("*IDN?") == "ACME,PS-1,1,1"
+        assert adapter.query("VOLT?") == "3.3"
+        adapter.disconnect()
+    assert fake.commands == ["VOLT 3.3", "*IDN?", "VOLT?"]
+
+
+def test_io_needs_a_connection():
+    adapter = TelnetAdapter("127.0.0.1", 5025)
+    with pytest.raises(ConnectionError):
+        adapter.write("*CLS")
+    with pytest.raises(ConnectionError):
+        adapter.query("*IDN?")
+
+
+def test_silent_instrument_times_out_and_drops_the_link():
+    with FakeInstrument(silent=True) as fake:
+        adapter = TelnetAdapter(*fake.address, timeout=0.2)
+        adapter.connect()
+        with pytest.raises(DeviceTimeout):
+            adapter.query("*IDN?")
+        assert not adapter.is_connected()
+
+
+def test_oversized_reply_is_rejected():
+    with FakeInstrument(oversized=True) as fake:
+        adapter = TelnetAdapter(*fake.address, timeout=1.0)
+        adapter.connect()
+        with pytest.raises(ConnectionError):
+            adapter.query("*IDN?")
+        assert not adapter.is_connected()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from adapters.psu.sim_adapter import SimAdapter
+from devices.base import DeviceState
+from devices.psu.PsuDevice import PSU
+from devices.psu.strategy import VirtualPsuStrategy
+from devices.psu.yaml_config_loader import YamlPSUConfigLoader
+
+pytestmark = pytest.mark.usefixtures("no_delays")
+
+RUN_S = 0.2
+
+
+@pytest.fixture
+def psu():
+    return PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=YamlPSUConfigLoader(),
+               strategy=VirtualPsuStrategy())
+
+
+def _read_storm(psu, readers: int):
+    """Readers hammer snapshot reads while a writer flips state; returns what they saw wrong."""
+    bad = []
+    go = threading.Event()
+
+    def reader():
+        go.wait()
+        end = time.perf_counter() + RUN_S
+        while time.perf_counter() < end:
+            snap = psu.snapshot
+            if snap.state not in (DeviceState.CONNECTED, DeviceState.DISCONNECTED):
+                bad.append(snap.state)
+            if snap.state is DeviceState.DISCONNECTED and snap.voltage not in (0.0, 1.0, 2.0):
+                bad.append(snap.voltage)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    go.set()
+    for t in threads:
+        t.join()
+    return bad
+
+
+def test_readers_never_observe_transitional_state(psu):
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            psu.connect()
+            psu.voltage = 1.0
+            psu.voltage = 2.0
+            psu.disconnect()
+
+    w = threading.Thread(target=writer)
+    w.start()
+    try:
+        bad = _read_storm(psu, 4)
+    finally:
+        stop.set()
+        w.join()
+    assert bad == []
+
+
+def test_reads_do_not_wait_for_the_device_lock(psu):
+    psu.connect()
+    psu.voltage = 3.0
+    held, release = threading.Event(), threading.Event()
+
+    def holder():
+        with psu._lock:  # a writer mid-operation
+            held.set()
+            release.wait(5.0)
+
+    h = threading.Thread(target=holder)
+    h.start()
+    held.wait()
+    seen = []
+    readers = [threading.Thread(target=lambda: seen.append(
+        (psu.snapshot.state, psu.is_connected, psu.voltage))) for _ in range(4)]
+    try:
+        for t in readers:
+            t.start()
+        for t in readers:
+            t.join(1.0)
+        assert not any(t.is_alive() for t in readers)
+        assert seen == [(DeviceState.CONNECTED, True, 3.0)] * 4
+    finally:
+        release.set()
+        h.join()
+        psu.disconnect()
+
+
+class OverlapTrackingStrategy(VirtualPsuStrategy):
+    __slots__ = ("active", "seen")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.active = 0
+        self.seen = []
+
+    def set_voltage(self, volts: float) -> None:
+        self.active += 1
+        self.seen.append(self.active)
+        time.sleep(0.001)
+        self.active -= 1
+        super().set_voltage(volts)
+
+
+def test_concurrent_writers_are_serialized():
+    strat = OverlapTrackingStrategy()
+    psu = PSU(model="RIGOL-DP832", adapter=SimAdapter(), config_loader=YamlPSUConfigLoader(),
+              strategy=strat)
+    psu.connect()
+    threads = [threading.Thread(target=lambda v=v: setattr(psu, "voltage", v)) for v in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(strat.seen) == 1
+    assert psu.voltage == psu._strategy.read_setpoints()["voltage"]